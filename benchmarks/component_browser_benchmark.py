@@ -0,0 +1,179 @@
+"""
+Benchmark refreshing the component browser against updating it incrementally.
+
+Fills the Maya stand-in with Ziva nodes and compares listing them all again,
+what the Panel list boxes did on every refresh, with the ComponentCatalog
+inserting, renaming and removing single nodes from its callbacks:
+
+    python benchmarks/component_browser_benchmark.py --sizes 1000 10000 50000
+
+Qt is not available outside Maya, so filling the list widgets is modelled
+with LIST_ITEM_COST per item while the model only signals the changed row.
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import maya_standin  # noqa: E402
+import run_benchmarks  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+
+# Modelled seconds to add one QListWidgetItem, paid by every full refresh
+LIST_ITEM_COST = 1e-6
+
+# Share of each node type in the synthetic scenes, attachments dominate
+TYPE_SHARES = {
+    "zAttachment": 0.55,
+    "zMaterial": 0.1,
+    "zTet": 0.06,
+    "zTissue": 0.06,
+    "zBone": 0.06,
+    "zFiber": 0.08,
+    "zLineOfAction": 0.05,
+    "zCloth": 0.04,
+}
+
+NAME_FORMATS = {
+    "zAttachment": "ZA_tissue_{0:05d}_to_bones_{1:05d}_att",
+    "zMaterial": "ZMAT_tissue_{0:05d}",
+    "zTet": "ZTET_tissue_{0:05d}",
+    "zTissue": "ZTIS_tissue_{0:05d}",
+    "zBone": "ZBONE_bones_{0:05d}",
+    "zFiber": "ZF_tissue_{0:05d}",
+    "zLineOfAction": "ZLOA_tissue_{0:05d}",
+    "zCloth": "ZCLOTH_tissue_{0:05d}",
+}
+
+
+def build_ziva_scene(standin, num_nodes):
+    """
+    Fill a new scene with `num_nodes` Ziva nodes split by TYPE_SHARES.
+    """
+    standin.new_scene()
+    for node_type, share in TYPE_SHARES.items():
+        name_format = NAME_FORMATS[node_type]
+        for index in range(max(1, int(num_nodes * share))):
+            standin.add_node(node_type, name_format.format(index, index // 7))
+    standin.reset_counters()
+
+
+def time_full_refresh(standin, zsc, repeat):
+    """
+    Seconds to list every component again, Python and modelled Maya time.
+    """
+    runs = []
+    for _ in range(repeat):
+        catalog = zsc.ComponentCatalog()
+        standin.reset_counters()
+        start = time.perf_counter()
+        catalog.rebuild()
+        python_time = max(0.0, time.perf_counter() - start - standin.standin_time)
+        widgets = LIST_ITEM_COST * len(catalog)
+        runs.append(python_time + standin.model_time + widgets)
+    return statistics.median(runs)
+
+
+def apply_events(standin, num_events):
+    # A third each of created, renamed and deleted attachments
+    created = [
+        standin.add_node("zAttachment", f"ZA_new_{index:05d}_to_bones_00000_att")
+        for index in range(num_events // 3)
+    ]
+    for node in created:
+        standin.rename_node(node, node.name.replace("ZA_new", "ZA_renamed"))
+    for node in created:
+        standin.remove_node(node)
+    return 3 * len(created)
+
+
+def time_incremental_update(standin, zsc, num_nodes, num_events, repeat):
+    """
+    Seconds the catalog and a listener spend per created, renamed or deleted node.
+    """
+    runs = []
+    for _ in range(repeat):
+        # The same edits without the catalog are the stand-in's own time
+        build_ziva_scene(standin, num_nodes)
+        start = time.perf_counter()
+        apply_events(standin, num_events)
+        baseline = time.perf_counter() - start
+
+        build_ziva_scene(standin, num_nodes)
+        catalog = zsc.ComponentCatalog()
+        catalog.install()
+        changes = []
+        catalog.add_listener(lambda event, node_type, row: changes.append(row))
+        start = time.perf_counter()
+        events = apply_events(standin, num_events)
+        elapsed = time.perf_counter() - start
+        catalog.uninstall()
+        # Before and after notifications, a rename removes and inserts
+        assert len(changes) == 8 * events // 3
+        runs.append(max(0.0, elapsed - baseline) / events)
+    return statistics.median(runs)
+
+
+def run_browser_benchmark(sizes, num_events=300, repeat=3):
+    """
+    Full refresh and per-event incremental update times at every size.
+
+    Returns:
+        dict: Size -> {"full_refresh", "incremental", "speedup"} in seconds.
+    """
+    standin = maya_standin.install()
+    run_benchmarks.register_toolbox()
+    import z_toolbox.common.func_ziva_scene as zsc
+
+    results = {}
+    for size in sorted(sizes):
+        build_ziva_scene(standin, size)
+        full_refresh = time_full_refresh(standin, zsc, repeat)
+        incremental = time_incremental_update(standin, zsc, size, num_events, repeat)
+        results[size] = {
+            "full_refresh": full_refresh,
+            "incremental": incremental,
+            "speedup": full_refresh / incremental if incremental else float("inf"),
+        }
+    return results
+
+
+def format_report(results):
+    lines = [
+        f"{'nodes':>7} {'full refresh ms':>16} {'per change us':>14} {'speedup':>9}"
+    ]
+    for size, run in results.items():
+        lines.append(
+            f"{size:>7} {1000.0 * run['full_refresh']:>16.2f} "
+            f"{1e6 * run['incremental']:>14.1f} {run['speedup']:>8.0f}x"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--events", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("z_toolbox").disabled = True
+    results = run_browser_benchmark(args.sizes, args.events, args.repeat)
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=4, sort_keys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
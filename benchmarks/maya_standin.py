@@ -0,0 +1,1389 @@
+import contextlib
+import fnmatch
+import functools
+import math
+import re
+import shlex
+import sys
+import time
+import types
+from collections import defaultdict
+
+############################################################
+#################   COST MODEL   ###########################
+############################################################
+
+# Modelled Maya cost of a command: (seconds per call, seconds per item). What
+# an item is depends on the command, e.g. the nodes ls() scans or the
+# vertices a proximity query visits. The figures are orders of magnitude for
+# an interactive session with a loaded rig, tune them to a measured session.
+COMMAND_COSTS = {
+    "default": (20e-6, 0.0),
+    "ls": (25e-6, 0.3e-6),
+    "listRelatives": (20e-6, 0.5e-6),
+    "listConnections": (25e-6, 1e-6),
+    "listHistory": (40e-6, 2e-6),
+    "objExists": (5e-6, 0.0),
+    "objectType": (5e-6, 0.0),
+    "nodeType": (5e-6, 0.0),
+    "getAttr": (10e-6, 0.0),
+    "setAttr": (15e-6, 0.0),
+    "select": (30e-6, 1e-6),
+    "rename": (60e-6, 0.0),
+    "parent": (150e-6, 0.0),
+    "createNode": (80e-6, 0.0),
+    "group": (120e-6, 0.0),
+    "delete": (200e-6, 50e-6),
+    "sets": (80e-6, 5e-6),
+    "exactWorldBoundingBox": (30e-6, 0.05e-6),
+    "xform": (30e-6, 0.5e-6),
+    "zQuery": (300e-6, 2e-6),
+    "zFindVerticesByProximity": (1e-3, 1e-6),
+    "zRivetToBone": (4e-3, 0.0),
+    "ziva": (8e-3, 0.0),
+    "ziva -t": (40e-3, 20e-6),
+    "ziva -b": (10e-3, 2e-6),
+    "ziva -c": (25e-3, 10e-6),
+    "ziva -f": (6e-3, 2e-6),
+    "ziva -a": (5e-3, 3e-6),
+    "ziva -rm": (5e-3, 1e-6),
+    "zLineOfActionUtil": (3e-3, 0.0),
+    "ZivaDeleteSelection": (2e-3, 200e-6),
+    "MFnMesh.getPoints": (10e-6, 0.05e-6),
+    "MFnMesh.getTriangles": (10e-6, 0.05e-6),
+    "MFnMesh.getClosestPoint": (20e-6, 0.0),
+}
+
+# Viewport redraw triggered by a scene change while refresh is not suspended
+REDRAW_COST = 4e-3
+
+############################################################
+#################   SCENE GRAPH   ##########################
+############################################################
+
+# Type -> its parent type, nodeType(inherited=True) walks this chain
+TYPE_PARENTS = {
+    "dagNode": "entity",
+    "transform": "dagNode",
+    "shape": "dagNode",
+    "geometryShape": "shape",
+    "deformableShape": "geometryShape",
+    "controlPoint": "deformableShape",
+    "surfaceShape": "controlPoint",
+    "mesh": "surfaceShape",
+    "curveShape": "controlPoint",
+    "nurbsCurve": "curveShape",
+    "locator": "shape",
+    "objectSet": "entity",
+    "lambert": "entity",
+}
+
+ZIVA_TYPES = [
+    "zSolver",
+    "zSolverTransform",
+    "zEmbedder",
+    "zGeo",
+    "zTissue",
+    "zBone",
+    "zCloth",
+    "zTet",
+    "zMaterial",
+    "zFiber",
+    "zAttachment",
+    "zLineOfAction",
+    "zRivetToBone",
+]
+
+COMPONENT_PATTERN = re.compile(
+    r"^(?P<node>[^.]+)\.(?P<kind>vtx|cv)\[(?P<range>[^\]]+)\]$"
+)
+
+
+def inherited_types(node_type):
+    types_ = [node_type]
+    while types_[-1] in TYPE_PARENTS:
+        types_.append(TYPE_PARENTS[types_[-1]])
+    return types_
+
+
+def is_dag_type(node_type):
+    return "dagNode" in inherited_types(node_type)
+
+
+class Node(object):
+    """
+    One node of the stand-in scene.
+
+    Meshes keep their world-space points and triangles, curves their CVs.
+    Transforms are identities, so shape points are world positions.
+    """
+
+    def __init__(self, name, node_type, parent=None):
+        self.name = name
+        self.type = node_type
+        self.parent = parent
+        self.children = []
+        self.attrs = {}
+        self.inputs = []
+        self.outputs = []
+        self.alive = True
+        self.points = []
+        self.triangles = []
+        self.members = []
+        # Meshes a Ziva node belongs to, zQuery answers from these
+        self.meshes = []
+
+    @property
+    def is_dag(self):
+        return is_dag_type(self.type)
+
+    def full_path(self):
+        if not self.is_dag:
+            return self.name
+        parts = []
+        node = self
+        while node is not None:
+            parts.append(node.name)
+            node = node.parent
+        return "|" + "|".join(reversed(parts))
+
+    def descendants(self):
+        for child in self.children:
+            yield child
+            for descendant in child.descendants():
+                yield descendant
+
+    def __repr__(self):
+        return f"Node({self.name!r}, {self.type!r})"
+
+
+def _flatten(args):
+    items = []
+    for arg in args:
+        if arg is None:
+            continue
+        if isinstance(arg, (list, tuple, set)):
+            items.extend(_flatten(arg))
+        else:
+            items.append(str(arg))
+    return items
+
+
+def _flag(kwargs, *names, default=None):
+    for name in names:
+        if name in kwargs:
+            return kwargs[name]
+    return default
+
+
+class MayaStandIn(object):
+    """
+    In-memory maya.cmds, maya.mel and OpenMaya with the Ziva commands.
+
+    Every command runs against a small scene graph and is counted. Its real
+    Python time is measured, so it can be taken out of the toolbox timings,
+    and a modelled Maya cost from COMMAND_COSTS is added to `model_time`.
+    install() registers the maya modules in sys.modules, the toolbox then
+    imports them as usual.
+    """
+
+    def __init__(self):
+        self.counts = defaultdict(int)
+        self.model_time = 0.0
+        self.standin_time = 0.0
+        self._depth = 0
+        self.refresh_suspended = False
+        self.undo_enabled = True
+        self.undo_chunks = 0
+        self.deferred = []
+        self.warnings = []
+        self._callbacks = {}
+        self._next_callback = 1
+        self.new_scene()
+
+    ############# SCENE
+
+    def new_scene(self):
+        self.nodes = {}
+        self.selection = []
+        self._type_counters = defaultdict(int)
+        self._solver = None
+        self._fire("sceneNew")
+
+    def reset_counters(self):
+        self.counts.clear()
+        self.model_time = 0.0
+        self.standin_time = 0.0
+
+    def node(self, name):
+        """
+        Resolve a short name, a DAG path or a plug to its Node, None if missing.
+        """
+        if isinstance(name, Node):
+            return name if name.alive else None
+        name = str(name).split(".", 1)[0].rstrip("|")
+        return self.nodes.get(name.split("|")[-1])
+
+    def _unique_name(self, name):
+        name = name.split("|")[-1]
+        if name not in self.nodes:
+            return name
+        base = name.rstrip("0123456789") or name
+        index = 1
+        while f"{base}{index}" in self.nodes:
+            index += 1
+        return f"{base}{index}"
+
+    def add_node(self, node_type, name=None, parent=None):
+        if not name:
+            self._type_counters[node_type] += 1
+            name = f"{node_type}{self._type_counters[node_type]}"
+        node = Node(self._unique_name(name), node_type)
+        self.nodes[node.name] = node
+        if parent is not None:
+            self._set_parent(node, parent)
+        self._redraw()
+        self._fire("nodeAdded", node)
+        return node
+
+    def add_mesh(self, name, points, triangles, parent=None):
+        """
+        Create a transform with a mesh shape holding `points` and `triangles`.
+
+        Returns:
+            Node: The mesh shape.
+        """
+        transform = self.add_node("transform", name, parent)
+        shape = self.add_node("mesh", f"{transform.name}Shape", transform)
+        shape.points = [tuple(point) for point in points]
+        shape.triangles = list(triangles)
+        return shape
+
+    def add_curve(self, name, cvs, parent=None):
+        transform = self.add_node("transform", name, parent)
+        shape = self.add_node("nurbsCurve", f"{transform.name}Shape", transform)
+        shape.points = [tuple(cv) for cv in cvs]
+        return shape
+
+    def _set_parent(self, node, parent):
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+        self._fire("dagChanged", node, parent)
+
+    def connect(self, source, destination):
+        if destination not in source.outputs:
+            source.outputs.append(destination)
+            destination.inputs.append(source)
+
+    def remove_node(self, node):
+        if not node.alive:
+            return
+        for child in list(node.children):
+            self.remove_node(child)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+        for other in node.inputs:
+            other.outputs.remove(node)
+        for other in node.outputs:
+            other.inputs.remove(node)
+        node.inputs = []
+        node.outputs = []
+        # Deleted nodes leave their sets
+        for other in self.nodes.values():
+            if other.members:
+                other.members = [
+                    member for member in other.members if self.node(member) is not node
+                ]
+        node.alive = False
+        del self.nodes[node.name]
+        self.selection = [
+            item for item in self.selection if self.node(item) is not node
+        ]
+        self._redraw()
+        self._fire("nodeRemoved", node)
+
+    def rename_node(self, node, new_name):
+        previous = node.name
+        del self.nodes[previous]
+        node.name = self._unique_name(new_name)
+        self.nodes[node.name] = node
+        self.selection = [
+            node.name if item == previous else item for item in self.selection
+        ]
+        self._fire("nameChanged", node, previous)
+        return node.name
+
+    def shape_of(self, node):
+        # Transforms answer for their first non intermediate shape
+        if node is None or node.type != "transform":
+            return node
+        for child in node.children:
+            if not child.is_dag or child.type == "transform":
+                continue
+            if not child.attrs.get("intermediateObject", False):
+                return child
+        return None
+
+    def ziva_nodes(self, mesh):
+        return [
+            node
+            for node in self.nodes.values()
+            if node.type in ZIVA_TYPES and mesh in node.meshes
+        ]
+
+    ############# CALLBACKS
+
+    def add_callback(self, event, function, *extra):
+        callback_id = self._next_callback
+        self._next_callback += 1
+        self._callbacks[callback_id] = (event, function, extra)
+        return callback_id
+
+    def remove_callback(self, callback_id):
+        self._callbacks.pop(callback_id, None)
+
+    def _fire(self, event, *args):
+        for registered, function, extra in list(self._callbacks.values()):
+            if registered == event:
+                function(*(args + extra))
+
+    ############# COST MODEL
+
+    def _redraw(self):
+        if not self.refresh_suspended:
+            self.model_time += REDRAW_COST
+
+    @contextlib.contextmanager
+    def measure(self):
+        """
+        Add the time spent in the block to `standin_time`, for stand-in work
+        done outside a command such as the OpenMaya function sets.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._depth == 0:
+                self.standin_time += time.perf_counter() - start
+
+    def charge(self, command, items=0):
+        per_call, per_item = COMMAND_COSTS.get(command, COMMAND_COSTS["default"])
+        self.model_time += per_call + per_item * items
+
+
+def command(name=None):
+    """
+    Decorate a stand-in command: count it, time it and add its modelled cost.
+
+    The command returns (result, items), items feeds the per-item cost. A
+    command that charges and counts itself, e.g. ziva under its flag,
+    returns None items. Commands run by other stand-in commands (mel.eval running ziva)
+    are charged but only the outer call is counted and timed.
+    """
+
+    def decorator(method):
+        key = name or method.__name__
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            standin = self.standin
+            outermost = standin._depth == 0
+            standin._depth += 1
+            start = time.perf_counter()
+            try:
+                result, items = method(self, *args, **kwargs)
+            finally:
+                standin._depth -= 1
+                if outermost:
+                    standin.standin_time += time.perf_counter() - start
+            if items is not None:
+                standin.charge(key, items)
+            if outermost and items is not None:
+                standin.counts[key] += 1
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+############################################################
+#################   MAYA.CMDS   ############################
+############################################################
+
+
+class Cmds(object):
+    """
+    The maya.cmds commands used by the toolbox, plus the Ziva plugin ones.
+    """
+
+    def __init__(self, standin):
+        self.standin = standin
+
+    ############# HELPERS
+
+    def _node(self, name, required=True):
+        node = self.standin.node(name)
+        if node is None and required:
+            raise ValueError(f"No object matches name: {name}")
+        return node
+
+    def _name(self, node, long=False):
+        return node.full_path() if long else node.name
+
+    def _expand_component(self, item):
+        match = COMPONENT_PATTERN.match(item.split("|")[-1])
+        if not match:
+            return [item]
+        node = self._node(match.group("node"))
+        shape = self.standin.shape_of(node)
+        kind, index_range = match.group("kind"), match.group("range")
+        if index_range == "*":
+            start, end = 0, len(shape.points) - 1
+        elif ":" in index_range:
+            start, end = (int(value) for value in index_range.split(":"))
+        else:
+            start = end = int(index_range)
+        prefix = match.group("node")
+        return [f"{prefix}.{kind}[{index}]" for index in range(start, end + 1)]
+
+    def _component_indices(self, items):
+        # {mesh node: [vertex indices]} of the vertex components in `items`
+        indices = defaultdict(list)
+        for item in items:
+            for component in self._expand_component(item):
+                match = COMPONENT_PATTERN.match(component.split("|")[-1])
+                if match:
+                    shape = self.standin.shape_of(self._node(match.group("node")))
+                    indices[shape].append(int(match.group("range")))
+        return indices
+
+    def _matches_type(self, node, node_type):
+        if node_type is None:
+            return True
+        node_types = node_type if isinstance(node_type, (list, tuple)) else [node_type]
+        node_inherited = inherited_types(node.type)
+        return any(t in node_inherited for t in node_types)
+
+    ############# QUERIES
+
+    @command()
+    def ls(self, *args, **kwargs):
+        standin = self.standin
+        long = _flag(kwargs, "long", "l", default=False)
+        node_type = _flag(kwargs, "type", "typ")
+        no_intermediate = _flag(kwargs, "noIntermediate", "ni", default=False)
+        shapes_only = _flag(kwargs, "shapes", "s", default=False)
+        dag = _flag(kwargs, "dag", default=False)
+        names = _flatten(args)
+        scanned = len(standin.nodes)
+
+        if _flag(kwargs, "selection", "sl", default=False):
+            candidates = []
+            for item in standin.selection:
+                node = standin.node(item)
+                if node is None:
+                    continue
+                if COMPONENT_PATTERN.match(item.split("|")[-1]):
+                    candidates.append(item)
+                    continue
+                candidates.append(node)
+                if dag:
+                    candidates.extend(node.descendants())
+        elif names or args:
+            candidates = []
+            for name in names:
+                if COMPONENT_PATTERN.match(name.split("|")[-1]):
+                    if _flag(kwargs, "flatten", "fl", default=False):
+                        candidates.extend(self._expand_component(name))
+                    else:
+                        candidates.append(name)
+                elif any(char in name for char in "*?["):
+                    short = name.split("|")[-1]
+                    candidates.extend(
+                        node
+                        for node_name, node in standin.nodes.items()
+                        if fnmatch.fnmatchcase(node_name, short)
+                    )
+                else:
+                    node = standin.node(name)
+                    if node is not None:
+                        candidates.append(node)
+        else:
+            candidates = list(standin.nodes.values())
+
+        result = []
+        for candidate in candidates:
+            if isinstance(candidate, str):
+                result.append(candidate)
+                continue
+            if not self._matches_type(candidate, node_type):
+                continue
+            if no_intermediate and candidate.attrs.get("intermediateObject"):
+                continue
+            if shapes_only and (not candidate.is_dag or candidate.type == "transform"):
+                continue
+            result.append(self._name(candidate, long))
+        return list(dict.fromkeys(result)), scanned
+
+    @command()
+    def objExists(self, name):
+        return self.standin.node(name) is not None, 0
+
+    @command()
+    def objectType(self, name, isType=None):
+        node = self._node(name)
+        if isType is not None:
+            return node.type == isType, 0
+        return node.type, 0
+
+    @command()
+    def nodeType(self, name, isTypeName=False, inherited=False, **kwargs):
+        if isTypeName:
+            node_type = name
+        else:
+            node_type = self._node(name).type
+        if inherited:
+            return list(reversed(inherited_types(node_type))), 0
+        return node_type, 0
+
+    @command()
+    def listRelatives(self, *args, **kwargs):
+        full_path = _flag(kwargs, "fullPath", "f", default=False)
+        node_type = _flag(kwargs, "type", "typ")
+        no_intermediate = _flag(kwargs, "noIntermediate", "ni", default=False)
+        result = []
+        visited = 0
+        for name in _flatten(args):
+            node = self._node(name)
+            if _flag(kwargs, "parent", "p", default=False):
+                related = [node.parent] if node.parent else []
+            elif _flag(kwargs, "allDescendents", "ad", default=False):
+                related = list(node.descendants())
+            else:
+                related = list(node.children)
+                if _flag(kwargs, "shapes", "s", default=False):
+                    related = [child for child in related if child.type != "transform"]
+            visited += len(related)
+            for other in related:
+                if not self._matches_type(other, node_type):
+                    continue
+                if no_intermediate and other.attrs.get("intermediateObject"):
+                    continue
+                result.append(self._name(other, full_path))
+        return (result or None), visited
+
+    @command()
+    def listConnections(
+        self, *args, type=None, source=True, destination=True, **kwargs
+    ):
+        shapes = _flag(kwargs, "shapes", "sh", default=False)
+        connections = _flag(kwargs, "connections", "c", default=False)
+        connected = []
+        for name in _flatten(args):
+            node = self._node(name)
+            if source:
+                connected.extend((node, "input", other) for other in node.inputs)
+            if destination:
+                connected.extend((node, "output", other) for other in node.outputs)
+        if connections:
+            # Pairs of the plug of the queried node and the connected node
+            result = []
+            for node, plug, other in connected:
+                other_name = self._connected_name(other, type, shapes)
+                if other_name is not None:
+                    result.extend([f"{node.name}.{plug}", other_name])
+            return (result or None), len(connected)
+        result = []
+        for other in dict.fromkeys(other for _, _, other in connected):
+            other_name = self._connected_name(other, type, shapes)
+            if other_name is not None:
+                result.append(other_name)
+        return (list(dict.fromkeys(result)) or None), len(connected)
+
+    def _connected_name(self, other, type, shapes):
+        # Shapes are reported through their transform unless asked for
+        if other.is_dag and other.type != "transform" and not shapes:
+            if type in (None, "transform") and other.parent is not None:
+                other = other.parent
+        elif type == "transform" and other.is_dag and other.parent is not None:
+            other = other.parent
+        if self._matches_type(other, type):
+            return other.name
+        return None
+
+    @command()
+    def listHistory(self, name, **kwargs):
+        start = self._node(name)
+        history = [start]
+        queue = [start]
+        while queue:
+            node = queue.pop()
+            for other in node.inputs:
+                if other not in history:
+                    history.append(other)
+                    queue.append(other)
+        return [node.name for node in history], len(history)
+
+    @command()
+    def getAttr(self, plug, **kwargs):
+        node_name, attr = plug.split(".", 1)
+        node = self._node(node_name)
+        if attr not in node.attrs:
+            node.attrs[attr] = ATTRIBUTE_DEFAULTS.get(attr, 0)
+        return node.attrs[attr], 0
+
+    @command()
+    def setAttr(self, plug, *values, **kwargs):
+        node_name, attr = plug.split(".", 1)
+        node = self._node(node_name)
+        if "lock" in kwargs and not values:
+            return None, 0
+        node.attrs[attr] = values[0] if len(values) == 1 else list(values)
+        return None, 0
+
+    @command()
+    def exactWorldBoundingBox(self, name, **kwargs):
+        shape = self.standin.shape_of(self._node(name))
+        points = shape.points
+        if not points:
+            return [0.0] * 6, 0
+        xs, ys, zs = zip(*points)
+        return [min(xs), min(ys), min(zs), max(xs), max(ys), max(zs)], len(points)
+
+    @command()
+    def xform(self, name, **kwargs):
+        components = self._expand_component(name)
+        indices = self._component_indices(components)
+        result = []
+        for shape, ids in indices.items():
+            for index in ids:
+                result.extend(shape.points[index])
+        return result, len(result) // 3
+
+    ############# EDITS
+
+    @command()
+    def select(self, *args, **kwargs):
+        standin = self.standin
+        items = _flatten(args)
+        if _flag(kwargs, "clear", "cl", default=False):
+            standin.selection = []
+        elif _flag(kwargs, "add", default=False):
+            standin.selection.extend(items)
+        else:
+            standin.selection = items
+        return None, len(items)
+
+    @command()
+    def createNode(self, node_type, name=None, parent=None, **kwargs):
+        parent_node = self._node(parent) if parent else None
+        return self.standin.add_node(node_type, name, parent_node).name, 0
+
+    @command()
+    def group(self, *args, **kwargs):
+        name = _flag(kwargs, "name", "n", default="group1")
+        group = self.standin.add_node("transform", name)
+        for child in _flatten(args):
+            self.standin._set_parent(self._node(child), group)
+        return group.name, 0
+
+    @command()
+    def parent(self, *args, **kwargs):
+        items = _flatten(args)
+        children, parent = items[:-1], self._node(items[-1])
+        for child in children:
+            child_node = self._node(child)
+            if child_node.parent is parent:
+                raise RuntimeError(f"{child} is already a child of {parent.name}.")
+            self.standin._set_parent(child_node, parent)
+        self.standin._redraw()
+        return [self._node(child).name for child in children], 0
+
+    @command()
+    def rename(self, old_name, new_name, **kwargs):
+        return self.standin.rename_node(self._node(old_name), new_name), 0
+
+    @command()
+    def delete(self, *args, **kwargs):
+        standin = self.standin
+        if _flag(kwargs, "constructionHistory", "ch", default=False):
+            return None, 0
+        items = _flatten(args) or list(standin.selection)
+        nodes = [standin.node(item) for item in items]
+        for node in nodes:
+            if node is not None and node.alive:
+                standin.remove_node(node)
+        return None, len(nodes)
+
+    @command()
+    def sets(self, *args, **kwargs):
+        standin = self.standin
+        items = _flatten(args)
+        if _flag(kwargs, "query", "q"):
+            members = self._node(items[0]).members
+            return (list(members) or None), len(members)
+        remove = _flag(kwargs, "remove", "rm")
+        if remove:
+            set_node = self._node(remove)
+            removed = {id(node) for node in map(standin.node, items) if node}
+            set_node.members = [
+                member
+                for member in set_node.members
+                if id(standin.node(member)) not in removed
+            ]
+            return None, len(items)
+        add = _flag(kwargs, "add", "addElement", "forceElement", "fe")
+        if add is True:
+            set_node = self._node(items[0])
+            members = list(standin.selection)
+        elif add:
+            set_node = self._node(add)
+            members = items
+        else:
+            name = _flag(kwargs, "name", "n", default="set1")
+            set_node = standin.add_node("objectSet", name)
+            members = [] if _flag(kwargs, "empty", "em") else items or standin.selection
+        for member in members:
+            if member not in set_node.members:
+                set_node.members.append(member)
+        return set_node.name, len(members)
+
+    ############# STATE
+
+    @command()
+    def undoInfo(self, **kwargs):
+        standin = self.standin
+        if kwargs.get("query") or kwargs.get("q"):
+            return standin.undo_enabled, 0
+        if "stateWithoutFlush" in kwargs:
+            standin.undo_enabled = kwargs["stateWithoutFlush"]
+        if "state" in kwargs:
+            standin.undo_enabled = kwargs["state"]
+        if kwargs.get("openChunk"):
+            standin.undo_chunks += 1
+        if kwargs.get("closeChunk"):
+            standin.undo_chunks -= 1
+        return None, 0
+
+    @command()
+    def refresh(self, suspend=None, **kwargs):
+        if suspend is not None:
+            self.standin.refresh_suspended = suspend
+        return None, 0
+
+    @command()
+    def about(self, batch=False, **kwargs):
+        # Pretend to be an interactive session so refresh handling is modelled
+        return False, 0
+
+    @command()
+    def warning(self, message, **kwargs):
+        self.standin.warnings.append(message)
+        return None, 0
+
+    @command()
+    def evalDeferred(self, script, **kwargs):
+        self.standin.deferred.append(script)
+        return None, 0
+
+    ############# ZIVA
+
+    def _solver(self):
+        standin = self.standin
+        if standin._solver is None or not standin._solver.alive:
+            transform = standin.add_node("zSolverTransform", "zSolver1Transform")
+            standin._solver = standin.add_node("zSolver", "zSolver1")
+            standin.connect(standin._solver, transform)
+            standin._embedder = standin.add_node("zEmbedder", "zEmbedder1")
+            standin._new_embedder = True
+        return standin._solver
+
+    def _create_ziva(self, node_type, meshes, inputs=()):
+        standin = self.standin
+        node = standin.add_node(node_type)
+        node.meshes = list(meshes)
+        standin.connect(self._solver(), node)
+        for other in inputs:
+            standin.connect(other, node)
+        for mesh in meshes:
+            standin.connect(node, mesh)
+        return node
+
+    def _selected_meshes(self):
+        return self._meshes(self.standin.selection)
+
+    def _meshes(self, items):
+        meshes = []
+        for item in items:
+            shape = self.standin.shape_of(self.standin.node(item))
+            if shape is not None and shape.type == "mesh" and shape not in meshes:
+                meshes.append(shape)
+        return meshes
+
+    def _make_tissue(self, mesh):
+        standin = self.standin
+        self._solver()
+        geo = self._create_ziva("zGeo", [mesh])
+        standin.connect(mesh, geo)
+        tet = self._create_ziva("zTet", [mesh])
+        material = self._create_ziva("zMaterial", [mesh])
+        tissue = self._create_ziva("zTissue", [mesh], (geo, tet, material))
+        tet.attrs["tetSize"] = 1.0
+        return [geo.name, tissue.name, tet.name, material.name]
+
+    def _make_bone(self, mesh):
+        geo = self._create_ziva("zGeo", [mesh])
+        self.standin.connect(mesh, geo)
+        bone = self._create_ziva("zBone", [mesh], (geo,))
+        return [geo.name, bone.name]
+
+    @command()
+    def ziva(self, *args, **kwargs):
+        standin = self.standin
+        targets = [standin.shape_of(self._node(arg)) for arg in _flatten(args)]
+        created = []
+        key = "ziva"
+        items = 0
+
+        if kwargs.get("t"):
+            key = "ziva -t"
+            for mesh in targets or self._selected_meshes():
+                created.extend(self._make_tissue(mesh))
+                items += len(mesh.points)
+        elif kwargs.get("b"):
+            key = "ziva -b"
+            for mesh in targets or self._selected_meshes():
+                created.extend(self._make_bone(mesh))
+                items += len(mesh.points)
+        elif kwargs.get("c"):
+            key = "ziva -c"
+            for mesh in targets or self._selected_meshes():
+                self._solver()
+                geo = self._create_ziva("zGeo", [mesh])
+                standin.connect(mesh, geo)
+                cloth = self._create_ziva("zCloth", [mesh], (geo,))
+                material = self._create_ziva("zMaterial", [mesh], (cloth,))
+                created.extend([geo.name, cloth.name, material.name])
+                items += len(mesh.points)
+        elif kwargs.get("m"):
+            for mesh in targets or self._selected_meshes():
+                created.append(self._create_ziva("zMaterial", [mesh]).name)
+        elif kwargs.get("f"):
+            key = "ziva -f"
+            for mesh in targets or self._selected_meshes():
+                tissues = [n for n in standin.ziva_nodes(mesh) if n.type == "zTissue"]
+                if not tissues:
+                    raise RuntimeError(f"{mesh.name} is not a zTissue.")
+                created.append(self._create_ziva("zFiber", [mesh], tissues[:1]).name)
+                items += len(mesh.points)
+        elif kwargs.get("a"):
+            key = "ziva -a"
+            objects = _flatten(args) or standin.selection
+            components = self._component_indices(objects)
+            meshes = list(components) + [
+                mesh for mesh in self._meshes(objects) if mesh not in components
+            ]
+            if len(meshes) != 2:
+                raise RuntimeError("Select source vertices and a target mesh.")
+            attachment = self._create_ziva("zAttachment", meshes)
+            attachment.attrs["attachmentMode"] = 1
+            created.append(attachment.name)
+            items = sum(len(ids) for ids in components.values())
+        elif kwargs.get("loa"):
+            objects = _flatten(args) or standin.selection
+            selected = [standin.node(item) for item in objects]
+            fibers = [node for node in selected if node and node.type == "zFiber"]
+            curves = [
+                standin.shape_of(node) for node in selected if node and node.is_dag
+            ]
+            if not fibers or not curves:
+                raise RuntimeError("Select a zFiber and a curve.")
+            loa = self._create_ziva(
+                "zLineOfAction", fibers[0].meshes, (fibers[0], curves[0])
+            )
+            created.append(loa.name)
+        elif kwargs.get("rm"):
+            key = "ziva -rm"
+            for mesh in targets or self._selected_meshes():
+                for node in standin.ziva_nodes(mesh):
+                    standin.remove_node(node)
+                    items += 1
+        # Counted under its flag, unless run by another command (mel.eval)
+        if standin._depth == 1:
+            standin.counts[key] += 1
+        standin.charge(key, items)
+        return created, None
+
+    @command()
+    def zQuery(self, *args, **kwargs):
+        standin = self.standin
+        node_type = kwargs.get("type", kwargs.get("t"))
+        if kwargs.get("loa"):
+            node_type = "zLineOfAction"
+        names = _flatten(args) or list(standin.selection)
+        ziva_nodes = [
+            node for node in standin.nodes.values() if node.type in ZIVA_TYPES
+        ]
+
+        if names:
+            meshes = set()
+            for name in names:
+                node = standin.node(name)
+                if node is None:
+                    continue
+                if node.type in ZIVA_TYPES:
+                    meshes.update(node.meshes)
+                elif node.is_dag:
+                    shape = standin.shape_of(node)
+                    if shape is not None:
+                        meshes.add(shape)
+                    meshes.update(n for n in node.descendants() if n.type == "mesh")
+            ziva_nodes = [
+                node for node in ziva_nodes if meshes.intersection(node.meshes)
+            ]
+        result = [
+            node.name
+            for node in ziva_nodes
+            if node_type is None or node.type == node_type
+        ]
+        return result, len(ziva_nodes)
+
+    @command()
+    def zFindVerticesByProximity(self, source, target, r=0.1, **kwargs):
+        # Vertices of the source within r of a target vertex, the dense
+        # synthetic meshes make this close to the distance to the surface
+        source_shape = self.standin.shape_of(self._node(source))
+        target_shape = self.standin.shape_of(self._node(target))
+        grid = _PointGrid(target_shape.points, r)
+        indices = [
+            index
+            for index, point in enumerate(source_shape.points)
+            if grid.within(point, r)
+        ]
+        result = [f"{source}.vtx[{index}]" for index in indices]
+        return result, len(source_shape.points) + len(target_shape.points)
+
+    @command()
+    def zRivetToBone(self, source, destination, **kwargs):
+        standin = self.standin
+        curve = standin.shape_of(self._node(source))
+        bone = standin.shape_of(self._node(destination))
+        rivet = standin.add_node("zRivetToBone")
+        rivet.meshes = [bone]
+        standin.connect(bone, rivet)
+        standin.connect(rivet, curve)
+        locator = standin.add_node("transform", "zRivet1")
+        standin.add_node("locator", f"{locator.name}Shape", locator)
+        standin.connect(rivet, locator)
+        return [rivet.name, locator.name], 0
+
+
+ATTRIBUTE_DEFAULTS = {
+    "intermediateObject": False,
+    "tetSize": 1.0,
+    "attachmentMode": 1,
+    "enable": True,
+}
+
+
+class _PointGrid(object):
+    """
+    Uniform hash grid over a point cloud for radius queries.
+    """
+
+    def __init__(self, points, cell_size):
+        self.cell_size = max(cell_size, 1e-6)
+        self.cells = defaultdict(list)
+        for point in points:
+            self.cells[self._cell(point)].append(point)
+
+    def _cell(self, point):
+        return tuple(int(math.floor(value / self.cell_size)) for value in point[:3])
+
+    def within(self, point, radius):
+        cx, cy, cz = self._cell(point)
+        radius_sq = radius * radius
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for dz in (-1, 0, 1):
+                    for other in self.cells.get((cx + dx, cy + dy, cz + dz), ()):
+                        distance_sq = sum((a - b) ** 2 for a, b in zip(point, other))
+                        if distance_sq <= radius_sq:
+                            return True
+        return False
+
+
+############################################################
+#################   MAYA.MEL   #############################
+############################################################
+
+
+class Mel(object):
+    """
+    maya.mel.eval for the MEL commands the toolbox runs.
+    """
+
+    def __init__(self, standin, cmds):
+        self.standin = standin
+        self.cmds = cmds
+
+    @command("mel.eval")
+    def eval(self, script, **kwargs):
+        standin = self.standin
+        result = None
+        for statement in filter(None, (part.strip() for part in script.split(";"))):
+            words = shlex.split(statement)
+            name, arguments = words[0], words[1:]
+            if name == "ziva":
+                flags = {
+                    arg.lstrip("-"): True for arg in arguments if arg.startswith("-")
+                }
+                targets = [arg for arg in arguments if not arg.startswith("-")]
+                result = self.cmds.ziva(*targets, **flags)
+            elif name == "zLineOfActionUtil":
+                standin.charge("zLineOfActionUtil")
+                result = [self._line_of_action(arguments[0])]
+            elif name == "ZivaDeleteSelection":
+                selected = [standin.node(item) for item in standin.selection]
+                ziva_nodes = [
+                    n for n in selected if n is not None and n.type in ZIVA_TYPES
+                ]
+                standin.charge("ZivaDeleteSelection", len(ziva_nodes))
+                for node in ziva_nodes:
+                    standin.remove_node(node)
+            else:
+                raise RuntimeError(f'Cannot find procedure "{name}".')
+        return result, 0
+
+    def _line_of_action(self, fiber_name):
+        # A straight curve through the fiber mesh along its longest axis
+        standin = self.standin
+        fiber = standin.node(fiber_name)
+        points = fiber.meshes[0].points
+        low = [min(p[axis] for p in points) for axis in range(3)]
+        high = [max(p[axis] for p in points) for axis in range(3)]
+        axis = max(range(3), key=lambda i: high[i] - low[i])
+        center = [(a + b) / 2.0 for a, b in zip(low, high)]
+        cvs = []
+        for step in range(LOA_NUM_CVS):
+            cv = list(center)
+            cv[axis] = low[axis] + (high[axis] - low[axis]) * step / (LOA_NUM_CVS - 1)
+            cvs.append(tuple(cv))
+        shape = standin.add_curve("curve1", cvs)
+        return shape.name
+
+
+LOA_NUM_CVS = 5
+
+############################################################
+#################   MAYA.API.OPENMAYA   ####################
+############################################################
+
+
+def build_open_maya(standin):
+    """
+    Build the maya.api.OpenMaya subset the toolbox uses, bound to `standin`.
+    """
+    om = types.ModuleType("maya.api.OpenMaya")
+
+    class MSpace(object):
+        kWorld = 4
+        kObject = 2
+
+    class MFn(object):
+        kDagNode = "dagNode"
+        kMesh = "mesh"
+
+    class MObject(object):
+        def __init__(self, node=None):
+            self._node = node
+
+        def hasFn(self, fn_type):
+            return fn_type in inherited_types(self._node.type)
+
+        def isNull(self):
+            return self._node is None
+
+    MObject.kNullObj = MObject()
+
+    class MObjectHandle(object):
+        def __init__(self, mobject):
+            self._node = mobject._node
+
+        def isValid(self):
+            return self._node is not None and self._node.alive
+
+        def isAlive(self):
+            return self.isValid()
+
+        def object(self):
+            return MObject(self._node)
+
+    class MFnDependencyNode(object):
+        def __init__(self, mobject):
+            self._node = mobject._node
+
+        @property
+        def typeName(self):
+            return self._node.type
+
+        def name(self):
+            return self._node.name
+
+    class MFnDagNode(MFnDependencyNode):
+        def fullPathName(self):
+            return self._node.full_path()
+
+        def partialPathName(self):
+            return self._node.name
+
+    class MPoint(object):
+        def __init__(self, x=0.0, y=0.0, z=0.0, w=1.0):
+            self.x, self.y, self.z, self.w = float(x), float(y), float(z), float(w)
+
+        def __len__(self):
+            return 4
+
+        def __getitem__(self, index):
+            return (self.x, self.y, self.z, self.w)[index]
+
+        def distanceTo(self, other):
+            return math.sqrt(
+                (self.x - other.x) ** 2
+                + (self.y - other.y) ** 2
+                + (self.z - other.z) ** 2
+            )
+
+    class MDagPath(object):
+        def __init__(self, node):
+            self._node = node
+
+        def fullPathName(self):
+            return self._node.full_path()
+
+    class MSelectionList(object):
+        def __init__(self):
+            self._items = []
+
+        def add(self, name):
+            node = standin.node(name)
+            if node is None:
+                raise RuntimeError(f"({name}) Object does not exist")
+            self._items.append(node)
+            return self
+
+        def length(self):
+            return len(self._items)
+
+        def getDagPath(self, index):
+            return MDagPath(self._items[index])
+
+        def getDependNode(self, index):
+            return MObject(self._items[index])
+
+    class MFnMesh(object):
+        def __init__(self, dag_path):
+            self._mesh = standin.shape_of(dag_path._node)
+
+        @property
+        def numVertices(self):
+            return len(self._mesh.points)
+
+        def getPoints(self, space=MSpace.kObject):
+            points = self._mesh.points
+            standin.charge("MFnMesh.getPoints", len(points))
+            with standin.measure():
+                return [MPoint(*point) for point in points]
+
+        def getTriangles(self):
+            triangles = self._mesh.triangles
+            standin.charge("MFnMesh.getTriangles", len(triangles))
+            return [len(triangles) // 3], list(triangles)
+
+        def getClosestPoint(self, point, space=MSpace.kObject):
+            # Closest vertex, the synthetic meshes are dense enough for it
+            standin.charge("MFnMesh.getClosestPoint")
+            with standin.measure():
+                best = min(
+                    self._mesh.points,
+                    key=lambda p: (p[0] - point.x) ** 2
+                    + (p[1] - point.y) ** 2
+                    + (p[2] - point.z) ** 2,
+                )
+            return MPoint(*best), 0
+
+    def _callback(event, wrap):
+        def register(function, *extra):
+            return standin.add_callback(event, wrap(function), *extra)
+
+        return register
+
+    def node_callback(function):
+        return lambda node, *extra: function(MObject(node), None)
+
+    class MDGMessage(object):
+        addNodeAddedCallback = staticmethod(
+            lambda function, node_type="dependNode", client_data=None: standin.add_callback(
+                "nodeAdded", node_callback(function)
+            )
+        )
+        addNodeRemovedCallback = staticmethod(
+            lambda function, node_type="dependNode", client_data=None: standin.add_callback(
+                "nodeRemoved", node_callback(function)
+            )
+        )
+
+    class MNodeMessage(object):
+        addNameChangedCallback = staticmethod(
+            lambda mobject, function, client_data=None: standin.add_callback(
+                "nameChanged",
+                lambda node, previous: function(MObject(node), previous, None),
+            )
+        )
+
+    class MDagMessage(object):
+        kParentAdded = 1
+        addAllDagChangesCallback = staticmethod(
+            lambda function, client_data=None: standin.add_callback(
+                "dagChanged",
+                lambda child, parent: function(
+                    MDagMessage.kParentAdded, MDagPath(child), MDagPath(parent), None
+                ),
+            )
+        )
+
+    class MSceneMessage(object):
+        kAfterNew = "sceneNew"
+        kAfterOpen = "sceneOpen"
+        addCallback = staticmethod(
+            lambda message, function, client_data=None: standin.add_callback(
+                message, lambda: function(None)
+            )
+        )
+
+    class MMessage(object):
+        removeCallback = staticmethod(standin.remove_callback)
+
+    for cls in (
+        MSpace,
+        MFn,
+        MObject,
+        MObjectHandle,
+        MFnDependencyNode,
+        MFnDagNode,
+        MPoint,
+        MDagPath,
+        MSelectionList,
+        MFnMesh,
+        MDGMessage,
+        MNodeMessage,
+        MDagMessage,
+        MSceneMessage,
+        MMessage,
+    ):
+        setattr(om, cls.__name__, cls)
+    return om
+
+
+############################################################
+#################   INSTALL   ##############################
+############################################################
+
+# Modules the toolbox imports that only matter inside Maya
+UNAVAILABLE_MODULES = [
+    "pymel",
+    "pymel.core",
+    "zBuilder",
+    "zBuilder.builders",
+    "zBuilder.builders.ziva",
+    "zBuilder.utils",
+    "utility",
+    "PySide2",
+    "PySide2.QtWidgets",
+]
+
+
+def _model_zbuilder_utils(module, cmds):
+    # zBuilder deletes the rivets with their locators
+    def remove_zRivetToBone_nodes(nodes):
+        rivets = cmds.ls(nodes, type="zRivetToBone") if nodes else []
+        if not rivets:
+            return
+        outputs = cmds.listConnections(rivets, source=False, shapes=True) or []
+        cmds.delete(rivets + (cmds.ls(outputs, type="transform") or []))
+
+    module.remove_zRivetToBone_nodes = remove_zRivetToBone_nodes
+
+
+class _Unavailable(types.ModuleType):
+    """
+    Placeholder for a Maya-only module, every attribute is a no-op callable.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return _Unavailable(f"{self.__name__}.{name}")
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+
+def install(placeholders=True):
+    """
+    Register the stand-in maya modules in sys.modules.
+
+    Args:
+        placeholders (bool): Also register placeholders for the Maya-only
+            modules of UNAVAILABLE_MODULES that cannot be imported.
+
+    Returns:
+        MayaStandIn: The stand-in, holding the scene and the counters.
+    """
+    if "maya.cmds" in sys.modules and not hasattr(sys.modules["maya.cmds"], "standin"):
+        raise RuntimeError("A real maya.cmds is already loaded.")
+
+    standin = MayaStandIn()
+    cmds = Cmds(standin)
+    mel = Mel(standin, cmds)
+
+    cmds_module = types.ModuleType("maya.cmds")
+    for name in dir(Cmds):
+        if not name.startswith("_"):
+            setattr(cmds_module, name, getattr(cmds, name))
+    cmds_module.standin = standin
+    mel_module = types.ModuleType("maya.mel")
+    mel_module.eval = mel.eval
+    om = build_open_maya(standin)
+
+    maya = types.ModuleType("maya")
+    maya_api = types.ModuleType("maya.api")
+    maya.cmds, maya.mel, maya.api = cmds_module, mel_module, maya_api
+    maya_api.OpenMaya = om
+    sys.modules.update(
+        {
+            "maya": maya,
+            "maya.cmds": cmds_module,
+            "maya.mel": mel_module,
+            "maya.api": maya_api,
+            "maya.api.OpenMaya": om,
+        }
+    )
+
+    for name in UNAVAILABLE_MODULES if placeholders else []:
+        if name in sys.modules:
+            continue
+        try:
+            __import__(name)
+        except ImportError:
+            sys.modules[name] = _Unavailable(name)
+            parent, _, child = name.rpartition(".")
+            if parent:
+                setattr(sys.modules[parent], child, sys.modules[name])
+    if isinstance(sys.modules.get("zBuilder.utils"), _Unavailable):
+        _model_zbuilder_utils(sys.modules["zBuilder.utils"], cmds_module)
+    return standin
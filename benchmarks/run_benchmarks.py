@@ -0,0 +1,347 @@
+"""
+Benchmark the toolbox against the in-memory Maya stand-in.
+
+Runs the create, attach, rivet, set and delete entry points of
+func_ziva_auto on synthetic scenes of increasing size, without Maya or the
+Ziva plugin:
+
+    python benchmarks/run_benchmarks.py --sizes 8 27 64 --json results.json
+
+Every case reports the Python time spent in the toolbox, the modelled Maya
+time of the commands it ran (see maya_standin.COMMAND_COSTS) and the number
+of commands. The scaling exponent between the two largest sizes flags cases
+that grow quadratically with the scene.
+"""
+
+import argparse
+import importlib.util
+import json
+import logging
+import math
+import os
+import statistics
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import maya_standin  # noqa: E402
+import synthetic_scene  # noqa: E402
+
+DEFAULT_SIZES = [8, 27, 64]
+
+# Exponent of time ~ size**k above which a case is reported as quadratic
+QUADRATIC_THRESHOLD = 1.5
+
+TISSUE_RADIUS = 0.1
+BONE_RADIUS = 0.2
+
+
+def register_toolbox():
+    """
+    Register this checkout as the z_toolbox package.
+    """
+    if "z_toolbox" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "z_toolbox",
+            os.path.join(REPO_ROOT, "__init__.py"),
+            submodule_search_locations=[REPO_ROOT],
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["z_toolbox"] = package
+        spec.loader.exec_module(package)
+
+
+def load_toolbox():
+    """
+    Import func_ziva_auto as z_toolbox.common.func_ziva_auto from this checkout.
+    """
+    register_toolbox()
+    import z_toolbox.common.func_ziva_auto as zi
+
+    return zi
+
+
+############################################################
+#################   CASES   ################################
+############################################################
+
+
+class Case(object):
+    """
+    One benchmarked entry point.
+
+    Args:
+        name (str): Case name shown in the report.
+        scene (dict): build_scene() flags of the scene the case starts from.
+        prepare (callable): prepare(zi, cmds, names) sets the selection up and
+            returns the callable to time.
+    """
+
+    def __init__(self, name, scene, prepare):
+        self.name = name
+        self.scene = scene
+        self.prepare = prepare
+
+
+def _select_and_call(group, function, *args):
+    def prepare(zi, cmds, names):
+        cmds.select(group)
+        return lambda: getattr(zi, function)(*args)
+
+    return prepare
+
+
+def _attach_all(function):
+    def prepare(zi, cmds, names):
+        return lambda: getattr(zi, function)(TISSUE_RADIUS, BONE_RADIUS)
+
+    return prepare
+
+
+def _sets(indices):
+    def prepare(zi, cmds, names):
+        def run():
+            for index in indices:
+                zi.sets_create_by_index(index)
+
+        return run
+
+    return prepare
+
+
+def _rivets(zi, cmds, names):
+    cmds.select(names["curves"])
+    return zi.create_ziva_rivet_to_bone
+
+
+def _delete_rivets(zi, cmds, names):
+    # Rivet every curve first, then delete the rivets of the first one
+    cmds.select(names["curves"])
+    zi.create_ziva_rivet_to_bone()
+    cmds.select(names["curves"][0])
+    return lambda: zi.delete_component_action("zRivetToBone")
+
+
+def _delete_all_rivets(zi, cmds, names):
+    # Rivet every curve first, then delete the rivets of every curve
+    cmds.select(names["curves"])
+    zi.create_ziva_rivet_to_bone()
+    return lambda: zi.delete_component_action("zRivetToBone")
+
+
+def _delete_attachments(zi, cmds, names):
+    zi.zattach_all_objects_button_one_time(TISSUE_RADIUS, BONE_RADIUS)
+    cmds.select(synthetic_scene.TISSUES_GROUP)
+    return lambda: zi.delete_component_action("zAttachment")
+
+
+CASES = [
+    Case(
+        "create_ziva_bone",
+        {},
+        _select_and_call(synthetic_scene.BONES_GROUP, "create_ziva_bone"),
+    ),
+    Case(
+        "create_ziva_tissue",
+        {},
+        _select_and_call(synthetic_scene.TISSUES_GROUP, "create_ziva_tissue"),
+    ),
+    Case(
+        "create_ziva_fiber",
+        {"tissues": True},
+        _select_and_call(synthetic_scene.TISSUES_GROUP, "create_ziva_fiber"),
+    ),
+    Case(
+        "create_ziva_cloth",
+        {},
+        _select_and_call(synthetic_scene.TISSUES_GROUP, "create_ziva_cloth"),
+    ),
+    Case(
+        "create_ziva_line_of_action",
+        {"fibers": True},
+        _select_and_call(synthetic_scene.TISSUES_GROUP, "create_ziva_line_of_action"),
+    ),
+    Case(
+        "zattach_all_objects_button",
+        {"tissues": True, "bones": True},
+        _attach_all("zattach_all_objects_button"),
+    ),
+    Case(
+        "zattach_all_objects_button_one_time",
+        {"tissues": True, "bones": True},
+        _attach_all("zattach_all_objects_button_one_time"),
+    ),
+    Case(
+        "create_ziva_rivet_to_bone",
+        {"fibers": True, "bones": True, "curves": True},
+        _rivets,
+    ),
+    Case(
+        "sets_create_by_index",
+        {"fibers": True, "bones": True},
+        _sets([0, 1, 2, 7, 8]),
+    ),
+    Case(
+        "delete_component_action zRivetToBone",
+        {"fibers": True, "bones": True, "curves": True},
+        _delete_rivets,
+    ),
+    Case(
+        "delete_component_action zRivetToBone all curves",
+        {"fibers": True, "bones": True, "curves": True},
+        _delete_all_rivets,
+    ),
+    Case(
+        "delete_component_action zAttachment",
+        {"tissues": True, "bones": True},
+        _delete_attachments,
+    ),
+    Case(
+        "deleteall_zivaNodes",
+        {"fibers": True, "bones": True},
+        _select_and_call(synthetic_scene.TISSUES_GROUP, "deleteall_zivaNodes"),
+    ),
+]
+
+
+############################################################
+#################   RUNNER   ###############################
+############################################################
+
+
+def run_case(standin, zi, case, size, vertices_per_mesh, repeat):
+    """
+    Time `case` on fresh scenes of `size` tissues, `repeat` times.
+
+    Returns:
+        dict: Median "python", "maya_model" and "estimate" seconds and the
+        command "calls" of the last run, by command.
+    """
+    import maya.cmds as cmds
+
+    runs = []
+    for _ in range(repeat):
+        names = synthetic_scene.build_scene(
+            standin, size, vertices_per_mesh=vertices_per_mesh, **case.scene
+        )
+        function = case.prepare(zi, cmds, names)
+        standin.reset_counters()
+        start = time.perf_counter()
+        function()
+        wall = time.perf_counter() - start
+        python_time = max(0.0, wall - standin.standin_time)
+        runs.append(
+            {
+                "python": python_time,
+                "maya_model": standin.model_time,
+                "estimate": python_time + standin.model_time,
+                "calls": dict(standin.counts),
+            }
+        )
+    result = {
+        key: statistics.median(run[key] for run in runs)
+        for key in ("python", "maya_model", "estimate")
+    }
+    result["calls"] = runs[-1]["calls"]
+    result["num_calls"] = sum(result["calls"].values())
+    return result
+
+
+def scaling_exponent(sizes, values):
+    """
+    Exponent k of value ~ size**k between the two largest sizes.
+    """
+    (size_a, value_a), (size_b, value_b) = list(zip(sizes, values))[-2:]
+    if value_a <= 0 or value_b <= 0 or size_a == size_b:
+        return 0.0
+    return math.log(value_b / value_a) / math.log(size_b / size_a)
+
+
+def run_benchmarks(sizes, vertices_per_mesh=160, repeat=3, cases=None, backend="ziva"):
+    """
+    Run the benchmark cases at every size.
+
+    Args:
+        sizes (list): Tissue counts of the synthetic scenes, bones are half.
+        vertices_per_mesh (int): Approximate vertex count of every mesh.
+        repeat (int): Runs per case and size, the median is kept.
+        cases (list): Names of the cases to run, all by default.
+        backend (str): func_ziva_spatial.PROXIMITY_BACKEND to use.
+
+    Returns:
+        dict: Case name -> {"sizes": {size: run_case() result},
+        "exponent", "calls_exponent", "quadratic"}.
+    """
+    standin = maya_standin.install()
+    zi = load_toolbox()
+    zi.zsp.PROXIMITY_BACKEND = backend
+    sizes = sorted(sizes)
+    results = {}
+    for case in CASES:
+        if cases and case.name not in cases:
+            continue
+        by_size = {
+            size: run_case(standin, zi, case, size, vertices_per_mesh, repeat)
+            for size in sizes
+        }
+        estimates = [by_size[size]["estimate"] for size in sizes]
+        num_calls = [by_size[size]["num_calls"] for size in sizes]
+        exponent = scaling_exponent(sizes, estimates) if len(sizes) > 1 else 0.0
+        calls_exponent = scaling_exponent(sizes, num_calls) if len(sizes) > 1 else 0.0
+        results[case.name] = {
+            "sizes": by_size,
+            "exponent": exponent,
+            "calls_exponent": calls_exponent,
+            "quadratic": max(exponent, calls_exponent) > QUADRATIC_THRESHOLD,
+        }
+    return results
+
+
+def format_report(results):
+    lines = [
+        f"{'case':<40} {'size':>5} {'python s':>9} {'maya s':>9} {'calls':>7}  top commands"
+    ]
+    for name, result in results.items():
+        for size, run in result["sizes"].items():
+            top = sorted(run["calls"].items(), key=lambda item: item[1], reverse=True)
+            top = ", ".join(f"{command} {calls}" for command, calls in top[:3])
+            lines.append(
+                f"{name:<40} {size:>5} {run['python']:>9.4f} "
+                f"{run['maya_model']:>9.4f} {run['num_calls']:>7}  {top}"
+            )
+        flag = "  <-- grows quadratically" if result["quadratic"] else ""
+        lines.append(
+            f"{'':<40} scaling exponent {result['exponent']:.2f} "
+            f"(calls {result['calls_exponent']:.2f}){flag}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--vertices", type=int, default=160)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--case", action="append", dest="cases")
+    parser.add_argument("--backend", choices=["ziva", "numpy"], default="ziva")
+    parser.add_argument("--json", help="Also write the results to this file.")
+    parser.add_argument("--verbose", action="store_true", help="Keep toolbox logs.")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.getLogger("z_toolbox").disabled = True
+    results = run_benchmarks(
+        args.sizes, args.vertices, args.repeat, args.cases, args.backend
+    )
+    print(format_report(results))
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(results, json_file, indent=4, sort_keys=True)
+    return 1 if any(result["quadratic"] for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""
+Time a Ziva shot over a grid of solver settings, headless under mayapy.
+
+Opens the scene, simulates the frame range once with the reference profile
+and once per combination of the swept values, and reports the seconds per
+frame and the displacement error of every combination against the
+reference:
+
+    mayapy benchmarks/solver_sweep.py shot.ma --substeps 1 2 4 \\
+        --newton 2 5 --spacing 0.003 0.01 0.03 --tolerance 0.05 \\
+        --csv sweep.csv
+
+The cheapest settings within --tolerance of the reference are printed last.
+Unlike the other benchmarks this needs Maya and the Ziva plugin, the
+stand-in does not simulate.
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import run_benchmarks  # noqa: E402
+
+ZIVA_PLUGIN = "ziva"
+
+
+def open_scene(path):
+    import maya.standalone
+
+    maya.standalone.initialize(name="python")
+    import maya.cmds as cmds
+
+    if not cmds.pluginInfo(ZIVA_PLUGIN, query=True, loaded=True):
+        cmds.loadPlugin(ZIVA_PLUGIN)
+    cmds.file(path, open=True, force=True)
+
+
+def build_grid(zsim, args):
+    values = {}
+    if args.substeps:
+        values["substeps"] = args.substeps
+    if args.newton:
+        values["maxNewtonIterations"] = args.newton
+    if args.spacing:
+        values["collisionPointSpacing"] = args.spacing
+    return zsim.settings_grid(**values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("scene", help="Maya scene of the shot.")
+    parser.add_argument("--substeps", type=int, nargs="+")
+    parser.add_argument("--newton", type=int, nargs="+")
+    parser.add_argument("--spacing", type=float, nargs="+")
+    parser.add_argument("--start", type=int, help="Solver start frame by default.")
+    parser.add_argument("--end", type=int, help="Playback end by default.")
+    parser.add_argument("--solver", help="Solver to sweep, all solvers by default.")
+    parser.add_argument(
+        "--reference",
+        default="final",
+        help="Solver profile the error is measured against, 'none' skips it.",
+    )
+    parser.add_argument("--tolerance", type=float, help="Max displacement error.")
+    parser.add_argument("--csv", help="Also write the rows to this file.")
+    parser.add_argument("--verbose", action="store_true", help="Keep toolbox logs.")
+    args = parser.parse_args(argv)
+
+    open_scene(args.scene)
+    run_benchmarks.register_toolbox()
+    import z_toolbox.common.func_ziva_simulation as zsim
+    import z_toolbox.common.func_ziva_solver as zsv
+
+    if not args.verbose:
+        logging.getLogger("z_toolbox").setLevel(logging.WARNING)
+    grid = build_grid(zsim, args)
+    if not grid:
+        parser.error("Give at least one of --substeps, --newton or --spacing.")
+    reference = None
+    if args.reference.lower() != "none":
+        reference = zsv.load_profile(args.reference)["attributes"]
+        # The shot keeps its own start frame, the frame range depends on it
+        reference.pop("startFrame", None)
+
+    start, end = zsim.get_frame_range(args.solver)
+    start = start if args.start is None else args.start
+    end = end if args.end is None else args.end
+    solvers = [args.solver] if args.solver else None
+    rows = zsim.sweep_solver_settings(
+        grid,
+        start,
+        end,
+        reference=reference,
+        tolerance=args.tolerance,
+        meshes=zsim.get_simulated_meshes(args.solver),
+        solvers=solvers,
+    )
+    print(zsim.format_sweep_table(rows))
+    if args.csv:
+        zsim.write_sweep_csv(rows, args.csv)
+
+    cheapest = zsim.cheapest_within_tolerance(rows)
+    if cheapest is not None:
+        settings = {key: cheapest[key] for key in grid[0]}
+        print(
+            f"Cheapest within tolerance: {settings}, "
+            f"{cheapest['seconds_per_frame']:.3f}s per frame"
+        )
+    elif args.tolerance is not None and reference is not None:
+        print("No settings within tolerance.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Measure how long the toolbox takes to start.
+
+Every run imports the toolbox modules in a fresh interpreter against the
+Maya stand-in, without pymel, zBuilder or PySide2 available, so it also
+checks that none of them is needed to start:
+
+    python benchmarks/startup_benchmark.py --repeat 5
+
+It also compares compiling the UI source, what start.py did every time it
+exec'd the file, with loading its cached bytecode.
+"""
+
+import argparse
+import importlib
+import importlib.util
+import json
+import marshal
+import os
+import py_compile
+import statistics
+import subprocess
+import sys
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, BENCHMARKS_DIR)
+
+import maya_standin  # noqa: E402
+import run_benchmarks  # noqa: E402
+
+UI_SOURCE = os.path.join(REPO_ROOT, "ziva_UI_auto_v2.py")
+
+# Imported in this order, as the UI does
+STARTUP_MODULES = [
+    "z_toolbox.common.func_ziva_runtime",
+    "z_toolbox.common.func_ziva_scene",
+    "z_toolbox.common.func_ziva_spatial",
+    "z_toolbox.common.func_ziva_tets",
+    "z_toolbox.common.func_ziva_auto",
+    "z_toolbox.common.func_ziva_profiler",
+]
+
+# Heavy modules that must not be imported at startup
+DEFERRED_MODULES = ["pymel", "zBuilder"]
+
+
+def measure_imports():
+    """
+    Import STARTUP_MODULES and time each one, meant for a fresh interpreter.
+
+    Returns:
+        dict: "modules" -> {module: seconds}, the "total" seconds and the
+        DEFERRED_MODULES that were "loaded".
+    """
+    maya_standin.install(placeholders=False)
+    run_benchmarks.register_toolbox()
+    times = {}
+    for name in STARTUP_MODULES:
+        start = time.perf_counter()
+        importlib.import_module(name)
+        times[name] = time.perf_counter() - start
+    loaded = [
+        name
+        for name in DEFERRED_MODULES
+        if any(module.split(".")[0] == name for module in sys.modules)
+    ]
+    return {"modules": times, "total": sum(times.values()), "loaded": loaded}
+
+
+def measure_ui_bytecode(repeat):
+    """
+    Seconds to compile the UI source against loading its cached bytecode.
+
+    Returns:
+        dict: Median "compile" and "cached" seconds.
+    """
+    with open(UI_SOURCE) as source_file:
+        source = source_file.read()
+    cache_path = py_compile.compile(UI_SOURCE, doraise=True)
+    compile_times = []
+    cached_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        compile(source, UI_SOURCE, "exec")
+        compile_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        with open(cache_path, "rb") as cache_file:
+            # Skip the 16 byte pyc header
+            marshal.loads(cache_file.read()[16:])
+        cached_times.append(time.perf_counter() - start)
+    return {
+        "compile": statistics.median(compile_times),
+        "cached": statistics.median(cached_times),
+    }
+
+
+def run_startup_benchmark(repeat=5):
+    """
+    Run measure_imports() in `repeat` fresh interpreters.
+
+    Returns:
+        dict: Median "modules" and "total" import seconds, the deferred
+        modules "loaded" by any run and the "ui_bytecode" timings.
+    """
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.check_output(
+            [sys.executable, os.path.abspath(__file__), "--child"],
+            cwd=REPO_ROOT,
+        )
+        runs.append(json.loads(output.decode().strip().splitlines()[-1]))
+    return {
+        "modules": {
+            name: statistics.median(run["modules"][name] for run in runs)
+            for name in STARTUP_MODULES
+        },
+        "total": statistics.median(run["total"] for run in runs),
+        "loaded": sorted({name for run in runs for name in run["loaded"]}),
+        "ui_bytecode": measure_ui_bytecode(repeat),
+    }
+
+
+def format_report(result):
+    lines = [f"{'module':<40} {'import ms':>10}"]
+    for name, seconds in result["modules"].items():
+        lines.append(f"{name:<40} {1000.0 * seconds:>10.1f}")
+    lines.append(f"{'total':<40} {1000.0 * result['total']:>10.1f}")
+    ui = result["ui_bytecode"]
+    lines.append(
+        f"UI source compile {1000.0 * ui['compile']:.1f} ms, "
+        f"cached bytecode load {1000.0 * ui['cached']:.1f} ms"
+    )
+    if result["loaded"]:
+        lines.append(f"Imported at startup: {', '.join(result['loaded'])}")
+    else:
+        lines.append(f"Not imported at startup: {', '.join(DEFERRED_MODULES)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="Also write the results to this file.")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(measure_imports()))
+        return 0
+    result = run_startup_benchmark(args.repeat)
+    print(format_report(result))
+    if args.json:
+        with open(args.json, "w") as json_file:
+            json.dump(result, json_file, indent=4, sort_keys=True)
+    return 1 if result["loaded"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
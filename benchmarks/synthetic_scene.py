@@ -0,0 +1,171 @@
+import math
+import random
+
+############################################################
+#################   SYNTHETIC SCENE   ######################
+############################################################
+
+TISSUES_GROUP = "tissues_grp"
+BONES_GROUP = "bones_grp"
+CURVES_GROUP = "lineofaction_grp"
+
+TISSUE_RADIUS = 1.0
+BONE_RADIUS = 0.4
+
+# Tissue centres are this far apart, slightly less than a diameter so
+# neighbouring tissues touch and the attach functions find vertices
+TISSUE_SPACING = 1.95
+
+
+def sphere_mesh(center, radius, num_vertices):
+    """
+    Points and triangles of a UV sphere with about `num_vertices` vertices.
+
+    Returns:
+        tuple: (points, triangles), triangles is a flat list of vertex ids.
+    """
+    segments = max(3, int(round(math.sqrt(2 * num_vertices))))
+    rings = max(2, (num_vertices - 2) // segments + 1)
+    cx, cy, cz = center
+    points = [(cx, cy + radius, cz)]
+    for ring in range(1, rings):
+        theta = math.pi * ring / rings
+        for segment in range(segments):
+            phi = 2.0 * math.pi * segment / segments
+            points.append(
+                (
+                    cx + radius * math.sin(theta) * math.cos(phi),
+                    cy + radius * math.cos(theta),
+                    cz + radius * math.sin(theta) * math.sin(phi),
+                )
+            )
+    points.append((cx, cy - radius, cz))
+
+    def ring_vertex(ring, segment):
+        return 1 + (ring - 1) * segments + segment % segments
+
+    triangles = []
+    bottom = len(points) - 1
+    for segment in range(segments):
+        triangles += [0, ring_vertex(1, segment + 1), ring_vertex(1, segment)]
+        triangles += [
+            bottom,
+            ring_vertex(rings - 1, segment),
+            ring_vertex(rings - 1, segment + 1),
+        ]
+    for ring in range(1, rings - 1):
+        for segment in range(segments):
+            a = ring_vertex(ring, segment)
+            b = ring_vertex(ring, segment + 1)
+            c = ring_vertex(ring + 1, segment)
+            d = ring_vertex(ring + 1, segment + 1)
+            triangles += [a, b, d, a, d, c]
+    return points, triangles
+
+
+def grid_positions(count, spacing):
+    """
+    `count` positions filling a cube shaped grid, x first.
+    """
+    side = max(1, int(math.ceil(count ** (1.0 / 3.0))))
+    return [
+        (
+            (index % side) * spacing,
+            (index // side % side) * spacing,
+            (index // (side * side)) * spacing,
+        )
+        for index in range(count)
+    ]
+
+
+def build_scene(
+    standin,
+    num_tissues,
+    num_bones=None,
+    vertices_per_mesh=160,
+    seed=0,
+    tissues=False,
+    bones=False,
+    fibers=False,
+    curves=False,
+):
+    """
+    Fill a new stand-in scene with tissue and bone meshes.
+
+    Tissues are spheres on a grid, each touching its neighbours. Bones are
+    smaller spheres sitting between two neighbouring tissues. Meshes follow
+    the toolbox naming, e.g. tissues_grp|tissue_007_geo|tissue_007_geoShape.
+
+    Args:
+        standin (MayaStandIn): The stand-in to build the scene in.
+        num_tissues (int): Number of tissue meshes.
+        num_bones (int): Number of bone meshes, defaults to half the tissues.
+        vertices_per_mesh (int): Approximate vertex count of every mesh.
+        seed (int): Seed of the small random offsets applied to the meshes.
+        tissues (bool): Make the tissue meshes zTissues.
+        bones (bool): Make the bone meshes zBones.
+        fibers (bool): Add a zFiber to every tissue, implies tissues.
+        curves (bool): Add a line of action curve through every tissue.
+
+    Returns:
+        dict: "tissues", "bones" and "curves" transform names.
+    """
+    import maya.cmds as cmds
+
+    standin.new_scene()
+    rng = random.Random(seed)
+    if num_bones is None:
+        num_bones = max(1, num_tissues // 2)
+
+    def jitter(position):
+        return tuple(value + rng.uniform(-0.02, 0.02) for value in position)
+
+    tissues_group = standin.add_node("transform", TISSUES_GROUP)
+    bones_group = standin.add_node("transform", BONES_GROUP)
+    centers = grid_positions(num_tissues, TISSUE_SPACING)
+
+    tissue_names = []
+    for index, center in enumerate(centers):
+        points, triangles = sphere_mesh(
+            jitter(center), TISSUE_RADIUS, vertices_per_mesh
+        )
+        shape = standin.add_mesh(
+            f"tissue_{index:03d}_geo", points, triangles, tissues_group
+        )
+        tissue_names.append(shape.parent.name)
+
+    bone_names = []
+    for index in range(num_bones):
+        first = centers[index % len(centers)]
+        second = centers[(index + 1) % len(centers)]
+        center = tuple((a + b) / 2.0 for a, b in zip(first, second))
+        points, triangles = sphere_mesh(jitter(center), BONE_RADIUS, vertices_per_mesh)
+        shape = standin.add_mesh(
+            f"bones_{index:03d}_geo", points, triangles, bones_group
+        )
+        bone_names.append(shape.parent.name)
+
+    if tissues or fibers:
+        for name in tissue_names:
+            cmds.ziva(name, t=True)
+    if bones:
+        for name in bone_names:
+            cmds.ziva(name, b=True)
+    if fibers:
+        for name in tissue_names:
+            cmds.ziva(name, f=True)
+
+    curve_names = []
+    if curves:
+        curves_group = standin.add_node("transform", CURVES_GROUP)
+        for index, center in enumerate(centers):
+            cvs = [
+                (center[0] + offset, center[1], center[2])
+                for offset in (-0.8, -0.4, 0.0, 0.4, 0.8)
+            ]
+            shape = standin.add_curve(f"LOA_ZF_tissue_{index:03d}", cvs, curves_group)
+            curve_names.append(shape.parent.name)
+
+    cmds.select(clear=True)
+    standin.reset_counters()
+    return {"tissues": tissue_names, "bones": bone_names, "curves": curve_names}
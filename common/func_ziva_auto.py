@@ -3,11 +3,17 @@ import random
 import maya.api.OpenMaya as om
 import maya.cmds as cmds
 import maya.mel as mel
-import pymel.core as pm
-import utility  # Assuming utility is a valid module in your environment
-import zBuilder.builders.ziva as zva
-import zBuilder.utils as utility
-from PySide2 import QtWidgets
+
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_scene as zsc
+import z_toolbox.common.func_ziva_spatial as zsp
+import z_toolbox.common.func_ziva_tets as ztet
+
+# Only the mirror and transfer tools use pymel and zBuilder, they are
+# imported the first time one of those tools runs
+pm = zrt.lazy_import("pymel.core")
+zva = zrt.lazy_import("zBuilder.builders.ziva")
+utility = zrt.lazy_import("zBuilder.utils")
 
 ############################################################
 #################   COMMON FUNCTIONS   #####################
@@ -34,14 +40,13 @@ def list_mesh_nodes_in_selected_objects(selected_objects):
     for obj in selected_objects:
         if cmds.objectType(obj, isType="transform"):
             child_meshes = (
-                cmds.listRelatives(obj, allDescendents=True, type="mesh") or []
+                zsc.get_scene_index().descendants(obj, "mesh", full_path=False) or []
             )
 
             # Filter out only meshes with specific conditions (e.g., not ending with "Orig")
+            existing_meshes = cmds.ls(child_meshes) if child_meshes else []
             filtered_meshes = [
-                mesh
-                for mesh in child_meshes
-                if cmds.objExists(mesh) and not mesh.endswith("Orig")
+                mesh for mesh in existing_meshes if not mesh.endswith("Orig")
             ]
 
             mesh_nodes_list.extend(filtered_meshes)
@@ -49,16 +54,36 @@ def list_mesh_nodes_in_selected_objects(selected_objects):
     return mesh_nodes_list
 
 
-def find_selected_mesh():
-    selected_objects = cmds.ls(selection=True)
+def nodes_or_selection(nodes=None, long=True):
+    """
+    The given nodes, or the selection when `nodes` is None.
+
+    The create and delete tools take their nodes as an argument so scripts
+    and batch sessions can run them without selecting anything, the UI
+    leaves it out to work on the selection.
+
+    Args:
+        nodes (str or list): Node names, a single name is accepted.
+        long (bool): Return full DAG paths.
+
+    Returns:
+        list: The existing nodes.
+    """
+    if nodes is None:
+        return cmds.ls(selection=True, long=long)
+    return cmds.ls(nodes, long=long) if nodes else []
+
+
+def find_selected_mesh(nodes=None):
+    selected_objects = nodes_or_selection(nodes, long=False)
     mesh_nodes_list = list_mesh_nodes_in_selected_objects(selected_objects)
 
     if mesh_nodes_list:
-        print("Mesh nodes in selected objects:")
+        zrt.log.debug("Mesh nodes in selected objects:")
         for mesh_node in mesh_nodes_list:
-            print(mesh_node)
+            zrt.log.debug("%s", mesh_node)
     else:
-        print(
+        zrt.log.warning(
             "No matching mesh nodes found in the selected objects or no objects selected."
         )
 
@@ -70,9 +95,9 @@ def find_selected_mesh():
 ############################################################
 
 
-def create_blendshape():
+def create_blendshape(nodes=None):
     # Get selected objects
-    selected_objects = cmds.ls(selection=True)
+    selected_objects = nodes_or_selection(nodes, long=False)
 
     if not selected_objects:
         cmds.warning("Please select source and target objects.")
@@ -119,7 +144,7 @@ def create_blendshape():
         cmds.setAttr(blendshape_node[0] + "." + source_objects[0], 1)
         cmds.setAttr(blendshape_node[0] + ".origin", 0)
 
-    print("BlendShape created successfully.")
+    zrt.log.info("BlendShape created successfully.")
 
 
 def is_group_with_deformable_meshes(group):
@@ -150,9 +175,9 @@ def separate_source_and_target(objects):
 # create_blendshape()
 
 
-def create_duplicate_clean_mesh():
+def create_duplicate_clean_mesh(nodes=None):
     # Check if the selected object is a mesh
-    selected_object = cmds.ls(selection=True, long=True)
+    selected_object = nodes_or_selection(nodes)
 
     for object in selected_object:
         if cmds.nodeType(find_shape_nodes_nonOrig(object)) == "mesh":
@@ -182,7 +207,7 @@ def create_duplicate_clean_mesh():
 
     # Delete history
     cmds.delete(duplicate_mesh, constructionHistory=True)
-    print("Mesh duplicated and cleaned successfully:", duplicate_mesh)
+    zrt.log.info("Mesh duplicated and cleaned successfully: %s", duplicate_mesh)
 
     return duplicate_mesh
 
@@ -197,17 +222,18 @@ def ____create_ziva_components____():
     return
 
 
-def create_ziva_BS__bone():
-    selected_objects = cmds.ls(selection=True, long=True)
+@zrt.bulk_operation("Create Bones_w/BS")
+def create_ziva_BS__bone(nodes=None):
+    selected_objects = nodes_or_selection(nodes)
 
     if not selected_objects:
-        print("No object selected. Please select an object.")
+        zrt.log.warning("No object selected. Please select an object.")
         return
 
     for obj in selected_objects:
         if cmds.objectType(obj, isType="transform"):
             child_meshes = (
-                cmds.listRelatives(obj, allDescendents=True, type="mesh", fullPath=True)
+                zsc.get_scene_index().descendants(obj, "mesh")
                 or []
             )
             for mesh in child_meshes:
@@ -229,35 +255,47 @@ def create_ziva_BS__bone():
                         if deformed_shape:
                             mesh = deformed_shape[0]
                         else:
-                            print(
-                                f"Skipping intermediate shape {mesh}. Corresponding shapeDeformed node not found."
+                            zrt.log.debug(
+                                "Skipping intermediate shape %s. Corresponding shapeDeformed node not found.",
+                                mesh,
                             )
+                            zrt.count("shapes skipped")
                             continue
 
                     # Check if the mesh has blend shapes
                     blend_shapes = cmds.listConnections(mesh, type="blendShape")
                     if not blend_shapes:
-                        print(
-                            f"Blend shapes not found. No blend shapes found in {mesh}."
+                        zrt.log.debug(
+                            "Blend shapes not found. No blend shapes found in %s.",
+                            mesh,
                         )
+                        zrt.count("shapes skipped")
                         continue
 
                     try:
                         bone_name = f"ZB_{mesh.split('|')[-1].split('Shape')[0].split('Deformed')[0]}"
-                        mel.eval(f"ziva -b {mesh};")
-                        bone_nodes = cmds.ls(type="zBone")
+                        with zsc.NodeCreationCapture() as created:
+                            mel.eval(f"ziva -b {mesh};")
+                        bone_nodes = created.nodes("zBone")
 
                         if bone_nodes:
                             cmds.rename(bone_nodes[-1], bone_name)
-                            print(
-                                f"Ziva bone created from {mesh} with name {bone_name}."
+                            zrt.log.debug(
+                                "Ziva bone created from %s with name %s.",
+                                mesh,
+                                bone_name,
                             )
+                            zrt.count("bones created")
                         else:
-                            print(f"Failed to create Ziva bone from {mesh}.")
+                            zrt.log.warning("Failed to create Ziva bone from %s.", mesh)
+                            zrt.count("bones failed")
                     except Exception as e:
-                        print(
-                            f"Failed to create Ziva bone from {mesh}. Error: {str(e)}"
+                        zrt.log.warning(
+                            "Failed to create Ziva bone from %s. Error: %s",
+                            mesh,
+                            e,
                         )
+                        zrt.count("bones failed")
         else:
             shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
             if shapes and cmds.nodeType(shapes[0]) == "mesh":
@@ -277,52 +315,70 @@ def create_ziva_BS__bone():
                         if deformed_shape:
                             obj = deformed_shape[0]
                         else:
-                            print(
-                                f"Skipping intermediate shape {obj}. Corresponding shapeDeformed node not found."
+                            zrt.log.debug(
+                                "Skipping intermediate shape %s. Corresponding shapeDeformed node not found.",
+                                obj,
                             )
+                            zrt.count("shapes skipped")
                             continue
 
                     # Check if the mesh has blend shapes
                     blend_shapes = cmds.listConnections(mesh, type="blendShape")
                     if not blend_shapes:
-                        print(
-                            f"Blend shapes not found. No blend shapes found in {obj}."
+                        zrt.log.debug(
+                            "Blend shapes not found. No blend shapes found in %s.",
+                            obj,
                         )
+                        zrt.count("shapes skipped")
                         continue
 
                     try:
                         bone_name = f"ZB_{obj.split('|')[-1].split('Shape')[0].split('Deformed')[0]}"
-                        mel.eval(f"ziva -b {obj};")
-                        bone_nodes = cmds.ls(type="zBone")
+                        with zsc.NodeCreationCapture() as created:
+                            mel.eval(f"ziva -b {obj};")
+                        bone_nodes = created.nodes("zBone")
 
                         if bone_nodes:
                             cmds.rename(bone_nodes[-1], bone_name)
-                            print(
-                                f"Ziva bone created from {obj} with name {bone_name}."
+                            zrt.log.debug(
+                                "Ziva bone created from %s with name %s.",
+                                obj,
+                                bone_name,
                             )
+                            zrt.count("bones created")
                         else:
-                            print(f"Failed to create Ziva bone from {obj}.")
+                            zrt.log.warning("Failed to create Ziva bone from %s.", obj)
+                            zrt.count("bones failed")
                     except Exception as e:
-                        print(f"Failed to create Ziva bone from {obj}. Error: {str(e)}")
+                        zrt.log.warning(
+                            "Failed to create Ziva bone from %s. Error: %s",
+                            obj,
+                            e,
+                        )
+                        zrt.count("bones failed")
                 else:
-                    print(
-                        f"Object {obj} doesn't meet naming criteria for bones or contains 'Orig'."
+                    zrt.log.debug(
+                        "Object %s doesn't meet naming criteria for bones or contains 'Orig'.",
+                        obj,
                     )
+                    zrt.count("objects skipped")
             else:
-                print(f"Object {obj} is not a mesh.")
+                zrt.log.debug("Object %s is not a mesh.", obj)
+                zrt.count("objects skipped")
 
 
-def create_ziva_bone():
-    selected_objects = cmds.ls(selection=True, long=True)
+@zrt.bulk_operation("Create Bones")
+def create_ziva_bone(nodes=None):
+    selected_objects = nodes_or_selection(nodes)
 
     if not selected_objects:
-        print("No object selected. Please select an object.")
+        zrt.log.warning("No object selected. Please select an object.")
         return
 
     for obj in selected_objects:
         if cmds.objectType(obj, isType="transform"):
             child_meshes = (
-                cmds.listRelatives(obj, allDescendents=True, type="mesh", fullPath=True)
+                zsc.get_scene_index().descendants(obj, "mesh")
                 or []
             )
             for mesh in child_meshes:
@@ -333,20 +389,28 @@ def create_ziva_bone():
                 ):
                     try:
                         bone_name = f"ZB_{mesh.split('|')[-1]}"
-                        mel.eval(f"ziva -b {mesh};")
-                        bone_nodes = cmds.ls(type="zBone")
+                        with zsc.NodeCreationCapture() as created:
+                            mel.eval(f"ziva -b {mesh};")
+                        bone_nodes = created.nodes("zBone")
 
                         if bone_nodes:
                             cmds.rename(bone_nodes[-1], bone_name)
-                            print(
-                                f"Ziva bone created from {mesh} with name {bone_name}."
+                            zrt.log.debug(
+                                "Ziva bone created from %s with name %s.",
+                                mesh,
+                                bone_name,
                             )
+                            zrt.count("bones created")
                         else:
-                            print(f"Failed to create Ziva bone from {mesh}.")
+                            zrt.log.warning("Failed to create Ziva bone from %s.", mesh)
+                            zrt.count("bones failed")
                     except Exception as e:
-                        print(
-                            f"Failed to create Ziva bone from {mesh}. Error: {str(e)}"
+                        zrt.log.warning(
+                            "Failed to create Ziva bone from %s. Error: %s",
+                            mesh,
+                            e,
                         )
+                        zrt.count("bones failed")
         else:
             shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
             if shapes and cmds.nodeType(shapes[0]) == "mesh":
@@ -355,101 +419,137 @@ def create_ziva_bone():
                 ) and not obj.endswith("Orig"):
                     try:
                         bone_name = f"ZB_{obj.split('|')[-1]}"
-                        mel.eval(f"ziva -b {obj};")
-                        bone_nodes = cmds.ls(type="zBone")
+                        with zsc.NodeCreationCapture() as created:
+                            mel.eval(f"ziva -b {obj};")
+                        bone_nodes = created.nodes("zBone")
 
                         if bone_nodes:
                             cmds.rename(bone_nodes[-1], bone_name)
-                            print(
-                                f"Ziva bone created from {obj} with name {bone_name}."
+                            zrt.log.debug(
+                                "Ziva bone created from %s with name %s.",
+                                obj,
+                                bone_name,
                             )
+                            zrt.count("bones created")
                         else:
-                            print(f"Failed to create Ziva bone from {obj}.")
+                            zrt.log.warning("Failed to create Ziva bone from %s.", obj)
+                            zrt.count("bones failed")
                     except Exception as e:
-                        print(f"Failed to create Ziva bone from {obj}. Error: {str(e)}")
+                        zrt.log.warning(
+                            "Failed to create Ziva bone from %s. Error: %s",
+                            obj,
+                            e,
+                        )
+                        zrt.count("bones failed")
                 else:
-                    print(
-                        f"Object {obj} doesn't meet naming criteria for bones or contains 'Orig'."
+                    zrt.log.debug(
+                        "Object %s doesn't meet naming criteria for bones or contains 'Orig'.",
+                        obj,
                     )
+                    zrt.count("objects skipped")
             else:
-                print(f"Object {obj} is not a mesh.")
+                zrt.log.debug("Object %s is not a mesh.", obj)
+                zrt.count("objects skipped")
 
 
-def create_ziva_tissue():
-    selected_objects = cmds.ls(selection=True, long=True)
+def _create_tissue(mesh, tissue_base, base):
+    try:
+        tissue_name = f"ZT_{tissue_base}"
+        emb_name = f"ZEM_{base}"
+        geo_name = f"ZGEO_{base}"
+        mat_name = f"ZMAT_{base}"
+        tet_name = f"ZTET_{base}"
+        with zsc.NodeCreationCapture() as created:
+            mel.eval(f"ziva -t {mesh};")
+        tissue_nodes = created.nodes("zTissue")
+        # emb_nodes = created.nodes("zEmbedder")
+        geo_nodes = created.nodes("zGeo")
+        mat_nodes = created.nodes("zMaterial")
+        tet_nodes = created.nodes("zTet")
+
+        if tissue_nodes:
+            cmds.rename(tissue_nodes[-1], tissue_name)
+            # cmds.rename(emb_nodes[-1],emb_name)
+            cmds.rename(geo_nodes[-1], geo_name)
+            cmds.rename(mat_nodes[-1], mat_name)
+            cmds.rename(tet_nodes[-1], tet_name)
+            zrt.log.debug(
+                "Ziva tissue created from %s with name %s.",
+                mesh,
+                tissue_name,
+            )
+            zrt.count("tissues created")
+        else:
+            zrt.log.warning("Failed to create Ziva tissue from %s.", mesh)
+            zrt.count("tissues failed")
+    except Exception as e:
+        zrt.log.warning(
+            "Failed to create Ziva tissue from %s. Error: %s",
+            mesh,
+            e,
+        )
+        zrt.count("tissues failed")
 
-    if not selected_objects:
-        print("No object selected. Please select an object.")
-        return
 
+def _tissue_targets(selected_objects):
+    # (mesh, tissue base name, base name) of every tissue to create, the
+    # names are None for objects that are skipped
+    targets = []
     for obj in selected_objects:
         if cmds.objectType(obj, isType="transform"):
-            children = (
-                cmds.listRelatives(obj, allDescendents=True, type="mesh", fullPath=True)
-                or []
-            )
+            children = zsc.get_scene_index().descendants(obj, "mesh") or []
             for shape in children:
                 # if cmds.objExists(shape) and (shape.lower().startswith("tissue*_") or "tissue*_" in shape.lower()) and not shape.endswith("Orig"):
                 if not shape.endswith("Orig"):
-                    try:
-                        tissue_name = f"ZT_{shape.split('|')[-1].split('Shape')[0]}"
-                        emb_name = f"ZEM_{shape.split('|')[-1].split('Shape')[0]}"
-                        geo_name = f"ZGEO_{shape.split('|')[-1].split('Shape')[0]}"
-                        mat_name = f"ZMAT_{shape.split('|')[-1].split('Shape')[0]}"
-                        tet_name = f"ZTET_{shape.split('|')[-1].split('Shape')[0]}"
-                        mel.eval(f"ziva -t {shape};")
-                        tissue_nodes = cmds.ls(type="zTissue")
-                        # emb_nodes = cmds.ls(type="zEmbedder")
-                        geo_nodes = cmds.ls(type="zGeo")
-                        mat_nodes = cmds.ls(type="zMaterial")
-                        tet_nodes = cmds.ls(type="zTet")
-
-                        if tissue_nodes:
-                            cmds.rename(tissue_nodes[-1], tissue_name)
-                            # cmds.rename(emb_nodes[-1],emb_name)
-                            cmds.rename(geo_nodes[-1], geo_name)
-                            cmds.rename(mat_nodes[-1], mat_name)
-                            cmds.rename(tet_nodes[-1], tet_name)
-                            print(
-                                f"Ziva tissue created from {shape} with name {tissue_name}."
-                            )
-                        else:
-                            print(f"Failed to create Ziva tissue from {shape}.")
-                    except Exception as e:
-                        print(
-                            f"Failed to create Ziva tissue from {shape}. Error: {str(e)}"
-                        )
+                    base = shape.split("|")[-1].split("Shape")[0]
+                    targets.append((shape, base, base))
         else:
             shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
             if shapes and cmds.nodeType(shapes[0]) == "mesh":
-                try:
-                    tissue_name = f"ZT_{obj.split('|')[-1]}"
-                    emb_name = f"ZEM_{shape.split('|')[-1].split('Shape')[0]}"
-                    geo_name = f"ZGEO_{shape.split('|')[-1].split('Shape')[0]}"
-                    mat_name = f"ZMAT_{shape.split('|')[-1].split('Shape')[0]}"
-                    tet_name = f"ZTET_{shape.split('|')[-1].split('Shape')[0]}"
-                    mel.eval(f"ziva -t {obj};")
-                    tissue_nodes = cmds.ls(type="zTissue")
-                    # emb_nodes = cmds.ls(type="zEmbedder")
-                    geo_nodes = cmds.ls(type="zGeo")
-                    mat_nodes = cmds.ls(type="zMaterial")
-                    tet_nodes = cmds.ls(type="zTet")
-
-                    if tissue_nodes:
-                        cmds.rename(tissue_nodes[-1], tissue_name)
-                        # cmds.rename(emb_nodes[-1],emb_name)
-                        cmds.rename(geo_nodes[-1], geo_name)
-                        cmds.rename(mat_nodes[-1], mat_name)
-                        cmds.rename(tet_nodes[-1], tet_name)
-                        print(
-                            f"Ziva tissue created from {obj} with name {tissue_name}."
-                        )
-                    else:
-                        print(f"Failed to create Ziva tissue from {obj}.")
-                except Exception as e:
-                    print(f"Failed to create Ziva tissue from {obj}. Error: {str(e)}")
+                short_name = obj.split("|")[-1]
+                targets.append((obj, short_name, short_name.split("Shape")[0]))
             else:
-                print(f"Object {obj} isn't a mesh or a group with mesh descendants.")
+                targets.append((obj, None, None))
+    return targets
+
+
+def create_ziva_tissue_job(nodes=None):
+    """
+    Create Tissues on the selected meshes and groups, one mesh per step.
+
+    Args:
+        nodes (list): Meshes and groups, the selection by default.
+
+    Returns:
+        zrt.Job: The job, None if nothing is selected.
+    """
+    selected_objects = nodes_or_selection(nodes)
+
+    if not selected_objects:
+        zrt.log.warning("No object selected. Please select an object.")
+        return None
+
+    targets = _tissue_targets(selected_objects)
+
+    def steps():
+        for mesh, tissue_base, base in targets:
+            if tissue_base is None:
+                zrt.log.debug(
+                    "Object %s isn't a mesh or a group with mesh descendants.",
+                    mesh,
+                )
+                zrt.count("objects skipped")
+            else:
+                _create_tissue(mesh, tissue_base, base)
+            yield mesh
+
+    return zrt.Job("Create Tissues", steps(), len(targets))
+
+
+def create_ziva_tissue(nodes=None):
+    job = create_ziva_tissue_job(nodes)
+    if job:
+        job.run()
 
 
 # def create_ziva_fiber():
@@ -529,67 +629,105 @@ def create_ziva_tissue():
 #                 print(f"Object {obj} is not a mesh.")
 
 
-def create_ziva_fiber():
-    selected_objects = cmds.ls(selection=True, long=True)
+@zrt.bulk_operation("Create Fiber")
+def create_ziva_fiber(nodes=None):
+    selected_objects = nodes_or_selection(nodes)
 
     if not selected_objects:
-        print("No object selected. Please select an object.")
+        zrt.log.warning("No object selected. Please select an object.")
         return
 
     for obj in selected_objects:
         if cmds.objectType(obj, isType="transform"):
             child_meshes = (
-                cmds.listRelatives(obj, allDescendents=True, type="mesh", fullPath=True)
+                zsc.get_scene_index().descendants(obj, "mesh")
                 or []
             )
             for mesh in child_meshes:
                 # Check if the object is associated with Ziva tissue
-                tissue_nodes = cmds.zQuery(mesh, type="zTissue") or []
+                tissue_nodes = zsc.get_scene_index().zquery(mesh, type="zTissue") or []
                 for tissue_node in tissue_nodes:
-                    fiber_nodes = cmds.zQuery(tissue_node , type="zFiber") or []
+                    fiber_nodes = zsc.get_scene_index().zquery(tissue_node , type="zFiber") or []
                     num_fibers = len(fiber_nodes)
                     if cmds.objExists(mesh) and not mesh.endswith("Orig"):
                         try:
                             tissue_node = tissue_node.replace('ZT_' , '')
                             fiber_name = f"ZF_{tissue_node}_{num_fibers + 1}_fiber"
-                            mel.eval(f"ziva -f {mesh};")
-                            new_fiber_nodes = cmds.zQuery(tissue_node , type="zFiber") or []
-                            new_fiber_node = list(set(new_fiber_nodes) - set(fiber_nodes))
+                            with zsc.NodeCreationCapture() as created:
+                                mel.eval(f"ziva -f {mesh};")
+                            new_fiber_node = created.nodes("zFiber")
                             if new_fiber_node:
                                 cmds.rename(new_fiber_node[0], fiber_name)
-                                print(f"Ziva fiber created from {mesh} with name {fiber_name}.")
+                                zrt.log.debug(
+                                    "Ziva fiber created from %s with name %s.",
+                                    mesh,
+                                    fiber_name,
+                                )
+                                zrt.count("fibers created")
                             else:
-                                print(f"Failed to create Ziva fiber from {mesh}.")
+                                zrt.log.warning(
+                                    "Failed to create Ziva fiber from %s.",
+                                    mesh,
+                                )
+                                zrt.count("fibers failed")
                         except Exception as e:
-                            print(f"Failed to create Ziva fiber from {mesh}. Error: {str(e)}")
+                            zrt.log.warning(
+                                "Failed to create Ziva fiber from %s. Error: %s",
+                                mesh,
+                                e,
+                            )
+                            zrt.count("fibers failed")
                     else:
-                        print(f"No Ziva tissue present for {mesh}. Please create tissue first.")
+                        zrt.log.debug(
+                            "No Ziva tissue present for %s. Please create tissue first.",
+                            mesh,
+                        )
+                        zrt.count("objects skipped")
         else:
             shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
             if shapes and cmds.nodeType(shapes[0]) == "mesh":
                 # Check if the object is associated with Ziva tissue
-                tissue_nodes = cmds.zQuery(obj, type="zTissue") or []
+                tissue_nodes = zsc.get_scene_index().zquery(obj, type="zTissue") or []
                 for tissue_node in tissue_nodes:
-                    fiber_nodes = cmds.zQuery(tissue_node , type="zFiber") or []
+                    fiber_nodes = zsc.get_scene_index().zquery(tissue_node , type="zFiber") or []
                     num_fibers = len(fiber_nodes)
                     if not obj.endswith("Orig"):
                         try:
                             tissue_node = tissue_node.replace('ZT_' , '')
                             fiber_name = f"ZF_{tissue_node}_{num_fibers + 1}_fiber"
-                            mel.eval(f"ziva -f {obj};")
-                            new_fiber_nodes = cmds.zQuery(type="zFiber") or []
-                            new_fiber_node = list(set(new_fiber_nodes) - set(fiber_nodes))
+                            with zsc.NodeCreationCapture() as created:
+                                mel.eval(f"ziva -f {obj};")
+                            new_fiber_node = created.nodes("zFiber")
                             if new_fiber_node:
                                 cmds.rename(new_fiber_node[0], fiber_name)
-                                print(f"Ziva fiber created from {obj} with name {fiber_name}.")
+                                zrt.log.debug(
+                                    "Ziva fiber created from %s with name %s.",
+                                    obj,
+                                    fiber_name,
+                                )
+                                zrt.count("fibers created")
                             else:
-                                print(f"Failed to create Ziva fiber from {obj}.")
+                                zrt.log.warning(
+                                    "Failed to create Ziva fiber from %s.",
+                                    obj,
+                                )
+                                zrt.count("fibers failed")
                         except Exception as e:
-                            print(f"Failed to create Ziva fiber from {obj}. Error: {str(e)}")
+                            zrt.log.warning(
+                                "Failed to create Ziva fiber from %s. Error: %s",
+                                obj,
+                                e,
+                            )
+                            zrt.count("fibers failed")
                     else:
-                        print(f"No Ziva tissue present for {obj}. Please create tissue first.")
+                        zrt.log.debug(
+                            "No Ziva tissue present for %s. Please create tissue first.",
+                            obj,
+                        )
+                        zrt.count("objects skipped")
             else:
-                print(f"Object {obj} is not a mesh.")
+                zrt.log.debug("Object %s is not a mesh.", obj)
+                zrt.count("objects skipped")
 
 
 
@@ -600,9 +738,10 @@ def select_mesh(node):
     return unique_parents
 
 
-def create_ziva_cloth():
+@zrt.bulk_operation("Create Cloth")
+def create_ziva_cloth(nodes=None):
     # Get selected objects
-    selected_objects = cmds.ls(selection=True, long=True)
+    selected_objects = nodes_or_selection(nodes)
 
     # Check if an object is selected
     if not selected_objects:
@@ -619,8 +758,8 @@ def create_ziva_cloth():
 
     # Create Ziva zCloth
     for zc in zcloth_selection:
-        cmds.select(zc, r=True)
-        zcloth_nodes = cmds.ziva(c=True)
+        with zsc.NodeCreationCapture() as created:
+            zcloth_nodes = cmds.ziva(zc, c=True)
 
         # Check if zCloth is created
         if not zcloth_nodes:
@@ -628,25 +767,32 @@ def create_ziva_cloth():
             continue
 
         # Rename zCloth node
-        zemb = cmds.zQuery(type="zEmbedder")
+        zemb = created.nodes("zEmbedder")
         emb_name = f"ZEM_{zc.split('|')[-1].split('Shape')[0]}"
         geo_name = f"ZGEO_{zc.split('|')[-1].split('Shape')[0]}"
         zct_name = f"ZCTH_{zc.split('|')[-1].split('Shape')[0]}"
         mat_name = f"ZMAT_{zc.split('|')[-1].split('Shape')[0]}"
 
-        zemb_name = cmds.rename(zemb[0], emb_name)
+        # The embedder is shared, it only exists on the first cloth of a solver
+        if zemb:
+            zemb_name = cmds.rename(zemb[0], emb_name)
         zgeo_name = cmds.rename(zcloth_nodes[0], geo_name)
         zct_name = cmds.rename(zcloth_nodes[1], zct_name)
         zmat_name = cmds.rename(zcloth_nodes[2], mat_name)
 
-        print(
-            f"Ziva zCloth and zMaterial created for {zc}. zCloth Name: {zct_name}, zMaterial Name: {mat_name}"
+        zrt.log.debug(
+            "Ziva zCloth and zMaterial created for %s. zCloth Name: %s, zMaterial Name: %s",
+            zc,
+            zct_name,
+            mat_name,
         )
+        zrt.count("cloths created")
 
 
-def create_ziva_zmaterials():
+@zrt.bulk_operation("Create Materials")
+def create_ziva_zmaterials(nodes=None):
     # Get selected objects
-    selected_objects = cmds.ls(selection=True, long=True)
+    selected_objects = nodes_or_selection(nodes)
 
     # Check if an object is selected
     if not selected_objects:
@@ -663,8 +809,7 @@ def create_ziva_zmaterials():
 
     # Create Ziva Materials
     for zc in zmat_selection:
-        cmds.select(zc, r=True)
-        zmaterial_nodes = cmds.ziva(m=True)
+        zmaterial_nodes = cmds.ziva(zc, m=True)
 
         # Check if zMaterials is created
         if not zmaterial_nodes:
@@ -683,7 +828,8 @@ def create_ziva_zmaterials():
         mat_name = f"ZMAT_{zc.split('|')[-1].split('_',0)[-1]}_{num_materials}"
         zmat_name = cmds.rename(zmaterial_nodes[0], mat_name)
 
-        print(f"Ziva zMaterial created for {zc}. zMaterial Name: {mat_name}")
+        zrt.log.debug("Ziva zMaterial created for %s. zMaterial Name: %s", zc, mat_name)
+        zrt.count("materials created")
 
 
 # Apply Mirror with L and R objects selected
@@ -763,7 +909,7 @@ def create_zMirror():
         newname = source_transform.name().replace("l_", "r_")
 
         # Print the new name
-        print("Mirrored name:", newname)
+        zrt.log.debug("Mirrored name: %s", newname)
 
         # Identify destination mesh based on mirrored name
         dest_transform = pm.PyNode(newname)
@@ -775,7 +921,7 @@ def create_zMirror():
 
         # Remove Ziva setup from the destination mesh
         pm.select(dest_transform)
-        if not cmds.zQuery(type="zTissue"):
+        if not zsc.get_scene_index().zquery(type="zTissue"):
             cmds.warning(f"Skipping non-tissue object")
             continue
         pm.ziva(rm=True)
@@ -804,11 +950,23 @@ def create_zMirror_lr():
     utility.copy_paste_with_substitution("(^|_)l($|_)", "r")
 
 
-def create_ziva_line_of_action():
-    selected_objects = cmds.ls(selection=True, long=True)
+@zrt.bulk_operation("Create LOA")
+def create_ziva_line_of_action(nodes=None):
+    selected_objects = nodes_or_selection(nodes)
 
     if not selected_objects:
-        print("No object selected. Please select an object.")
+        zrt.log.warning("No object selected. Please select an object.")
+        return
+
+    scene = zsc.get_scene_index()
+    has_tissue = scene.ls("zTissue")
+    has_bone = scene.ls("zBone")
+    has_cloth = scene.ls("zCloth")
+
+    if not has_tissue and not has_bone and not has_cloth:
+        zrt.log.warning(
+            "No Ziva tissues, bones, or cloth present. Please create the necessary nodes first."
+        )
         return
 
     line_of_action_group = "lineofaction_grp"
@@ -818,13 +976,14 @@ def create_ziva_line_of_action():
     for obj in selected_objects:
         if cmds.objectType(obj, isType="transform"):
             child_meshes = (
-                cmds.listRelatives(obj, allDescendents=True, type="mesh", fullPath=True)
+                zsc.get_scene_index().descendants(obj, "mesh")
                 or []
             )
             for mesh in child_meshes:
-                fibers = cmds.zQuery(mesh, type="zFiber")
+                fibers = zsc.get_scene_index().zquery(mesh, type="zFiber")
                 if not fibers:
-                    print(f"No fibers found on {mesh}.")
+                    zrt.log.debug("No fibers found on %s.", mesh)
+                    zrt.count("objects skipped")
                     continue
 
                 for fiber in fibers:
@@ -832,24 +991,17 @@ def create_ziva_line_of_action():
                     loa_name = f"LOA_{fiber.split('|')[-1]}"
                     existing_loa = cmds.ls(loa_name)
                     if existing_loa:
-                        print(
-                            f"Line of action curve {loa_name} already exists. Skipping creation."
+                        zrt.log.debug(
+                            "Line of action curve %s already exists. Skipping creation.",
+                            loa_name,
                         )
+                        zrt.count("skipped, already present")
                         continue
 
                     try:
-                        has_tissue = cmds.ls(type="zTissue")
-                        has_bone = cmds.ls(type="zBone")
-                        has_cloth = cmds.ls(type="zCloth")
-
-                        if not has_tissue and not has_bone and not has_cloth:
-                            print(
-                                "No Ziva tissues, bones, or cloth present. Please create the necessary nodes first."
-                            )
-                            return
-
-                        mel.eval(f"zLineOfActionUtil {fiber};")
-                        loa_curves = cmds.ls("curve*", type="nurbsCurve", long=True)
+                        with zsc.NodeCreationCapture() as created:
+                            mel.eval(f"zLineOfActionUtil {fiber};")
+                        loa_curves = created.nodes("nurbsCurve", long=True)
                         if loa_curves:
                             loa_transform = cmds.listRelatives(
                                 loa_curves[0], parent=True, fullPath=True
@@ -857,32 +1009,43 @@ def create_ziva_line_of_action():
                             cmds.rename(loa_curves[0], f"{loa_name}Shape")
                             cmds.rename(loa_transform, loa_name)
                             cmds.parent(loa_name, line_of_action_group)
-                            print(
-                                f"Line of action curve created for {fiber} as {loa_name}."
+                            zrt.log.debug(
+                                "Line of action curve created for %s as %s.",
+                                fiber,
+                                loa_name,
                             )
+                            zrt.count("LOA curves created")
                         else:
-                            print(f"Failed to create line of action curve for {fiber}.")
+                            zrt.log.warning(
+                                "Failed to create line of action curve for %s.",
+                                fiber,
+                            )
+                            zrt.count("LOA curves failed")
                     except Exception as e:
-                        print(
-                            f"Failed to create line of action curve for {fiber}. Error: {str(e)}"
+                        zrt.log.warning(
+                            "Failed to create line of action curve for %s. Error: %s",
+                            fiber,
+                            e,
                         )
+                        zrt.count("LOA curves failed")
 
 
-def create_ziva_attachment(value, radio):
-    print(value, radio)
-    selected_objects = cmds.ls(selection=True, long=True)
-    print(value)
+def create_ziva_attachment(value, radio, nodes=None):
+    zrt.log.debug("%s %s", value, radio)
+    selected_objects = nodes_or_selection(nodes)
+    zrt.log.debug("%s", value)
     if len(selected_objects) != 2:
-        print("Please select exactly two objects for creating an attachment.")
+        zrt.log.warning("Please select exactly two objects for creating an attachment.")
         return
 
-    ztissue_count = len(cmds.ls(cmds.zQuery(selected_objects, type="zTissue"))) or len(
-        cmds.ls(cmds.zQuery(selected_objects, type="zCloth"))
+    scene = zsc.get_scene_index()
+    ztissue_count = len(cmds.ls(scene.zquery(selected_objects, type="zTissue"))) or len(
+        cmds.ls(scene.zquery(selected_objects, type="zCloth"))
     )
-    zbone_count = len(cmds.ls(cmds.zQuery(selected_objects, type="zBone")))
+    zbone_count = len(cmds.ls(scene.zquery(selected_objects, type="zBone")))
 
     if ztissue_count + zbone_count != 2:
-        print(
+        zrt.log.warning(
             "Invalid selection. Please select one zTissue and one zBone or two zTissues."
         )
         return
@@ -893,7 +1056,7 @@ def create_ziva_attachment(value, radio):
         if cmds.listRelatives(obj, shapes=True, type="mesh")
     ]
     if len(meshes) != 2:
-        print("Please select two meshes for creating an attachment.")
+        zrt.log.warning("Please select two meshes for creating an attachment.")
         return
 
     try:
@@ -902,17 +1065,20 @@ def create_ziva_attachment(value, radio):
 
         # Perform zFindVerticesByProximity to get vertices within a radius
         radius = value  # Set your desired radius value
-        vertices = cmds.zFindVerticesByProximity(meshes[0], meshes[1], r=radius)
-        cmds.select(vertices, meshes[1])
-        mel_command = cmds.ziva(a=True)
+        vertices = zsp.find_vertices_by_proximity(
+            meshes[0], meshes[1], radius, zsp.create_proximity_engine()
+        )
+        mel_command = cmds.ziva(vertices, meshes[1], a=True)
         cmds.setAttr(mel_command[0] + ".attachmentMode", radio)
 
         # Find existing attachments with the same name convention
         existing_attachments = cmds.ls(f"ZA_{source_mesh}_to_{target_mesh}_*_att")
         if existing_attachments:
-            print(
-                f"An attachment with the same name already exists: {existing_attachments[0]}"
+            zrt.log.debug(
+                "An attachment with the same name already exists: %s",
+                existing_attachments[0],
             )
+            zrt.count("skipped, already present")
             num_attachments = int(existing_attachments[0].split("_")[-2]) + 1
             attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_{num_attachments}_att"
 
@@ -942,11 +1108,16 @@ def create_ziva_attachment(value, radio):
         # Rename the last created zAttachment
         cmds.rename(last_attachment, attachment_name)
 
-        print(
-            f"Ziva attachment created between {source_mesh} and {target_mesh} as {attachment_name}."
+        zrt.log.debug(
+            "Ziva attachment created between %s and %s as %s.",
+            source_mesh,
+            target_mesh,
+            attachment_name,
         )
+        zrt.count("attachments created")
     except Exception as e:
-        print(f"Failed to create Ziva attachment. Error: {str(e)}")
+        zrt.log.warning("Failed to create Ziva attachment. Error: %s", e)
+        zrt.count("attachments failed")
 
 
 def ____create_rivets____():
@@ -956,7 +1127,7 @@ def ____create_rivets____():
 def get_bones_mesh_list():
     bone_meshes = [
         obj
-        for obj in cmds.ls(type="mesh", noIntermediate=True)
+        for obj in zsc.get_scene_index().ls("mesh", no_intermediate=True)
         if obj.lower().startswith("bones")
     ]
     transform_nodes = []
@@ -1019,7 +1190,8 @@ def zRivetToBone(source, destination):
     new_name = f"ZRIV_{src_name}_{destination_cv}".replace("_1_fiber", "")
 
     if cmds.ls(new_name):
-        print(f"Rivets {new_name} already exists. Skipping creation.")
+        zrt.log.debug("Rivets %s already exists. Skipping creation.", new_name)
+        zrt.count("skipped, already present")
         return
 
     zrivet_attr, zrivet_name = cmds.zRivetToBone(source, destination)
@@ -1038,41 +1210,62 @@ def zRivetToBone(source, destination):
         try:
             cmds.parent(zrivet_nname, zrivet_grp)
         except RuntimeError as err:
-            print(f"Error while parenting: {err}")
+            zrt.log.warning("Error while parenting: %s", err)
+            zrt.count("rivets failed to parent")
+
+
+def create_ziva_rivet_to_bone_job(curves=None):
+    """
+    Rivet the CVs of the selected curves to their closest bone, one CV per step.
 
+    Args:
+        curves (list): Curves or CVs, the selection by default.
 
-def create_ziva_rivet_to_bone():
+    Returns:
+        zrt.Job: The job, None if there is no curve or CV selected.
+    """
     meshes = get_bones_mesh_list()
     # Assuming one or more curves are selected
-    selected_curve = cmds.ls(selection=True)
-    for selected in selected_curve:
-        if not selected:
-            print("No valid curve selected.")
-            return
-        cvs = cmds.ls(selected + ".cv[*]", flatten=True)
-        if not cvs:
-            print("No CVs found in the selected curve.")
-            return
+    selected_curve = nodes_or_selection(curves, long=False)
+    if not selected_curve:
+        zrt.log.warning("No valid curve selected.")
+        return None
+
+    # Work out every CV -> bone assignment before creating any rivet
+    rivet_plan = zsp.plan_rivets(selected_curve, meshes)
+    if not rivet_plan:
+        zrt.log.warning("No CVs found in the selected curve.")
+        return None
 
-        for cv in cvs:
-            cv_pos = cmds.pointPosition(cv, world=True)
-            closest_bone = find_closest_mesh(meshes, cv_pos)
+    def steps():
+        for cv, closest_bone in rivet_plan:
             if closest_bone:
-                print(f"Closest mesh to CV {cv}: {closest_bone}")
+                zrt.log.debug("Closest mesh to CV %s: %s", cv, closest_bone)
                 zRivetToBone(cv, closest_bone)
             else:
-                print(f"No zBone found for CV: {cv}")
+                zrt.log.warning("No zBone found for CV: %s", cv)
+                zrt.count("CVs without a bone")
+            yield cv
+
+    return zrt.Job("Create Rivets", steps(), len(rivet_plan))
+
+
+def create_ziva_rivet_to_bone(curves=None):
+    job = create_ziva_rivet_to_bone_job(curves)
+    if job:
+        job.run()
 
 
 def ____create_muscle_to_loa____():
     return
 
 
-def create_ziva_muscle_loa():
+@zrt.bulk_operation("Create FibreLOA")
+def create_ziva_muscle_loa(curves=None):
     # Get selected curve
-    selected_curve = cmds.ls(selection=True)
+    selected_curve = nodes_or_selection(curves, long=False)
     if not selected_curve:
-        print("Please select exactly one curve.")
+        zrt.log.warning("Please select exactly one curve.")
         return
     for curve in selected_curve:
         # Extract fiber name
@@ -1081,23 +1274,27 @@ def create_ziva_muscle_loa():
         # Validate if the ZLOA already exists
         zloa_name = f"ZLOA_{fiber_name}"
         if cmds.ls(zloa_name):
-            print(f"ZLOA for {fiber_name} already exists. Skipping.")
+            zrt.log.debug("ZLOA for %s already exists. Skipping.", fiber_name)
+            zrt.count("skipped, already present")
             return
 
         # Get zFiber node
         zfiber_nodes = cmds.ls(fiber_name)
         if not zfiber_nodes:
-            print("No zFiber nodes found.")
+            zrt.log.warning("No zFiber nodes found.")
             return
 
         # Create zLineOfAction with ZLOA naming convention
         try:
-            cmds.select(zfiber_nodes[0], selected_curve[0])
-            zloa_node = cmds.ziva(loa=True)
+            with zsc.NodeCreationCapture() as created:
+                cmds.ziva(zfiber_nodes[0], curve, loa=True)
+            zloa_node = created.node("zLineOfAction")
             cmds.rename(zloa_node, zloa_name)
-            print(f"Created ZLOA: {zloa_name}")
+            zrt.log.debug("Created ZLOA: %s", zloa_name)
+            zrt.count("fibre LOAs created")
         except RuntimeError as err:
-            print(f"Error creating ZLOA: {err}")
+            zrt.log.warning("Error creating ZLOA: %s", err)
+            zrt.count("fibre LOAs failed")
 
 
 ############################################################
@@ -1109,23 +1306,46 @@ def create_ziva_muscle_loa():
 # Mostly works with a fresh scene without any attachment
 
 
+@zrt.bulk_operation("zAttach All Objects Both Ways")
 def zattach_all_objects_button(tissue_radius, bone_radius):
-    print(tissue_radius, bone_radius)
+    zrt.log.debug("%s %s", tissue_radius, bone_radius)
     bone_meshes = [
         obj
-        for obj in cmds.ls(type="mesh", noIntermediate=True)
+        for obj in zsc.get_scene_index().ls("mesh", no_intermediate=True)
         if obj.lower().startswith("bones")
     ]
     tissue_meshes = [
         obj
-        for obj in cmds.ls(type="mesh", noIntermediate=True)
+        for obj in zsc.get_scene_index().ls("mesh", no_intermediate=True)
         if obj.lower().startswith("tissue") and not obj.startswith("Orig")
     ]
 
+    # Broad-phase: only pairs whose inflated bounding boxes overlap can have
+    # vertices within the radius, every other pair skips the proximity query
+    tissue_boxes = zsp.get_world_bounding_boxes(tissue_meshes)
+    bone_boxes = zsp.get_world_bounding_boxes(bone_meshes)
+    tissue_pairs = zsp.find_candidate_pairs(tissue_boxes, tissue_boxes, tissue_radius)
+    bone_pairs = zsp.find_candidate_pairs(bone_boxes, tissue_boxes, bone_radius)
+    num_pairs = 0
+    num_pruned = 0
+
+    # Existing attachments by (source, target), kept in sync as we go
+    attachment_index = zsc.AttachmentIndex()
+
+    # Every candidate pair gets queried, answer them all in one batch
+    engine = zsp.create_proximity_engine()
+    if engine:
+        engine.prefetch(tissue_pairs, tissue_radius)
+        engine.prefetch(bone_pairs, bone_radius)
+
     for tissue_mesh in tissue_meshes:
         for other_tissue_mesh in tissue_meshes:
             if tissue_mesh == other_tissue_mesh:
                 continue  # Skip the same tissue mesh for attachment
+            num_pairs += 1
+            if (tissue_mesh, other_tissue_mesh) not in tissue_pairs:
+                num_pruned += 1
+                continue
             try:
                 if (
                     "tissue" in tissue_mesh.lower()
@@ -1139,37 +1359,44 @@ def zattach_all_objects_button(tissue_radius, bone_radius):
                 else:
                     radius = bone_radius
                     attachment_mode = "fixed"
-                vertices = cmds.zFindVerticesByProximity(
-                    tissue_mesh, other_tissue_mesh, r=radius
-                )
-                cmds.select(vertices, other_tissue_mesh)
-                attachments = cmds.ls(type="zAttachment")
                 # Update source mesh extraction
                 source_mesh = tissue_mesh.split("_", 1)[-1].rsplit("_", 1)[0]
                 target_mesh = other_tissue_mesh.split("_", 1)[-1].rsplit("_", 1)[
                     0
                 ]  # Update target mesh extraction
                 attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
-                existing_attachments = [
-                    att for att in attachments if attachment_name in att
-                ]
+                existing_attachments = attachment_index.find(source_mesh, target_mesh)
                 if existing_attachments:
-                    print(
-                        f"An attachment with the name '{attachment_name}' already exists."
+                    zrt.log.debug(
+                        "An attachment with the name '%s' already exists.",
+                        attachment_name,
                     )
+                    zrt.count("skipped, already present")
                     cmds.delete(existing_attachments)
+                    for existing_att in existing_attachments:
+                        attachment_index.remove(existing_att)
                     continue
-                mel_command = cmds.ziva(a=True)
-                attachments = cmds.ls(type="zAttachment")
+                vertices = zsp.find_vertices_by_proximity(
+                    tissue_mesh, other_tissue_mesh, radius, engine
+                )
+                with zsc.NodeCreationCapture() as created:
+                    mel_command = cmds.ziva(vertices, other_tissue_mesh, a=True)
+                attachments = created.nodes("zAttachment")
                 num_attachments = len(attachments)
 
                 attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
                 # attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_{num_attachments}_att"
-                cmds.rename(attachments[-1], attachment_name)
-
-                print(
-                    f"Ziva attachment created between {source_mesh} and {target_mesh} as {attachment_name} with mode: {attachment_mode}."
+                attachment_name = cmds.rename(attachments[-1], attachment_name)
+                attachment_index.add(attachment_name)
+
+                zrt.log.debug(
+                    "Ziva attachment created between %s and %s as %s with mode: %s.",
+                    source_mesh,
+                    target_mesh,
+                    attachment_name,
+                    attachment_mode,
                 )
+                zrt.count("attachments created")
 
                 # Set the attachment mode based on the radius
                 cmds.setAttr(
@@ -1178,19 +1405,21 @@ def zattach_all_objects_button(tissue_radius, bone_radius):
                 )
 
             except Exception as e:
-                print(
-                    f"Failed to create Ziva attachment between {tissue_mesh} and {other_tissue_mesh}. Error: {str(e)}"
+                zrt.log.warning(
+                    "Failed to create Ziva attachment between %s and %s. Error: %s",
+                    tissue_mesh,
+                    other_tissue_mesh,
+                    e,
                 )
+                zrt.count("attachments failed")
 
     for bone_mesh in bone_meshes:
         for tissue_mesh in tissue_meshes:
+            num_pairs += 1
+            if (bone_mesh, tissue_mesh) not in bone_pairs:
+                num_pruned += 1
+                continue
             try:
-                vertices = cmds.zFindVerticesByProximity(
-                    bone_mesh, tissue_mesh, r=bone_radius
-                )
-                cmds.select(vertices, tissue_mesh)
-                attachments = cmds.ls(type="zAttachment")
-
                 # Update source mesh extraction
                 source_mesh = (
                     bone_mesh.split("|")[-1]
@@ -1203,31 +1432,53 @@ def zattach_all_objects_button(tissue_radius, bone_radius):
                 )
                 attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
 
-                existing_attachments = [
-                    att for att in attachments if attachment_name in att
-                ]
+                existing_attachments = attachment_index.find(source_mesh, target_mesh)
                 if existing_attachments:
-                    print(
-                        f"An attachment with the name '{attachment_name}' already exists."
+                    zrt.log.debug(
+                        "An attachment with the name '%s' already exists.",
+                        attachment_name,
                     )
+                    zrt.count("skipped, already present")
                     cmds.delete(existing_attachments)
+                    for existing_att in existing_attachments:
+                        attachment_index.remove(existing_att)
                     continue
 
-                mel_command = cmds.ziva(a=True)
-                attachments = cmds.ls(type="zAttachment")
+                vertices = zsp.find_vertices_by_proximity(
+                    bone_mesh, tissue_mesh, bone_radius, engine
+                )
+                with zsc.NodeCreationCapture() as created:
+                    mel_command = cmds.ziva(vertices, tissue_mesh, a=True)
+                attachments = created.nodes("zAttachment")
                 num_attachments = len(attachments)
 
                 attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
                 # attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_{num_attachments}_att"
-                cmds.rename(attachments[-1], attachment_name)
-
-                print(
-                    f"Ziva attachment created between {source_mesh} and {target_mesh} as {attachment_name}."
+                attachment_name = cmds.rename(attachments[-1], attachment_name)
+                attachment_index.add(attachment_name)
+
+                zrt.log.debug(
+                    "Ziva attachment created between %s and %s as %s.",
+                    source_mesh,
+                    target_mesh,
+                    attachment_name,
                 )
+                zrt.count("attachments created")
             except Exception as e:
-                print(
-                    f"Failed to create Ziva attachment between {bone_mesh} and {tissue_mesh}. Error: {str(e)}"
+                zrt.log.warning(
+                    "Failed to create Ziva attachment between %s and %s. Error: %s",
+                    bone_mesh,
+                    tissue_mesh,
+                    e,
                 )
+                zrt.count("attachments failed")
+
+    zrt.log.debug(
+        "Broad-phase pruned %s of %s mesh pairs without a proximity query.",
+        num_pruned,
+        num_pairs,
+    )
+    zrt.count("mesh pairs pruned", num_pruned)
 
 
 ############################################################
@@ -1238,153 +1489,221 @@ def zattach_all_objects_button(tissue_radius, bone_radius):
 # It will not connect in both directions making it only 1 attachment per pair
 
 
-def zattach_all_objects_button_one_time(tissue_radius, bone_radius):
-    print(tissue_radius, bone_radius)
+def zattach_all_objects_one_time_job(tissue_radius, bone_radius):
+    """
+    Attach every tissue and bone pair once, one mesh pair per step.
+
+    Returns:
+        zrt.Job: The job, the first step prefetches the bone proximity queries.
+    """
+    zrt.log.debug("%s %s", tissue_radius, bone_radius)
     bone_meshes = [
         obj
-        for obj in cmds.ls(type="mesh", noIntermediate=True)
+        for obj in zsc.get_scene_index().ls("mesh", no_intermediate=True)
         if obj.lower().startswith("bones")
     ]
     tissue_meshes = [
         obj
-        for obj in cmds.ls(type="mesh", noIntermediate=True)
+        for obj in zsc.get_scene_index().ls("mesh", no_intermediate=True)
         if obj.lower().startswith("tissue") and not obj.startswith("Orig")
     ]
 
     processed_pairs = set()  # Keep track of processed pairs
 
-    for i, tissue_mesh in enumerate(tissue_meshes):
-        for j, other_tissue_mesh in enumerate(tissue_meshes):
-            if i == j:
-                continue  # Skip the same tissue mesh for attachment
-            try:
-                if (
-                    "tissue" in tissue_mesh.lower()
-                    and "tissue" in other_tissue_mesh.lower()
-                ):
-                    radius = tissue_radius
-                    if radius <= 0.1:
-                        attachment_mode = "sliding"
-                    else:
-                        attachment_mode = "fixed"
+    # Broad-phase: only pairs whose inflated bounding boxes overlap can have
+    # vertices within the radius, every other pair skips the proximity query
+    tissue_boxes = zsp.get_world_bounding_boxes(tissue_meshes)
+    bone_boxes = zsp.get_world_bounding_boxes(bone_meshes)
+    tissue_pairs = zsp.find_candidate_pairs(tissue_boxes, tissue_boxes, tissue_radius)
+    bone_pairs = zsp.find_candidate_pairs(bone_boxes, tissue_boxes, bone_radius)
+
+    # Existing attachments by (source, target), kept in sync as we go
+    attachment_index = zsc.AttachmentIndex()
+
+    # Tissue pairs are skipped once attached, only the bone pairs are batched
+    engine = zsp.create_proximity_engine()
+
+    def attach_tissues(tissue_mesh, other_tissue_mesh):
+        try:
+            if (
+                "tissue" in tissue_mesh.lower()
+                and "tissue" in other_tissue_mesh.lower()
+            ):
+                radius = tissue_radius
+                if radius <= 0.1:
+                    attachment_mode = "sliding"
                 else:
-                    radius = bone_radius
                     attachment_mode = "fixed"
+            else:
+                radius = bone_radius
+                attachment_mode = "fixed"
+
+            source_mesh = tissue_mesh.split("_", 1)[-1].rsplit("_", 1)[0]
+            target_mesh = other_tissue_mesh.split("_", 1)[-1].rsplit("_", 1)[0]
+
+            # Check if the pair has already been processed
+            pair_key = tuple(sorted([source_mesh, target_mesh]))
+            if pair_key in processed_pairs:
+                zrt.log.debug(
+                    "Attachment between %s and %s already processed. Skipping.",
+                    source_mesh,
+                    target_mesh,
+                )
+                zrt.count("skipped, already present")
+                return
 
-                source_mesh = tissue_mesh.split("_", 1)[-1].rsplit("_", 1)[0]
-                target_mesh = other_tissue_mesh.split("_", 1)[-1].rsplit("_", 1)[0]
+            attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
 
-                # Check if the pair has already been processed
-                pair_key = tuple(sorted([source_mesh, target_mesh]))
-                if pair_key in processed_pairs:
-                    print(
-                        f"Attachment between {source_mesh} and {target_mesh} already processed. Skipping."
-                    )
-                    continue
+            # Check if an attachment with the same source and target mesh names exists
+            if (source_mesh, target_mesh) in attachment_index:
+                zrt.log.debug(
+                    "An attachment already exists for %s and %s. Skipping.",
+                    source_mesh,
+                    target_mesh,
+                )
+                zrt.count("skipped, already present")
+            else:
+                # Continue if no existing attachment with the same source and target mesh names
+                vertices = zsp.find_vertices_by_proximity(
+                    tissue_mesh, other_tissue_mesh, radius, engine
+                )
+                with zsc.NodeCreationCapture() as created:
+                    mel_command = cmds.ziva(vertices, other_tissue_mesh, a=True)
+                attachments = created.nodes("zAttachment")
+                num_attachments = len(attachments)
 
+                # Update attachment name to include source and target mesh names
                 attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
+                attachment_name = cmds.rename(attachments[-1], attachment_name)
+                attachment_index.add(attachment_name)
+
+                zrt.log.debug(
+                    "Ziva attachment created between %s and %s as %s with mode: %s.",
+                    source_mesh,
+                    target_mesh,
+                    attachment_name,
+                    attachment_mode,
+                )
+                zrt.count("attachments created")
 
-                # Check if an attachment with the same source and target mesh names exists
-                existing_attachments = cmds.ls(type="zAttachment")
-                for existing_att in existing_attachments:
-                    (
-                        existing_source_mesh,
-                        existing_target_mesh,
-                    ) = get_source_and_target_mesh_names(existing_att)
-                    if (
-                        source_mesh == existing_source_mesh
-                        and target_mesh == existing_target_mesh
-                    ):
-                        print(
-                            f"An attachment already exists for {source_mesh} and {target_mesh}. Skipping."
-                        )
-                        break
-                else:
-                    # Continue if no existing attachment with the same source and target mesh names
-                    vertices = cmds.zFindVerticesByProximity(
-                        tissue_mesh, other_tissue_mesh, r=radius
-                    )
-                    cmds.select(vertices, other_tissue_mesh)
-                    mel_command = cmds.ziva(a=True)
-                    attachments = cmds.ls(type="zAttachment")
-                    num_attachments = len(attachments)
-
-                    # Update attachment name to include source and target mesh names
-                    attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
-                    cmds.rename(attachments[-1], attachment_name)
-
-                    print(
-                        f"Ziva attachment created between {source_mesh} and {target_mesh} as {attachment_name} with mode: {attachment_mode}."
-                    )
+                # Set the attachment mode based on the radius
+                cmds.setAttr(
+                    f"{attachment_name}.attachmentMode",
+                    2 if attachment_mode == "sliding" else 1,
+                )
 
-                    # Set the attachment mode based on the radius
-                    cmds.setAttr(
-                        f"{attachment_name}.attachmentMode",
-                        2 if attachment_mode == "sliding" else 1,
-                    )
+                # Mark the pair as processed
+                processed_pairs.add(pair_key)
 
-                    # Mark the pair as processed
-                    processed_pairs.add(pair_key)
+        except Exception as e:
+            zrt.log.warning(
+                "Failed to create Ziva attachment between %s and %s. Error: %s",
+                tissue_mesh,
+                other_tissue_mesh,
+                e,
+            )
+            zrt.count("attachments failed")
 
-            except Exception as e:
-                print(
-                    f"Failed to create Ziva attachment between {tissue_mesh} and {other_tissue_mesh}. Error: {str(e)}"
-                )
+    def attach_bone(bone_mesh, tissue_mesh):
+        try:
+            # Update source mesh extraction
+            source_mesh = (
+                bone_mesh.split("|")[-1]
+                .split("_", 1)[-1]
+                .replace("ShapeDeformed", "Bone")
+            )
+            # Update target mesh extraction
+            target_mesh = (
+                tissue_mesh.split("|")[-1].split("_", 1)[-1].replace("Shape", "")
+            )
+            attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
 
-    for bone_mesh in bone_meshes:
-        for tissue_mesh in tissue_meshes:
-            try:
-                vertices = cmds.zFindVerticesByProximity(
-                    bone_mesh, tissue_mesh, r=bone_radius
+            existing_attachments = attachment_index.find(source_mesh, target_mesh)
+            if existing_attachments:
+                zrt.log.debug(
+                    "An attachment with the name '%s' already exists.",
+                    attachment_name,
                 )
-                cmds.select(vertices, tissue_mesh)
-                attachments = cmds.ls(type="zAttachment")
+                zrt.count("skipped, already present")
+                cmds.delete(existing_attachments)
+                for existing_att in existing_attachments:
+                    attachment_index.remove(existing_att)
+                return
 
-                # Update source mesh extraction
-                source_mesh = (
-                    bone_mesh.split("|")[-1]
-                    .split("_", 1)[-1]
-                    .replace("ShapeDeformed", "Bone")
-                )
-                # Update target mesh extraction
-                target_mesh = (
-                    tissue_mesh.split("|")[-1].split("_", 1)[-1].replace("Shape", "")
-                )
-                attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
+            vertices = zsp.find_vertices_by_proximity(
+                bone_mesh, tissue_mesh, bone_radius, engine
+            )
+            with zsc.NodeCreationCapture() as created:
+                mel_command = cmds.ziva(vertices, tissue_mesh, a=True)
+            attachments = created.nodes("zAttachment")
+            num_attachments = len(attachments)
+
+            attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
+            # attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_{num_attachments}_att"
+            attachment_name = cmds.rename(attachments[-1], attachment_name)
+            attachment_index.add(attachment_name)
+
+            zrt.log.debug(
+                "Ziva attachment created between %s and %s as %s.",
+                source_mesh,
+                target_mesh,
+                attachment_name,
+            )
+            zrt.count("attachments created")
+        except Exception as e:
+            zrt.log.warning(
+                "Failed to create Ziva attachment between %s and %s. Error: %s",
+                bone_mesh,
+                tissue_mesh,
+                e,
+            )
+            zrt.count("attachments failed")
+
+    def steps():
+        num_pairs = 0
+        num_pruned = 0
+        if engine:
+            engine.prefetch(bone_pairs, bone_radius)
+            yield "proximity prefetch"
+
+        for i, tissue_mesh in enumerate(tissue_meshes):
+            for j, other_tissue_mesh in enumerate(tissue_meshes):
+                if i == j:
+                    continue  # Skip the same tissue mesh for attachment
+                num_pairs += 1
+                if (tissue_mesh, other_tissue_mesh) not in tissue_pairs:
+                    num_pruned += 1
+                    continue
+                attach_tissues(tissue_mesh, other_tissue_mesh)
+                yield f"{tissue_mesh} -> {other_tissue_mesh}"
 
-                existing_attachments = [
-                    att for att in attachments if attachment_name in att
-                ]
-                if existing_attachments:
-                    print(
-                        f"An attachment with the name '{attachment_name}' already exists."
-                    )
-                    cmds.delete(existing_attachments)
+        for bone_mesh in bone_meshes:
+            for tissue_mesh in tissue_meshes:
+                num_pairs += 1
+                if (bone_mesh, tissue_mesh) not in bone_pairs:
+                    num_pruned += 1
                     continue
+                attach_bone(bone_mesh, tissue_mesh)
+                yield f"{bone_mesh} -> {tissue_mesh}"
 
-                mel_command = cmds.ziva(a=True)
-                attachments = cmds.ls(type="zAttachment")
-                num_attachments = len(attachments)
+        zrt.log.debug(
+            "Broad-phase pruned %s of %s mesh pairs without a proximity query.",
+            num_pruned,
+            num_pairs,
+        )
+        zrt.count("mesh pairs pruned", num_pruned)
 
-                attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
-                # attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_{num_attachments}_att"
-                cmds.rename(attachments[-1], attachment_name)
+    total = len(tissue_pairs) + len(bone_pairs) + (1 if engine else 0)
+    return zrt.Job("zAttach All Objects", steps(), total)
 
-                print(
-                    f"Ziva attachment created between {source_mesh} and {target_mesh} as {attachment_name}."
-                )
-            except Exception as e:
-                print(
-                    f"Failed to create Ziva attachment between {bone_mesh} and {tissue_mesh}. Error: {str(e)}"
-                )
+
+def zattach_all_objects_button_one_time(tissue_radius, bone_radius):
+    zattach_all_objects_one_time_job(tissue_radius, bone_radius).run()
 
 
 def get_source_and_target_mesh_names(attachment_name):
     # Extract source and target mesh names from the attachment name
-    attachment_parts = attachment_name.split("_")
-    source_mesh = "_".join(attachment_parts[1:-3])
-    target_mesh = "_".join(attachment_parts[-3:-1])
-    return source_mesh, target_mesh
+    return zsc.parse_attachment_name(attachment_name)
 
 
 ############################################################
@@ -1398,53 +1717,27 @@ def find_shape_node(selected_object):
     return valid_shapes
 
 
-def find_zRivetToBone_connections(shape_node):
-    zRivetToBone_nodes = []
-    connections = cmds.listConnections(shape_node, source=True, destination=False) or []
-    for connection in connections:
-        if cmds.nodeType(connection) == "zRivetToBone":
-            zRivetToBone_nodes.append(connection)
-    return zRivetToBone_nodes
+def find_zRivetToBone_connections(shape_node, graph=None):
+    graph = zsc.RivetGraph() if graph is None else graph
+    return graph.rivets_for([shape_node])
 
 
-def get_related_zRivetToBone_nodes(zRivetToBone_nodes):
-    related_nodes = zRivetToBone_nodes[:]
-    while True:
-        new_related_nodes = []
-        for node in related_nodes:
-            connections = (
-                cmds.listConnections(node, source=True, destination=False) or []
-            )
-            for connection in connections:
-                if (
-                    cmds.nodeType(connection) == "zRivetToBone"
-                    and connection not in related_nodes
-                ):
-                    new_related_nodes.append(connection)
-        if not new_related_nodes:
-            break
-        related_nodes.extend(new_related_nodes)
-    return related_nodes
+def get_related_zRivetToBone_nodes(zRivetToBone_nodes, graph=None):
+    graph = zsc.RivetGraph() if graph is None else graph
+    return graph.walk(zRivetToBone_nodes)
 
 
-def find_zRivetsandDelete():
-    # Get selected object
-    selected_objects = cmds.ls(selection=True)
-    if selected_objects:
-        selected_object = selected_objects[0]
-        shape_nodes = find_shape_node(selected_object)
-        for shape_node in shape_nodes:
-            zRivetToBone_nodes = find_zRivetToBone_connections(shape_node)
-            related_zRivetToBone_nodes = get_related_zRivetToBone_nodes(
-                zRivetToBone_nodes
-            )
-            if related_zRivetToBone_nodes:
-                cmds.select(related_zRivetToBone_nodes, add=True)
-                break
+def find_rivet_targets(selected_objects, graph=None):
+    # The selected rivets and the rivets of every selected curve, bone or
+    # locator, from one graph of the scene rivets
+    if not selected_objects:
+        return []
+    graph = zsc.RivetGraph() if graph is None else graph
+    return graph.rivets_for(selected_objects)
+
 
-    # Execute the given Python command
-    python_command = "from zBuilder.utils import remove_zRivetToBone_nodes; from maya import cmds; remove_zRivetToBone_nodes(cmds.ls(sl=True))"
-    cmds.evalDeferred(python_command)
+def find_zRivetsandDelete(nodes=None):
+    return delete_component_action("zRivetToBone", nodes)
 
 
 ############################################################
@@ -1453,36 +1746,30 @@ def find_zRivetsandDelete():
 
 
 def find_shape_nodes(selected_objects):
-    shape_nodes = []
-    for obj in selected_objects:
-        shapes = cmds.listRelatives(obj, shapes=True, fullPath=True) or []
-        valid_shapes = [shape for shape in shapes if not shape.endswith("Orig")]
-        shape_nodes.extend(valid_shapes)
-    return shape_nodes
+    if not selected_objects:
+        return []
+    shapes = cmds.listRelatives(selected_objects, shapes=True, fullPath=True) or []
+    return [shape for shape in shapes if not shape.endswith("Orig")]
+
+
+def find_zLineOfAction_nodes(shape_nodes):
+    # The zLineOfAction nodes the curves drive, in one query
+    if not shape_nodes:
+        return []
+    connections = cmds.listConnections(
+        shape_nodes, source=False, destination=True, type="zLineOfAction"
+    )
+    return list(dict.fromkeys(connections or []))
 
 
 def delete_zLineOfAction_connections(shape_nodes):
-    zLineOfAction_nodes = []
-    for shape_node in shape_nodes:
-        connections = (
-            cmds.listConnections(shape_node, source=False, destination=True) or []
-        )
-        for connection in connections:
-            if cmds.nodeType(connection) == "zLineOfAction":
-                zLineOfAction_nodes.append(connection)
+    zLineOfAction_nodes = find_zLineOfAction_nodes(shape_nodes)
     if zLineOfAction_nodes:
-        cmds.select(zLineOfAction_nodes, replace=True)
-        cmds.delete()
+        cmds.delete(zLineOfAction_nodes)
 
 
-def find_zLineOfActionandDelete():
-    # Get selected objects
-    selected_objects = cmds.ls(selection=True)
-    if selected_objects:
-        shape_nodes = find_shape_nodes(selected_objects)
-        delete_zLineOfAction_connections(shape_nodes)
-    else:
-        print("Please select at least one object.")
+def find_zLineOfActionandDelete(nodes=None):
+    return delete_component_action("zLineOfAction", nodes)
 
 
 ############################################################
@@ -1490,60 +1777,172 @@ def find_zLineOfActionandDelete():
 ############################################################
 
 
-def deleteall_zivaNodes():
-    selected = find_selected_mesh()
-    if selected:
-        for obj in selected:
-            cmds.select(obj)
-            cmds.ziva(rm=True)
-    else:
-        python_command = "import zBuilder.utils as utility; utility.remove_all_solvers(confirmation=False)"
-        cmds.evalDeferred(python_command)
+def deleteall_zivaNodes(nodes=None, dry_run=False):
+    """
+    Remove Ziva from the meshes under `nodes`, the selection by default.
+
+    With nothing selected every solver of the scene is removed, nodes given
+    as an argument never fall back to that.
+    """
+    return delete_component_action("zAll", nodes, dry_run)
 
 
 def ____delete_ziva_component____():
     return
 
 
+def delete_ziva_nodes(ziva_nodes):
+    """
+    Delete Ziva nodes with ZivaDeleteSelection, keeping the selection.
+
+    ZivaDeleteSelection only works on the selection, the nodes are selected
+    for it and the previous selection is restored after.
+    """
+    selection = cmds.ls(selection=True, long=True)
+    cmds.select(ziva_nodes, replace=True)
+    try:
+        mel.eval("ZivaDeleteSelection")
+    finally:
+        # Deleted nodes drop out of the restored selection
+        selection = cmds.ls(selection, long=True) if selection else []
+        if selection:
+            cmds.select(selection, replace=True)
+        else:
+            cmds.select(clear=True)
+
+
 ############################################################
 #################   DELETE COMPONENTS  #####################
 ############################################################
 
+# Node lists of a delete plan, in the order they are deleted
+DELETE_PLAN_KEYS = [
+    ("ziva_meshes", "Ziva removed from"),
+    ("ziva_nodes", "Ziva nodes deleted"),
+    ("nodes", "nodes deleted"),
+    ("rivets", "rivets removed"),
+]
+
+def _extra_materials(meshes):
+    # Every zMaterial of the meshes but their first one
+    materials = []
+    for mesh in meshes:
+        mesh_materials = zsc.get_scene_index().zquery(mesh, type="zMaterial") or []
+        if len(mesh_materials) > 1:
+            materials.extend(mesh_materials[1:])
+        else:
+            zrt.log.debug(
+                "Only one zMaterial component found for %s. No deletion needed.",
+                mesh,
+            )
+    return materials
 
-def delete_component_action(value):
-    # value = self.component_dropdown.currentText()
-    print(f"Deleting {value}")
-    if value == "zRivetToBone":
-        find_zRivetsandDelete()
-    elif value == "zLineOfAction":
-        find_zLineOfActionandDelete()
-    elif value == "zAll":
-        deleteall_zivaNodes()
-    elif value == "zMaterial":
-        selected_objects = find_selected_mesh()
-        for obj in selected_objects:
-            # Query zMaterial components
-            z_components = cmds.zQuery(obj, type="zMaterial")
-            # Check if there are more than 1 zMaterial components
-            if len(z_components) > 1:
-                # Delete all but the first material (keeping array[0])
-                materials_to_delete = z_components[1:]
-                cmds.select(materials_to_delete, r=True)
-                mel.eval("ZivaDeleteSelection")
-                print(f"Deleted additional zMaterial components for {obj}.")
-            else:
-                print(
-                    f"Only one zMaterial component found for {obj}. No deletion needed."
-                )
+
+def plan_delete(value, nodes=None):
+    """
+    Collect what delete_component_action() removes, without deleting anything.
+
+    The targets of the whole selection are gathered first, with one query
+    for all the meshes where Maya allows it, and each is listed once so
+    apply_delete_plan() deletes them in a few calls.
+
+    Args:
+        value (str): Entry of the Delete Component dropdown, a Ziva node
+            type or "zAll".
+        nodes (list): Meshes or groups, the selection by default.
+
+    Returns:
+        dict: "component", one list per DELETE_PLAN_KEYS key, and
+        "all_solvers" when every solver of the scene is removed.
+    """
+    plan = {key: [] for key, _ in DELETE_PLAN_KEYS}
+    plan["component"] = value
+    plan["all_solvers"] = False
+
+    if value in ("zRivetToBone", "zLineOfAction"):
+        selected_objects = nodes_or_selection(nodes, long=False)
+        if value == "zRivetToBone":
+            plan["rivets"] = find_rivet_targets(selected_objects)
+        elif selected_objects:
+            plan["nodes"] = find_zLineOfAction_nodes(find_shape_nodes(selected_objects))
+        else:
+            zrt.log.warning("Please select at least one object.")
     else:
-        selected_objects = find_selected_mesh()
-        for obj in selected_objects:
-            z_components = cmds.zQuery(obj, type=value)
-            cmds.select(z_components)
-            mel.eval("ZivaDeleteSelection")
-            print(f"Deleted zMaterials for {obj}.")
+        meshes = find_selected_mesh(nodes)
+        if value == "zAll":
+            plan["ziva_meshes"] = meshes
+            plan["all_solvers"] = not meshes and nodes is None
+        elif value == "zMaterial":
+            plan["ziva_nodes"] = _extra_materials(meshes)
+        elif meshes:
+            try:
+                plan["ziva_nodes"] = cmds.zQuery(meshes, type=value) or []
+            except RuntimeError as e:
+                zrt.log.debug("No %s on the meshes: %s", value, e)
+
+    for key, _ in DELETE_PLAN_KEYS:
+        plan[key] = list(dict.fromkeys(plan[key]))
+    return plan
+
+
+def format_delete_plan(plan):
+    lines = [f"Delete {plan['component']}:"]
+    if plan["all_solvers"]:
+        lines.append("  every solver of the scene")
+    for key, label in DELETE_PLAN_KEYS:
+        if plan[key]:
+            lines.append(f"  {label} ({len(plan[key])}):")
+            lines.extend(f"    {node}" for node in plan[key])
+    if len(lines) == 1:
+        lines.append("  nothing")
+    return "\n".join(lines)
+
+
+@zrt.bulk_operation("Delete Component")
+def apply_delete_plan(plan):
+    """
+    Delete everything in a plan_delete() plan in one undo chunk.
+
+    One ziva -rm for all the meshes, one ZivaDeleteSelection for the Ziva
+    nodes and one delete for the other nodes. zBuilder removes the rivets
+    and the solvers in the same chunk, so one undo restores everything.
+    """
+    if plan["ziva_meshes"]:
+        cmds.ziva(plan["ziva_meshes"], rm=True)
+        zrt.count("meshes cleaned", len(plan["ziva_meshes"]))
+    if plan["ziva_nodes"]:
+        delete_ziva_nodes(plan["ziva_nodes"])
+        zrt.count("Ziva nodes deleted", len(plan["ziva_nodes"]))
+    if plan["nodes"]:
+        cmds.delete(plan["nodes"])
+        zrt.count("nodes deleted", len(plan["nodes"]))
+    if plan["rivets"]:
+        utility.remove_zRivetToBone_nodes(plan["rivets"])
+        zrt.count("rivets removed", len(plan["rivets"]))
+    if plan["all_solvers"]:
+        utility.remove_all_solvers(confirmation=False)
+        zrt.count("solvers removed")
+    return plan
+
+
+def delete_component_action(value, nodes=None, dry_run=False):
+    """
+    Delete the `value` components of the selected meshes, see plan_delete().
+
+    Args:
+        value (str): Entry of the Delete Component dropdown.
+        nodes (list): Meshes or groups, the selection by default.
+        dry_run (bool): Only log what would be deleted.
 
-    print("Action after Delete zivaComponents button click")
+    Returns:
+        dict: The plan that was, or with `dry_run` would be, deleted.
+    """
+    zrt.log.debug("Deleting %s", value)
+    plan = plan_delete(value, nodes)
+    if dry_run:
+        zrt.log.info("%s", format_delete_plan(plan))
+        return plan
+    return apply_delete_plan(plan)
 
 
 def ____modify_ziva_tets____():
@@ -1555,212 +1954,328 @@ def ____modify_ziva_tets____():
 ############################################################
 
 
-def modify_ztet_size(percentage):
-    selection = cmds.ls(selection=True)
+@zrt.bulk_operation("Modify zTet Size")
+def modify_ztet_size(percentage, nodes=None):
+    selection = nodes_or_selection(nodes, long=False)
 
     if not selection:
-        print("Nothing selected. Please select an object or a group.")
+        zrt.log.warning("Nothing selected. Please select an object or a group.")
         return
 
-    for selected_object in selection:
-        ztet_nodes = []
+    # Each zTet once, even when a group and its meshes are both selected
+    sizes = ztet.read_tet_sizes(ztet.find_ztets(selection))
+    ztet.write_tet_sizes(
+        {node: size / (1 + percentage / 100) for node, size in sizes.items()}
+    )
+    zrt.log.debug("Adjusted %d zTet sizes by %s%%.", len(sizes), percentage)
 
-        if cmds.objectType(selected_object) == "transform":
-            ztet_nodes.extend(cmds.ls(cmds.listHistory(selected_object), type="zTet"))
 
-            descendants = (
-                cmds.listRelatives(selected_object, allDescendents=True, fullPath=True)
-                or []
-            )
-            for descendant in descendants:
-                ztet_nodes.extend(cmds.ls(cmds.listHistory(descendant), type="zTet"))
+############################################################
+#################   CHANGE zTET SIZE  ######################
+############################################################
 
-        elif cmds.objectType(selected_object) == "zTet":
-            ztet_nodes.append(selected_object)
 
-        for ztet in ztet_nodes:
-            if "Orig" in ztet:
-                continue  # Skip Orig mesh
+@zrt.bulk_operation("Change zTet Size")
+def change_ztet_size(percentage, nodes=None):
+    selection = nodes_or_selection(nodes, long=False)
 
-            try:
-                current_size = cmds.getAttr(f"{ztet}.tetSize")
-                new_size = current_size / (1 + percentage / 100)
-                cmds.setAttr(f"{ztet}.tetSize", new_size)
+    if not selection:
+        zrt.log.warning("Nothing selected. Please select an object or a group.")
+        return
 
-                print(f"Adjusted zTet size for '{ztet}' by {percentage}%.")
-            except ValueError as e:
-                print(f"Error modifying zTet size for '{ztet}': {e}")
+    sizes = ztet.read_tet_sizes(ztet.find_ztets(selection))
+    if percentage > 0:
+        scale = 1 + percentage / 100
+    else:
+        scale = 1 / (1 - percentage / 100)
+    ztet.write_tet_sizes({node: size * scale for node, size in sizes.items()})
+    zrt.log.debug("Adjusted %d zTet sizes by %s%%.", len(sizes), percentage)
+
+
+# Example usage:
+# Select objects or groups containing zTet nodes and run the function
+# change_ztet_size(10)  # Adjust the percentage as needed
 
 
 ############################################################
-#################   CHANGE zTET SIZE  ######################
+#################   CREATE SET   ###########################
 ############################################################
 
 
-def list_meshes_in_group(group):
+def apply_set(set_name, members, sync=False):
+    """
+    Create `set_name` with `members`, or add the missing members to it.
+
+    One sets call creates or extends the set whatever the number of members.
+    With `sync` the members no longer in `members` are removed as well, so
+    the set matches the scene instead of only growing.
+
+    Returns:
+        tuple: Number of members added and removed.
+    """
+    members = list(dict.fromkeys(members or []))
+    if not cmds.objExists(set_name):
+        if not members:
+            zrt.log.debug("No elements found for '%s'.", set_name)
+            return 0, 0
+        cmds.sets(members, name=set_name)
+        zrt.count("set members added", len(members))
+        return len(members), 0
+
+    # Compare full paths, the set reports the shortest unique names
+    current = cmds.sets(set_name, query=True) or []
+    current = cmds.ls(current, long=True) if current else []
+    wanted = cmds.ls(members, long=True) if members else []
+    current_members = set(current)
+    wanted_members = set(wanted)
+
+    to_add = [member for member in wanted if member not in current_members]
+    if to_add:
+        cmds.sets(to_add, add=set_name)
+        zrt.count("set members added", len(to_add))
+    to_remove = []
+    if sync:
+        to_remove = [member for member in current if member not in wanted_members]
+        if to_remove:
+            cmds.sets(to_remove, remove=set_name)
+            zrt.count("set members removed", len(to_remove))
+    return len(to_add), len(to_remove)
+
+
+def create_set(elements, set_name, sync=False):
+    apply_set(set_name, elements, sync)
+
+
+def get_ziva_mesh_transforms(ziva_nodes):
+    """
+    Mesh transforms of zTissue or zBone nodes, in two bulk queries.
+
+    Returns:
+        list: Transform names, each once.
+    """
+    if not ziva_nodes:
+        return []
+    z_geos = cmds.listConnections(ziva_nodes, type="zGeo") or []
+    if not z_geos:
+        return []
     meshes = (
-        cmds.listRelatives(group, allDescendents=True, type="mesh", fullPath=True) or []
+        cmds.listConnections(list(dict.fromkeys(z_geos)), sh=True, type="transform")
+        or []
     )
-    return meshes
+    return list(dict.fromkeys(meshes))
 
 
-def find_ztet_nodes(mesh):
-    ztet_nodes = cmds.zQuery(mesh, type="zTet") or []
-    return ztet_nodes
+def ziva_set_members(type_):
+    # zQuery lists the nodes of the whole scene when nothing is selected
+    return zsc.get_scene_index().zquery(type=type_) or []
 
 
-def change_ztet_size(percentage):
-    selection = cmds.ls(selection=True)
+def mesh_set_members(type_):
+    return get_ziva_mesh_transforms(ziva_set_members(type_))
 
-    if not selection:
-        print("Nothing selected. Please select an object or a group.")
-        return
 
-    for selected_object in selection:
-        if cmds.objectType(selected_object) == "transform":
-            meshes = list_meshes_in_group(selected_object)
-        elif cmds.objectType(selected_object) == "mesh":
-            meshes = [selected_object]
-        else:
-            print(
-                f"Skipping selection: {selected_object}. It is neither a group nor a mesh."
-            )
-            continue
+def curve_set_members(type_):
+    all_curves_rivets = zsc.get_scene_index().ls(type_)
+    return [x for x in all_curves_rivets if not ("RefShape" in x or "ShapeOrig" in x)]
 
-        for mesh in meshes:
-            ztet_nodes = find_ztet_nodes(mesh)
 
-            for ztet in ztet_nodes:
-                if "Orig" in ztet:
-                    continue  # Skip Orig mesh
+def loa_set_members(type_):
+    return zsc.get_scene_index().zquery(loa=True) or []
 
-                try:
-                    current_size = cmds.getAttr(f"{ztet}.tetSize")
-                    if percentage > 0:
-                        new_size = current_size * (1 + percentage / 100)
-                    else:
-                        new_size = current_size / (1 - percentage / 100)
-                    cmds.setAttr(f"{ztet}.tetSize", new_size)
 
-                    print(f"Adjusted zTet size for '{ztet}' by {percentage}%.")
-                except ValueError as e:
-                    print(f"Error modifying zTet size for '{ztet}': {e}")
+# "Create Sets" entries: node type, set name and member collector
+SET_SOURCES = {
+    0: ("zBone", "zBone_SET", ziva_set_members),
+    1: ("zTissue", "zTissue_SET", ziva_set_members),
+    2: ("zFiber", "zFiber_SET", ziva_set_members),
+    3: ("zAttachment", "zAttachment_SET", ziva_set_members),
+    4: ("zRivetToBone", "zRivetToBone_SET", ziva_set_members),
+    5: ("zCloth", "zCloth_SET", ziva_set_members),
+    6: ("zLineOfAction", "zlineOfAction_SET", loa_set_members),
+    7: ("zBone", "zBone_GEO", mesh_set_members),
+    8: ("zTissue", "zTissue_GEO", mesh_set_members),
+    9: ("nurbsCurve", "nurbsCurve_loa_SET", curve_set_members),  # LOA Curves
+}
 
 
-# Example usage:
-# Select objects or groups containing zTet nodes and run the function
-# change_ztet_size(10)  # Adjust the percentage as needed
+def sets_create_mesh(type_, sync=False):
+    apply_set(f"{type_}_GEO", mesh_set_members(type_), sync)
 
 
-############################################################
-#################   CREATE SET   ###########################
-############################################################
+def sets_create(type_):
+    all_elements = ziva_set_members(type_)
+    zrt.log.debug("all_elements = %s", all_elements)
+    create_set(all_elements, f"{type_}_GEO")
 
 
-def create_set(elements, set_name):
-    cmds.select(cl=True)
-    if elements:
-        for element in elements:
-            if not cmds.objExists(set_name):
-                cmds.select(element)
-                cmds.sets(n=set_name)
-            else:
-                cmds.sets(element, add=set_name)
-    else:
-        print(f"No elements found for '{set_name}'.")
+def sets_create_curves(type_, sync=False):
+    apply_set(f"{type_}_loa_SET", curve_set_members(type_), sync)
 
 
-def sets_create_mesh(type_):
-    set_geo = f"{type_}_GEO"
-    if not cmds.objExists(set_geo):
-        all_elements = cmds.zQuery(type=type_)
-        elements_to_select = []
+def sets_create_comp(type_, sync=False):
+    apply_set(f"{type_}_SET", ziva_set_members(type_), sync)
+    zrt.log.debug("component = %s_SET", type_)
 
-        for element in all_elements:
-            z_geo = cmds.listConnections(element, type="zGeo")
-            if z_geo:
-                z_msh = cmds.listConnections(z_geo, sh=True, type="transform")
-                if z_msh:
-                    elements_to_select.append(z_msh[0])
 
-        if elements_to_select:
-            cmds.select(elements_to_select)
-            cmds.sets(n=set_geo)
-    else:
-        all_elements = cmds.zQuery(type=type_)
-        elements_to_add = []
+def sets_create_zloa(sync=False):
+    apply_set("zlineOfAction_SET", loa_set_members("zLineOfAction"), sync)
 
-        for element in all_elements:
-            z_geo = cmds.listConnections(element, type="zGeo")
-            if z_geo:
-                z_msh = cmds.listConnections(z_geo, sh=True, type="transform")
-                if z_msh:
-                    elements_to_add.append(z_msh[0])
 
-        if elements_to_add:
-            cmds.select(elements_to_add)
-            cmds.sets(set_geo, add=True)
+@zrt.bulk_operation("Create Sets")
+def sets_create_by_index(index, sync=False):
+    """
+    Create or extend the set of a "Create Sets" entry, see SET_SOURCES.
 
+    Args:
+        index (int): Entry of the "Create Sets" dropdown.
+        sync (bool): Also remove the members that are gone from the scene.
+    """
+    source = SET_SOURCES.get(index)
+    if source is None:
+        zrt.log.warning("No set is mapped to index %s.", index)
+        return
+    type_name, set_name, collect = source
+    zrt.log.debug("type name = %s", type_name)
+    cmds.select(cl=True)
+    added, removed = apply_set(set_name, collect(type_name), sync)
+    zrt.log.debug("%s: %d members added, %d removed.", set_name, added, removed)
 
-def sets_create(type_):
-    all_elements = cmds.zQuery(type=type_)
-    print(f"all_elements = {all_elements}")
-    create_set(all_elements, f"{type_}_GEO")
 
+############################################################
+#################   LIVE SETS   ############################
+############################################################
 
-def sets_create_curves(type_):
-    all_curves_rivets = cmds.ls(type=type_)
-    all_curve_shapes = [
-        x for x in all_curves_rivets if not ("RefShape" in x or "ShapeOrig" in x)
-    ]
-    create_set(all_curve_shapes, f"{type_}_loa_SET")
+# SET_SOURCES entries kept in step with the scene in live mode
+LIVE_SET_INDICES = [0, 1, 3, 6, 7, 8]
 
 
-def sets_create_comp(type_):
-    all_elements = cmds.zQuery(type=type_)
-    print(f"all_elements = {all_elements}")
-    create_set(all_elements, f"{type_}_SET")
-    print(f"component = {type_}_SET")
+class LiveSets(object):
+    """
+    Keep the Ziva sets in step with the scene while nodes come and go.
 
+    Listens to the ComponentCatalog node added / removed callbacks and only
+    records the names, the sets are edited once Maya is idle so a command
+    creating hundreds of nodes updates them in one go. Deleted nodes leave
+    their sets by themselves and renamed ones stay in them, so the
+    component sets only get the new nodes added. A mesh set is synced again
+    when one of its Ziva nodes is removed, as the mesh itself stays.
 
-def sets_create_zloa():
-    all_elements = cmds.zQuery(loa=True)
-    create_set(all_elements, "zlineOfAction_SET")
+    The set edits are not undoable, undoing a node creation or deletion
+    fires the callbacks again instead.
 
+    Args:
+        indices (list): SET_SOURCES entries to keep, LIVE_SET_INDICES by default.
+        catalog (ComponentCatalog): Defaults to the shared catalog.
+    """
 
-def sets_create_by_index(index):
-    type_mappings = {
-        0: "zBone",
-        1: "zTissue",
-        2: "zFiber",
-        3: "zAttachment",
-        4: "zRivetToBone",
-        5: "zCloth",
-        6: "zLineOfAction",
-        7: "zBone",
-        8: "zTissue",
-        9: "nurbsCurve",  # LOA Curves handled separately
-    }
-    type_name = type_mappings.get(index)
-    print(f"type name = {type_name}")
-    cmds.select(cl=True)
-    if type_name:
-        print(f"type_name = {type_name}")
-        if index == 0 or index == 1 or index == 2 or index == 3:
-            sets_create_comp(type_name)
-        if index == 4:
-            sets_create_loa(type_name)
-        elif index == 6:
-            sets_create_zloa()
-        elif index == 7 or index == 8:
-            sets_create_mesh(type_name)
-            # sets_create(type_name)
-        elif index == 9:
-            sets_create_curves(type_name)
-        print("checked all")
-    else:
-        print("outer")
-        sets_create_comp(type_name)
+    def __init__(self, indices=None, catalog=None):
+        self.sources = [SET_SOURCES[index] for index in indices or LIVE_SET_INDICES]
+        self.catalog = catalog
+        self.node_types = {node_type for node_type, _, _ in self.sources}
+        self._added = {}
+        self._removed = set()
+        self._full_sync = False
+        self._scheduled = False
+
+    @property
+    def active(self):
+        return self.catalog is not None
+
+    def start(self):
+        if self.active:
+            return
+        self.catalog = zsc.get_component_catalog()
+        self.catalog.add_listener(self._on_catalog_changed)
+        self._full_sync = True
+        self._schedule()
+
+    def stop(self):
+        if self.catalog is not None:
+            self.catalog.remove_listener(self._on_catalog_changed)
+            zsc.release_component_catalog()
+        self.catalog = None
+        self._added.clear()
+        self._removed.clear()
+
+    def _on_catalog_changed(self, event, node_type, row):
+        if event == "reset":
+            self._full_sync = True
+        elif node_type not in self.node_types:
+            return
+        elif event == "inserted":
+            name = self.catalog.names(node_type)[row]
+            self._added.setdefault(node_type, {})[name] = None
+        elif event == "about_to_remove":
+            name = self.catalog.names(node_type)[row]
+            added = self._added.get(node_type, {})
+            if name in added:
+                # Created and deleted before the flush, nothing to update
+                del added[name]
+            else:
+                self._removed.add(node_type)
+        else:
+            return
+        self._schedule()
+
+    def _schedule(self):
+        # Every change until Maya is idle is handled by one flush
+        if not self._scheduled:
+            self._scheduled = True
+            cmds.evalDeferred(self.flush, lowestPriority=True)
+
+    def flush(self):
+        """
+        Apply the changes recorded since the last flush.
+        """
+        self._scheduled = False
+        if not self.active:
+            return
+        added, self._added = self._added, {}
+        removed, self._removed = self._removed, set()
+        full_sync, self._full_sync = self._full_sync, False
+        if not (added or removed or full_sync):
+            return
+        with zrt.bulk_operation(
+            "Live Sets", batch=True, suspend_refresh=False, quiet=True
+        ):
+            for node_type, set_name, collect in self.sources:
+                if full_sync or (collect is mesh_set_members and node_type in removed):
+                    apply_set(set_name, self.members(node_type, collect), sync=True)
+                elif node_type in added:
+                    # Nodes deleted again before the flush are left out
+                    names = cmds.ls(list(added[node_type])) or []
+                    if collect is mesh_set_members:
+                        names = get_ziva_mesh_transforms(names)
+                    apply_set(set_name, names)
+
+    def members(self, node_type, collect):
+        # The catalog already lists the scene, no query depends on the selection
+        names = self.catalog.names(node_type)
+        if collect is mesh_set_members:
+            return get_ziva_mesh_transforms(names)
+        return list(names)
+
+
+_live_sets = None
+
+
+def enable_live_sets():
+    """
+    Keep the Ziva sets in step with the scene, see LiveSets.
+    """
+    global _live_sets
+    if _live_sets is None:
+        _live_sets = LiveSets()
+    _live_sets.start()
+
+
+def disable_live_sets():
+    if _live_sets is not None:
+        _live_sets.stop()
+
+
+def is_live_sets_enabled():
+    return _live_sets is not None and _live_sets.active
 
 
 ############################################################
@@ -1769,32 +2284,40 @@ def sets_create_by_index(index):
 
 
 # create zAttachment parent child concept
-def create_zattachments_for_selected(tissue_radius, bone_radius, radio_value):
-    print(radio_value)
-    selected_objects = cmds.ls(selection=True, long=True)
+@zrt.bulk_operation("zAttach Parent->Child")
+def create_zattachments_for_selected(
+    tissue_radius, bone_radius, radio_value, nodes=None
+):
+    zrt.log.debug("%s", radio_value)
+    selected_objects = nodes_or_selection(nodes)
     bone_meshes = [
         obj
-        for obj in cmds.ls(type="mesh", noIntermediate=True)
+        for obj in zsc.get_scene_index().ls("mesh", no_intermediate=True)
         if obj.lower().startswith("bones")
     ]
     tissue_meshes = selected_objects
 
     if not selected_objects or len(selected_objects) % 2 != 0:
-        print(
+        zrt.log.warning(
             "Invalid selection. Please select an even number of objects for creating attachments."
         )
         return
 
+    engine = zsp.create_proximity_engine()
+    attachment_index = zsc.AttachmentIndex()
+
     try:
         attachments_created = []
         objects = []
 
         # Separate the selected objects into tissues and bones
         for obj in selected_objects:
-            if cmds.zQuery(obj, type="zTissue") or cmds.zQuery(obj, type="zBone"):
+            scene = zsc.get_scene_index()
+            if scene.zquery(obj, type="zTissue") or scene.zquery(obj, type="zBone"):
                 objects.append(obj)
             else:
-                print(f"Invalid object type: {obj}")
+                zrt.log.debug("Invalid object type: %s", obj)
+                zrt.count("objects skipped")
 
         for i in range(0, len(objects), 2):
             parent_obj = objects[i]
@@ -1813,17 +2336,14 @@ def create_zattachments_for_selected(tissue_radius, bone_radius, radio_value):
                     child_mesh,
                     tissue_radius,
                     radio_value,
+                    engine,
+                    attachment_index,
                 )
             )
 
         for bone_mesh in bone_meshes:
             for tissue_mesh in tissue_meshes:
                 try:
-                    vertices = cmds.zFindVerticesByProximity(
-                        bone_mesh, tissue_mesh, r=bone_radius
-                    )
-                    cmds.select(vertices, tissue_mesh)
-                    attachments = cmds.ls(type="zAttachment")
                     # Update source mesh extraction
                     source_mesh = (
                         bone_mesh.split("|")[-1]
@@ -1837,50 +2357,75 @@ def create_zattachments_for_selected(tissue_radius, bone_radius, radio_value):
                         .replace("Shape", "")
                     )
                     attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
-                    existing_attachments = [
-                        att for att in attachments if attachment_name in att
-                    ]
+                    existing_attachments = attachment_index.find(source_mesh, target_mesh)
                     if existing_attachments:
-                        print(
-                            f"An attachment with the name '{attachment_name}' already exists."
+                        zrt.log.debug(
+                            "An attachment with the name '%s' already exists.",
+                            attachment_name,
                         )
+                        zrt.count("skipped, already present")
                         cmds.delete(existing_attachments)
+                        for existing_att in existing_attachments:
+                            attachment_index.remove(existing_att)
                         continue
-                    mel_command = cmds.ziva(a=True)
-                    attachments = cmds.ls(type="zAttachment")
+                    vertices = zsp.find_vertices_by_proximity(
+                        bone_mesh, tissue_mesh, bone_radius, engine
+                    )
+                    with zsc.NodeCreationCapture() as created:
+                        mel_command = cmds.ziva(vertices, tissue_mesh, a=True)
+                    attachments = created.nodes("zAttachment")
                     num_attachments = len(attachments)
                     attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_att"
                     # attachment_name = f"ZA_{source_mesh}_to_{target_mesh}_{num_attachments}_att"
-                    cmds.rename(attachments[-1], attachment_name)
-                    print(
-                        f"Ziva attachment created between {source_mesh} and {target_mesh} as {attachment_name}."
+                    attachment_name = cmds.rename(attachments[-1], attachment_name)
+                    attachment_index.add(attachment_name)
+                    zrt.log.debug(
+                        "Ziva attachment created between %s and %s as %s.",
+                        source_mesh,
+                        target_mesh,
+                        attachment_name,
                     )
+                    zrt.count("attachments created")
                 except Exception as e:
-                    print(
-                        f"Failed to create Ziva attachment between {bone_mesh} and {tissue_mesh}. Error: {str(e)}"
+                    zrt.log.warning(
+                        "Failed to create Ziva attachment between %s and %s. Error: %s",
+                        bone_mesh,
+                        tissue_mesh,
+                        e,
                     )
+                    zrt.count("attachments failed")
 
         return attachments_created
 
     except Exception as e:
-        print(f"Failed to create Ziva attachments. Error: {str(e)}")
+        zrt.log.warning("Failed to create Ziva attachments. Error: %s", e)
+        zrt.count("attachments failed")
 
 
 def create_zattach_tissues(
-    parent_obj, child_obj, parent_mesh, child_mesh, tissue_radius, radio_value
+    parent_obj,
+    child_obj,
+    parent_mesh,
+    child_mesh,
+    tissue_radius,
+    radio_value,
+    engine=None,
+    attachment_index=None,
 ):
     # Common function to attach parent and child objects
     attachments_created = []
 
     # Perform zFindVerticesByProximity to get vertices within a radius
     radius = tissue_radius  # Set your desired radius value
-    vertices = cmds.zFindVerticesByProximity(parent_obj, child_obj, r=radius)
-    cmds.select(vertices, child_obj)
-    mel_command = cmds.ziva(a=True)
+    vertices = zsp.find_vertices_by_proximity(parent_obj, child_obj, radius, engine)
+    mel_command = cmds.ziva(vertices, child_obj, a=True)
     cmds.setAttr(mel_command[0] + ".attachmentMode", radio_value)
 
     # Find existing attachments with the same name convention
-    existing_attachments = cmds.ls(f"ZA_{parent_mesh}_to_{child_mesh}_*_att")
+    if attachment_index is not None:
+        existing_attachments = attachment_index.find(parent_mesh, child_mesh)
+    else:
+        existing_attachments = cmds.ls(f"ZA_{parent_mesh}_to_{child_mesh}_*_att")
     num_attachments = len(existing_attachments) + 1
 
     # Create a zAttachment name with a numeric suffix
@@ -1892,11 +2437,17 @@ def create_zattach_tissues(
         attachment_name = f"ZA_{parent_mesh}_to_{child_mesh}_{num_attachments}_att"
 
     # Rename the last created zAttachment
-    cmds.rename(mel_command[-1], attachment_name)
-
-    print(
-        f"Ziva attachment created between {parent_mesh} and {child_mesh} as {attachment_name}."
+    attachment_name = cmds.rename(mel_command[-1], attachment_name)
+    if attachment_index is not None:
+        attachment_index.add(attachment_name)
+
+    zrt.log.debug(
+        "Ziva attachment created between %s and %s as %s.",
+        parent_mesh,
+        child_mesh,
+        attachment_name,
     )
+    zrt.count("attachments created")
     attachments_created.append(attachment_name)
 
     return attachments_created
@@ -1933,7 +2484,7 @@ def get_zattachments_from_selected_mesh():
         cmds.warning("Please select a valid mesh object.")
         return 0
     # Get the zAttachment nodes associated with the selected mesh
-    zattachments = cmds.zQuery(type="zAttachment")
+    zattachments = zsc.get_scene_index().zquery(type="zAttachment")
     # Check if zAttachment nodes were found
     if zattachments is None:
         cmds.warning("No zAttachment nodes found.")
@@ -1941,7 +2492,7 @@ def get_zattachments_from_selected_mesh():
     # Check the number of zAttachment nodes
     num_zattachments = len(zattachments)
     attachment_names = [f"zAttachment_{i}" for i in range(1, num_zattachments + 1)]
-    print(f"Number of zAttachment nodes: {zattachments}")
+    zrt.log.debug("Number of zAttachment nodes: %s", zattachments)
     return zattachments
 
 
@@ -1952,8 +2503,10 @@ def apply_zpaint_attachments(min_value, max_value):
         return
     # Placeholder function: Replace with your logic to apply zPaintAttachmentsByProximity
     cmds.zPaintAttachmentsByProximity(min=min_value, max=max_value)
-    print(
-        f"Applying zPaintAttachmentsByProximity with min: {min_value}, max: {max_value}"
+    zrt.log.debug(
+        "Applying zPaintAttachmentsByProximity with min: %s, max: %s",
+        min_value,
+        max_value,
     )
 
 
@@ -1974,9 +2527,13 @@ def apply_paint_operation(num_times):
     cmds.warning(f"Smooth Applied {num_times} Times")
 
 
-def randomize_mesh_colors():
+@zrt.bulk_operation("Randomize Color")
+def randomize_mesh_colors(nodes=None):
     # Get selected objects
-    selected_objects = cmds.ls(selection=True, dag=True, long=True, shapes=True)
+    if nodes is None:
+        selected_objects = cmds.ls(selection=True, dag=True, long=True, shapes=True)
+    else:
+        selected_objects = cmds.ls(nodes, dag=True, long=True, shapes=True)
 
     if not selected_objects:
         cmds.warning("No meshes selected.")
@@ -2011,17 +2568,32 @@ def randomize_mesh_colors():
         # Assign a random color
         color = [random.random(), random.random(), random.random()]
         cmds.setAttr("{}.color".format(shading_node), *color, type="double3")
+        cmds.connectAttr(
+            "{}.outColor".format(shading_node),
+            "{}.surfaceShader".format(shading_group),
+            force=True,
+        )
         # Apply the shading node to the mesh
-        cmds.select(mesh, replace=True)
-        cmds.hyperShade(assign=shading_node)
+        cmds.sets(mesh, edit=True, forceElement=shading_group)
     cmds.warning("Mesh colors randomized successfully.")
 
 
-# This will create a new mesh from selected and transfer the info
-# from selected mesh and change it to an OLD mesh
-z = zva.Ziva()
+# zBuilder Ziva builder shared by the transfer tools, see get_ziva_builder()
+_ziva_builder = None
+
+
+def get_ziva_builder():
+    """
+    Return the shared zBuilder Ziva builder, creating it on first use.
+    """
+    global _ziva_builder
+    if _ziva_builder is None:
+        _ziva_builder = zva.Ziva()
+    return _ziva_builder
 
 
+# This will create a new mesh from selected and transfer the info
+# from selected mesh and change it to an OLD mesh
 def ziva_cloth_transfer():
     selected_objects = cmds.ls(selection=True)
 
@@ -2032,9 +2604,9 @@ def ziva_cloth_transfer():
     selected_object = selected_objects[0]
 
     # Check if the selected object is a zCloth
-    if cmds.zQuery(selected_object, type="zCloth"):
+    if zsc.get_scene_index().zquery(selected_object, type="zCloth"):
         # Rename the selected object without "_OLD" suffix
-        zcth = cmds.zQuery(type="zCloth")
+        zcth = zsc.get_scene_index().zquery(type="zCloth")
         rest_scale_frames = cmds.keyframe(zcth[0] + ".restScaleEnvelope", query=True)
         rest_scale_values = cmds.keyframe(
             zcth[0] + ".restScaleEnvelope", query=True, valueChange=True
@@ -2052,6 +2624,7 @@ def ziva_cloth_transfer():
             zcth[0] + ".surfaceTensionEnvelope", query=True, valueChange=True
         )
 
+        z = get_ziva_builder()
         z.retrieve_from_scene()
         old_mesh = cmds.rename(selected_object, selected_object + "_OLD")
         # Duplicate the selected mesh and rename the original with "_OLD" suffix
@@ -2075,11 +2648,11 @@ def ziva_cloth_transfer():
                 zcth[0] + ".surfaceTensionEnvelope", time=frame, value=value
             )
 
-        print("Ziva cloth settings transferred successfully.")
+        zrt.log.info("Ziva cloth settings transferred successfully.")
 
-    elif cmds.zQuery(selected_object, type="zTissue"):
+    elif zsc.get_scene_index().zquery(selected_object, type="zTissue"):
         # Rename the selected object without "_OLD" suffix
-        ztis = cmds.zQuery(type="zTissue")
+        ztis = zsc.get_scene_index().zquery(type="zTissue")
         rest_scale_frames = cmds.keyframe(ztis[0] + ".restScaleEnvelope", query=True)
         rest_scale_values = cmds.keyframe(
             ztis[0] + ".restScaleEnvelope", query=True, valueChange=True
@@ -2097,6 +2670,7 @@ def ziva_cloth_transfer():
             ztis[0] + ".surfaceTensionEnvelope", query=True, valueChange=True
         )
 
+        z = get_ziva_builder()
         z.retrieve_from_scene()
         old_mesh = cmds.rename(selected_object, selected_object + "_OLD")
         # Duplicate the selected mesh and rename the original with "_OLD" suffix
@@ -2120,7 +2694,7 @@ def ziva_cloth_transfer():
                 ztis[0] + ".surfaceTensionEnvelope", time=frame, value=value
             )
 
-        print("Ziva cloth settings transferred successfully.")
+        zrt.log.info("Ziva cloth settings transferred successfully.")
     else:
         cmds.warning("Please select a valid Ziva cloth mesh to transfer settings.")
 
@@ -2144,20 +2718,21 @@ def ziva_get_mesh_nodes():
         cmds.warning("Please select a valid mesh object.")
         return []
 
+    scene = zsc.get_scene_index()
     # Get the zAttachment nodes associated with the selected mesh
-    zattachments = cmds.zQuery(type="zAttachment") or []
+    zattachments = scene.zquery(type="zAttachment") or []
     # Get zFiber nodes associated with the selected mesh
-    zfiber_nodes = cmds.zQuery(type="zFiber") or []
+    zfiber_nodes = scene.zquery(type="zFiber") or []
     # Get zCloth nodes associated with the selected mesh
-    zcloth_nodes = cmds.zQuery(type="zCloth") or []
+    zcloth_nodes = scene.zquery(type="zCloth") or []
     # Get zTet nodes associated with the selected mesh
-    ztet_nodes = cmds.zQuery(type="zTet") or []
+    ztet_nodes = scene.zquery(type="zTet") or []
     # Get zMaterial nodes associated with the selected mesh
-    zmaterial_nodes = cmds.zQuery(type="zMaterial") or []
+    zmaterial_nodes = scene.zquery(type="zMaterial") or []
 
-    ztissue_nodes = cmds.zQuery(type="zTissue") or []
-    zbone_nodes = cmds.zQuery(type="zBone") or []
-    zLineOfAction_nodes = cmds.zQuery(type="zLineOfAction") or []
+    ztissue_nodes = scene.zquery(type="zTissue") or []
+    zbone_nodes = scene.zquery(type="zBone") or []
+    zLineOfAction_nodes = scene.zquery(type="zLineOfAction") or []
     # Combine all node types into a single list
     all_nodes = (
         zattachments
@@ -2170,11 +2745,11 @@ def ziva_get_mesh_nodes():
         + zLineOfAction_nodes
     )
 
-    print(f"zAttachment nodes: {zattachments}")
-    print(f"zFiber nodes: {zfiber_nodes}")
-    print(f"zCloth nodes: {zcloth_nodes}")
-    print(f"zTet nodes: {ztet_nodes}")
-    print(f"zMaterial nodes: {zmaterial_nodes}")
+    zrt.log.debug("zAttachment nodes: %s", zattachments)
+    zrt.log.debug("zFiber nodes: %s", zfiber_nodes)
+    zrt.log.debug("zCloth nodes: %s", zcloth_nodes)
+    zrt.log.debug("zTet nodes: %s", ztet_nodes)
+    zrt.log.debug("zMaterial nodes: %s", zmaterial_nodes)
 
     return all_nodes
 
@@ -2205,26 +2780,27 @@ def get_z_components(selected_object):
         cmds.warning("Invalid object. Please select a valid object.")
         return z_components
 
+    scene = zsc.get_scene_index()
     # Get zAttachment nodes associated with the selected object
-    z_attachments = cmds.zQuery(type="zAttachment") or []
+    z_attachments = scene.zquery(type="zAttachment") or []
     z_components["zAttachment"] = z_attachments
     # Get zMaterial nodes associated with the selected object
-    z_materials = cmds.zQuery(type="zMaterial") or []
+    z_materials = scene.zquery(type="zMaterial") or []
     z_components["zMaterial"] = z_materials
     # Get zTet nodes associated with the selected object
-    z_tets = cmds.zQuery(type="zTet") or []
+    z_tets = scene.zquery(type="zTet") or []
     z_components["zTet"] = z_tets
 
-    z_tissues = cmds.zQuery(type="zTissue") or []
+    z_tissues = scene.zquery(type="zTissue") or []
     z_components["zTissue"] = z_tissues
 
-    z_bones = cmds.zQuery(type="zBone") or []
+    z_bones = scene.zquery(type="zBone") or []
     z_components["zBone"] = z_bones
 
-    z_fibers = cmds.zQuery(type="zFiber") or []
+    z_fibers = scene.zquery(type="zFiber") or []
     z_components["zFiber"] = z_fibers
 
-    z_cloths = cmds.zQuery(type="zCloth") or []
+    z_cloths = scene.zquery(type="zCloth") or []
     z_components["zCloth"] = z_cloths
 
     # z_loas = cmds.zQuery(type="zLineOfAction") or []
@@ -2238,9 +2814,9 @@ def is_nurbs_curve(obj):
     shape_nodes = cmds.listRelatives(obj, shapes=True, type='nurbsCurve')
     return shape_nodes is not None and len(shape_nodes) > 0
 
-def create_point_on_curve_and_remap():
+def create_point_on_curve_and_remap(curve=None):
     # Get the selected object
-    selected_objects = cmds.ls(selection=True)
+    selected_objects = nodes_or_selection(curve, long=False)
     if not selected_objects:
         cmds.warning("Please select an object.")
         return None, None, None
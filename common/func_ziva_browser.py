@@ -0,0 +1,284 @@
+import maya.cmds as cmds
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_scene as zsc
+from PySide2 import QtCore, QtWidgets
+
+# Ziva node type of a row, and the node name of a node row
+TYPE_ROLE = QtCore.Qt.UserRole + 1
+NAME_ROLE = QtCore.Qt.UserRole + 2
+
+############################################################
+#################   COMPONENT MODEL   ######################
+############################################################
+
+
+class ComponentModel(QtCore.QAbstractItemModel):
+    """
+    Ziva nodes of a ComponentCatalog, one top level row per node type.
+
+    Rows are read straight from the catalog and its change notifications are
+    turned into row inserts and removals, so a node created, renamed or
+    deleted in Maya updates the views without a reset.
+    """
+
+    def __init__(self, catalog=None, parent=None):
+        super(ComponentModel, self).__init__(parent)
+        self.catalog = catalog or zsc.get_component_catalog()
+        self.catalog.add_listener(self._on_catalog_changed)
+
+    def close(self):
+        self.catalog.remove_listener(self._on_catalog_changed)
+
+    def _on_catalog_changed(self, event, node_type, row):
+        if event == "about_to_insert":
+            self.beginInsertRows(self.group_index(node_type), row, row)
+        elif event == "inserted":
+            self.endInsertRows()
+            self._group_changed(node_type)
+        elif event == "about_to_remove":
+            self.beginRemoveRows(self.group_index(node_type), row, row)
+        elif event == "removed":
+            self.endRemoveRows()
+            self._group_changed(node_type)
+        elif event == "about_to_reset":
+            self.beginResetModel()
+        elif event == "reset":
+            self.endResetModel()
+
+    def _group_changed(self, node_type):
+        # The group label shows the node count
+        index = self.group_index(node_type)
+        self.dataChanged.emit(index, index)
+
+    def group_index(self, node_type):
+        return self.createIndex(self.catalog.node_types.index(node_type), 0, 0)
+
+    def _group_row(self, index):
+        # Group rows have internal id 0, node rows their group row + 1
+        return index.internalId() - 1
+
+    ############# QAbstractItemModel
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            return self.createIndex(row, column, 0)
+        return self.createIndex(row, column, parent.row() + 1)
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QtCore.QModelIndex()
+        return self.createIndex(self._group_row(index), 0, 0)
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self.catalog.node_types)
+        if parent.internalId() == 0:
+            return len(self.catalog.names(self.catalog.node_types[parent.row()]))
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return QtCore.Qt.NoItemFlags
+        if index.internalId() == 0:
+            return QtCore.Qt.ItemIsEnabled
+        return QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            node_type = self.catalog.node_types[index.row()]
+            if role == QtCore.Qt.DisplayRole:
+                return f"{node_type} ({len(self.catalog.names(node_type))})"
+            if role == TYPE_ROLE:
+                return node_type
+            return None
+        node_type = self.catalog.node_types[self._group_row(index)]
+        if role in (QtCore.Qt.DisplayRole, NAME_ROLE):
+            return self.catalog.names(node_type)[index.row()]
+        if role == TYPE_ROLE:
+            return node_type
+        return None
+
+
+class ComponentFilterProxy(QtCore.QSortFilterProxyModel):
+    """
+    Filter the nodes of a ComponentModel by name.
+
+    Args:
+        show_empty_groups (bool): Keep the type rows without a matching node,
+            needed when a combo box uses a type row as its root.
+    """
+
+    def __init__(self, show_empty_groups=False, parent=None):
+        super(ComponentFilterProxy, self).__init__(parent)
+        self.show_empty_groups = show_empty_groups
+        self._text = ""
+        self._names = None
+        # A type row is kept while any of its nodes matches
+        self.setRecursiveFilteringEnabled(not show_empty_groups)
+
+    def set_text(self, text):
+        """
+        Only keep the nodes whose name contains `text`, case insensitive.
+        """
+        self._text = text.strip().lower()
+        self.invalidateFilter()
+
+    def set_names(self, names):
+        """
+        Only keep the nodes in `names`, None keeps every node.
+        """
+        self._names = None if names is None else set(names)
+        self.invalidateFilter()
+
+    def is_filtering(self):
+        return bool(self._text) or self._names is not None
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not source_parent.isValid():
+            return self.show_empty_groups or not self.is_filtering()
+        name = self.sourceModel().index(source_row, 0, source_parent).data(NAME_ROLE)
+        if self._names is not None and name not in self._names:
+            return False
+        return self._text in name.lower()
+
+
+############################################################
+#################   COMPONENT BROWSER   ####################
+############################################################
+
+
+def get_selected_components(node_types=None):
+    """
+    Names of the Ziva nodes of the selected meshes.
+
+    Args:
+        node_types (list): Node types to query, COMPONENT_TYPES by default.
+
+    Returns:
+        list: Node names, empty with a warning if nothing is selected.
+    """
+    if not cmds.ls(selection=True):
+        cmds.warning("Please select a mesh object.")
+        return []
+    scene = zsc.get_scene_index()
+    names = []
+    for node_type in node_types or zsc.COMPONENT_TYPES:
+        names.extend(scene.zquery(type=node_type) or [])
+    return names
+
+
+class ComponentBrowser(QtWidgets.QWidget):
+    """
+    Tree of the Ziva nodes grouped by type, with a name filter.
+
+    Selecting nodes in the tree selects them in Maya. "Selected Mesh Only"
+    restricts the tree to the Ziva nodes of the meshes selected when it is
+    checked or refreshed.
+    """
+
+    def __init__(self, model=None, parent=None):
+        super(ComponentBrowser, self).__init__(parent)
+        self.model = model or ComponentModel(parent=self)
+        self.proxy = ComponentFilterProxy(parent=self)
+        self.proxy.setSourceModel(self.model)
+
+        self.filter_lineedit = QtWidgets.QLineEdit()
+        self.filter_lineedit.setPlaceholderText("Filter components")
+        self.filter_lineedit.setClearButtonEnabled(True)
+        self.selected_checkbox = QtWidgets.QCheckBox("Selected Mesh Only")
+        self.refresh_button = QtWidgets.QPushButton("Refresh")
+        self.tree_view = QtWidgets.QTreeView()
+        self.tree_view.setModel(self.proxy)
+        self.tree_view.setHeaderHidden(True)
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+
+        layout = QtWidgets.QGridLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.filter_lineedit, 0, 0, 1, 2)
+        layout.addWidget(self.selected_checkbox, 1, 0)
+        layout.addWidget(self.refresh_button, 1, 1)
+        layout.addWidget(self.tree_view, 2, 0, 1, 2)
+
+        self.filter_lineedit.textChanged.connect(self.set_filter_text)
+        self.selected_checkbox.toggled.connect(self.refresh_selection_filter)
+        self.refresh_button.clicked.connect(self.refresh_selection_filter)
+        self.tree_view.selectionModel().selectionChanged.connect(self.select_nodes)
+
+    def set_filter_text(self, text):
+        self.proxy.set_text(text)
+        if text:
+            self.tree_view.expandAll()
+
+    def refresh_selection_filter(self):
+        if self.selected_checkbox.isChecked():
+            self.proxy.set_names(get_selected_components())
+            self.tree_view.expandAll()
+        else:
+            self.proxy.set_names(None)
+
+    def selected_nodes(self):
+        names = []
+        for index in self.tree_view.selectionModel().selectedIndexes():
+            name = index.data(NAME_ROLE)
+            if name:
+                names.append(name)
+        return names
+
+    def select_nodes(self, *args):
+        names = [name for name in self.selected_nodes() if cmds.objExists(name)]
+        if names:
+            cmds.select(names)
+            zrt.log.debug("Selected %d components.", len(names))
+
+
+class ComponentSearchBox(QtWidgets.QLineEdit):
+    """
+    Search the Ziva nodes by name while typing, picking a result selects it.
+
+    The NameSearchIndex is built on the first keystroke, the ranked matches
+    are shown in a completer popup.
+    """
+
+    def __init__(self, limit=20, parent=None):
+        super(ComponentSearchBox, self).__init__(parent)
+        self.limit = limit
+        self.search_index = None
+        self.setPlaceholderText("Search Ziva nodes")
+        self.setClearButtonEnabled(True)
+        self.results_model = QtCore.QStringListModel(self)
+        self.completer = QtWidgets.QCompleter(self.results_model, self)
+        self.completer.setCompletionMode(QtWidgets.QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(limit)
+        self.completer.setWidget(self)
+        self.completer.activated[str].connect(self.select_node)
+        self.textEdited.connect(self.search)
+        self.returnPressed.connect(self.select_first)
+
+    def search(self, text):
+        if self.search_index is None:
+            self.search_index = zsc.get_name_search_index()
+        names = self.search_index.search(text, self.limit)
+        self.results_model.setStringList(names)
+        if names:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def select_first(self):
+        names = self.results_model.stringList()
+        if names:
+            self.select_node(names[0])
+
+    def select_node(self, name):
+        self.setText(name)
+        if cmds.objExists(name):
+            cmds.select(name)
+            zrt.log.debug("Selected %s.", name)
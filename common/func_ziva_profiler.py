@@ -0,0 +1,294 @@
+import contextlib
+import csv
+import functools
+import inspect
+import json
+import os
+import time
+from collections import defaultdict
+
+import maya.cmds as cmds
+import maya.mel as mel
+
+import z_toolbox.common.func_ziva_auto as zi
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_scene as zsc
+import z_toolbox.common.func_ziva_simulation as zsim
+import z_toolbox.common.func_ziva_solver as zsv
+import z_toolbox.common.func_ziva_spatial as zsp
+import z_toolbox.common.func_ziva_tets as ztet
+
+############################################################
+#################   ENTRY POINT PROFILER   #################
+############################################################
+
+# Modules whose public functions are timed as entry points
+ENTRY_POINT_MODULES = [zi]
+
+# Modules whose cmds / mel calls are counted, helpers called by the entry
+# points go through these too
+COMMAND_MODULES = [zi, zsc, zsp, ztet, zsv, zsim]
+
+# Columns of the CSV export and of Profiler.rows()
+PROFILE_COLUMNS = ["entry_point", "command", "calls", "seconds", "share"]
+
+
+def _empty_entry():
+    return {
+        "calls": 0,
+        "total": 0.0,
+        "max": 0.0,
+        "commands": defaultdict(lambda: {"calls": 0, "total": 0.0}),
+    }
+
+
+class _CommandRecorder(object):
+    """
+    Stand-in for the cmds or mel module of a profiled module.
+
+    Every callable looked up through it is wrapped so its calls and wall time
+    are added to the entry points running at that moment. mel.eval calls are
+    keyed by their first word, so "ziva -t" shows up as "mel.eval ziva".
+    """
+
+    def __init__(self, profiler, module, prefix):
+        self._profiler = profiler
+        self._module = module
+        self._prefix = prefix
+        self._wrapped = {}
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr):
+            return attr
+        if name not in self._wrapped:
+            self._wrapped[name] = self._wrap(name, attr)
+        return self._wrapped[name]
+
+    def _wrap(self, name, func):
+        profiler = self._profiler
+        command_name = f"{self._prefix}.{name}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler._stack:
+                return func(*args, **kwargs)
+            key = command_name
+            if name == "eval" and args and isinstance(args[0], str):
+                words = args[0].split()
+                key = f"{command_name} {words[0].rstrip(';')}" if words else key
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._record_command(key, time.perf_counter() - start)
+
+        return wrapper
+
+
+class Profiler(object):
+    """
+    Call counts, wall time and cmds / mel usage of the toolbox entry points.
+
+    install() replaces the public functions of ENTRY_POINT_MODULES with
+    timing wrappers and the cmds / mel globals of COMMAND_MODULES with
+    recorders, uninstall() puts the originals back. Nothing is wrapped while
+    the profiler is not installed, so it costs nothing when switched off.
+
+    Command calls are added to every entry point on the call stack, the
+    numbers of an entry point include the helpers it calls. The slices of a
+    zrt.Job run after its entry point returned, they are added to the entry
+    point that made the job, or to the job name.
+    """
+
+    def __init__(self):
+        self.entries = defaultdict(_empty_entry)
+        self._stack = []
+        self._originals = []
+
+    ############# INSTALL
+
+    @property
+    def installed(self):
+        return bool(self._originals)
+
+    def install(self):
+        if self.installed:
+            return
+        for module in ENTRY_POINT_MODULES:
+            for name, func in inspect.getmembers(module, inspect.isfunction):
+                if name.startswith("_") or func.__module__ != module.__name__:
+                    continue
+                self._replace(module, name, self._wrap_entry(name, func))
+        num_entry_points = len(self._originals)
+        for module in COMMAND_MODULES:
+            if getattr(module, "cmds", None) is cmds:
+                self._replace(module, "cmds", _CommandRecorder(self, cmds, "cmds"))
+            if getattr(module, "mel", None) is mel:
+                self._replace(module, "mel", _CommandRecorder(self, mel, "mel"))
+        zrt.JOB_SLICE_HOOKS.append(self._job_slice)
+        zrt.log.info("Profiling %s toolbox entry points.", num_entry_points)
+
+    def uninstall(self):
+        if self._job_slice in zrt.JOB_SLICE_HOOKS:
+            zrt.JOB_SLICE_HOOKS.remove(self._job_slice)
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+
+    def _replace(self, module, name, replacement):
+        self._originals.append((module, name, getattr(module, name)))
+        setattr(module, name, replacement)
+
+    def _wrap_entry(self, name, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self._stack.append(name)
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, zrt.Job) and result.entry_point is None:
+                    result.entry_point = self._stack[0]
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                self._stack.pop()
+                # Recursive calls are already timed by the outer call
+                if name not in self._stack:
+                    entry = self.entries[name]
+                    entry["calls"] += 1
+                    entry["total"] += elapsed
+                    entry["max"] = max(entry["max"], elapsed)
+
+        return wrapper
+
+    @contextlib.contextmanager
+    def _job_slice(self, job):
+        name = job.entry_point or job.name
+        entry = self.entries[name]
+        if job.entry_point is None and not job.done:
+            # A job made outside the entry points counts once, on its first slice
+            entry["calls"] += 1
+        self._stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            if name not in self._stack:
+                entry["total"] += elapsed
+
+    def _record_command(self, command, elapsed):
+        for name in set(self._stack):
+            counter = self.entries[name]["commands"][command]
+            counter["calls"] += 1
+            counter["total"] += elapsed
+
+    ############# RESULTS
+
+    def reset(self):
+        self.entries.clear()
+
+    def rows(self):
+        """
+        Flatten the profile, slowest entry points and commands first.
+
+        Returns:
+            list: One dict per entry point (command "") followed by one dict
+            per command it called, with the PROFILE_COLUMNS keys. "share" is
+            the fraction of the entry point time spent in that command.
+        """
+        rows = []
+        entries = sorted(
+            self.entries.items(), key=lambda item: item[1]["total"], reverse=True
+        )
+        for name, entry in entries:
+            if not entry["calls"]:
+                continue
+            total = entry["total"]
+            rows.append(
+                {
+                    "entry_point": name,
+                    "command": "",
+                    "calls": entry["calls"],
+                    "seconds": total,
+                    "share": 1.0,
+                }
+            )
+            commands = sorted(
+                entry["commands"].items(),
+                key=lambda item: item[1]["total"],
+                reverse=True,
+            )
+            for command, counter in commands:
+                rows.append(
+                    {
+                        "entry_point": name,
+                        "command": command,
+                        "calls": counter["calls"],
+                        "seconds": counter["total"],
+                        "share": counter["total"] / total if total else 0.0,
+                    }
+                )
+        return rows
+
+    def to_dict(self):
+        return {
+            name: {
+                "calls": entry["calls"],
+                "total": entry["total"],
+                "max": entry["max"],
+                "commands": {
+                    command: dict(counter)
+                    for command, counter in entry["commands"].items()
+                },
+            }
+            for name, entry in self.entries.items()
+            if entry["calls"]
+        }
+
+    def export(self, path):
+        """
+        Write the profile to `path`, as CSV for a .csv extension, else JSON.
+
+        Returns:
+            str: The path written.
+        """
+        if os.path.splitext(path)[1].lower() == ".csv":
+            with open(path, "w", newline="") as csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=PROFILE_COLUMNS)
+                writer.writeheader()
+                writer.writerows(self.rows())
+        else:
+            with open(path, "w") as json_file:
+                json.dump(self.to_dict(), json_file, indent=4, sort_keys=True)
+        zrt.log.info("Profile written to %s.", path)
+        return path
+
+
+PROFILER = Profiler()
+
+
+def enable_profiling():
+    PROFILER.install()
+
+
+def disable_profiling():
+    PROFILER.uninstall()
+
+
+def is_profiling():
+    return PROFILER.installed
+
+
+def reset_profile():
+    PROFILER.reset()
+
+
+def get_profile_rows():
+    return PROFILER.rows()
+
+
+def export_profile(path):
+    return PROFILER.export(path)
@@ -0,0 +1,532 @@
+import contextlib
+import copy
+import importlib
+import logging
+import sys
+import time
+import types
+from collections import defaultdict, deque
+
+import maya.cmds as cmds
+
+############################################################
+#################   LOGGING   ##############################
+############################################################
+
+LOG_FORMAT = "%(levelname)s z_toolbox: %(message)s"
+
+# Console records allowed per interval, the script editor is slow to append
+LOG_RATE_LIMIT = 50
+LOG_RATE_INTERVAL = 1.0
+
+# Recent records kept in memory regardless of the console level
+LOG_BUFFER_SIZE = 2000
+
+log = logging.getLogger("z_toolbox")
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `max_records` records through per `interval` seconds.
+
+    Dropped records are counted, ConsoleHandler notes how many were
+    suppressed on the next record that passes so nothing disappears
+    silently. Records logged with extra={"rate_limit": False} always pass.
+    """
+
+    def __init__(self, max_records=LOG_RATE_LIMIT, interval=LOG_RATE_INTERVAL):
+        super(RateLimitFilter, self).__init__()
+        self.max_records = max_records
+        self.interval = interval
+        self.suppressed = 0
+        self._window_start = 0.0
+        self._window_count = 0
+
+    def filter(self, record):
+        now = time.monotonic()
+        if now - self._window_start >= self.interval:
+            self._window_start = now
+            self._window_count = 0
+        # Operation summaries are never dropped, see bulk_operation()
+        limited = getattr(record, "rate_limit", True)
+        if limited and self._window_count >= self.max_records:
+            self.suppressed += 1
+            return False
+        self._window_count += 1
+        return True
+
+    def pop_suppressed(self):
+        suppressed, self.suppressed = self.suppressed, 0
+        return suppressed
+
+
+class ConsoleHandler(logging.StreamHandler):
+    """
+    Stream handler noting the records its RateLimitFilter dropped.
+
+    The note is put on a copy of the record, the other handlers get the
+    record as it was logged.
+    """
+
+    def emit(self, record):
+        suppressed = sum(
+            log_filter.pop_suppressed()
+            for log_filter in self.filters
+            if isinstance(log_filter, RateLimitFilter)
+        )
+        if suppressed:
+            record = copy.copy(record)
+            record.msg = f"({suppressed} messages suppressed) {record.getMessage()}"
+            record.args = ()
+        super(ConsoleHandler, self).emit(record)
+
+
+class RingBufferHandler(logging.Handler):
+    """
+    Keep the last `capacity` records in memory, formatted on demand.
+    """
+
+    def __init__(self, capacity=LOG_BUFFER_SIZE, level=logging.DEBUG):
+        super(RingBufferHandler, self).__init__(level)
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def lines(self, level=logging.DEBUG):
+        return [self.format(r) for r in self.records if r.levelno >= level]
+
+    def clear(self):
+        self.records.clear()
+
+
+def _setup_logging():
+    # Replace our own handlers when the module is reloaded in a Maya session
+    for handler in list(log.handlers):
+        if getattr(handler, "z_toolbox", False):
+            log.removeHandler(handler)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    console = ConsoleHandler(sys.stdout)
+    console.setLevel(logging.INFO)
+    console.addFilter(RateLimitFilter())
+    buffer = RingBufferHandler()
+    for handler in (console, buffer):
+        handler.z_toolbox = True
+        handler.setFormatter(formatter)
+        log.addHandler(handler)
+
+    log.setLevel(logging.DEBUG)
+    # Maya puts its own handler on the root logger, avoid printing twice
+    log.propagate = False
+    return console, buffer
+
+
+_console_handler, _buffer_handler = _setup_logging()
+_file_handlers = {}
+
+
+def set_verbose(verbose=True):
+    """
+    Print per-node detail to the script editor instead of summaries only.
+    """
+    _console_handler.setLevel(logging.DEBUG if verbose else logging.INFO)
+
+
+def is_verbose():
+    return _console_handler.level <= logging.DEBUG
+
+
+def set_rate_limit(max_records=LOG_RATE_LIMIT, interval=LOG_RATE_INTERVAL):
+    for log_filter in _console_handler.filters:
+        if isinstance(log_filter, RateLimitFilter):
+            log_filter.max_records = max_records
+            log_filter.interval = interval
+
+
+def get_recent_log(level=logging.DEBUG):
+    """
+    Return the recent log lines kept in memory, including debug detail.
+    """
+    return _buffer_handler.lines(level)
+
+
+def enable_file_log(path, level=logging.DEBUG):
+    """
+    Also write every record at `level` or above to `path`.
+    """
+    disable_file_log(path)
+    handler = logging.FileHandler(path, encoding="utf-8")
+    handler.z_toolbox = True
+    handler.setLevel(level)
+    handler.setFormatter(logging.Formatter("%(asctime)s " + LOG_FORMAT))
+    log.addHandler(handler)
+    _file_handlers[path] = handler
+    return handler
+
+
+def disable_file_log(path=None):
+    paths = [path] if path else list(_file_handlers)
+    for file_path in paths:
+        handler = _file_handlers.pop(file_path, None)
+        if handler:
+            log.removeHandler(handler)
+            handler.close()
+
+
+############################################################
+#################   LAZY IMPORTS   #########################
+############################################################
+
+# Module name -> seconds its deferred import took
+IMPORT_TIMES = {}
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module that is only imported when one of its attributes is first used.
+
+    pymel and zBuilder take seconds to import and only a few tools need them,
+    so the toolbox opens without loading them. The import time is stored in
+    IMPORT_TIMES when the module is finally loaded.
+    """
+
+    def __init__(self, name):
+        super(LazyModule, self).__init__(name)
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self.__name__)
+            IMPORT_TIMES[self.__name__] = time.perf_counter() - start
+            log.debug(
+                "Imported %s in %.2fs.", self.__name__, IMPORT_TIMES[self.__name__]
+            )
+        return self._module
+
+    @property
+    def is_loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, name):
+        if name.startswith("__") and name.endswith("__"):
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+
+def lazy_import(name):
+    """
+    Return a LazyModule for `name`, e.g. pm = lazy_import("pymel.core").
+    """
+    return LazyModule(name)
+
+
+############################################################
+#################   BULK OPERATIONS   ######################
+############################################################
+
+# When True bulk operations run with undo disabled instead of in one undo
+# chunk, for batch pipelines that never undo and should not grow the queue.
+BATCH_MODE = False
+
+# Operation name -> wall-clock seconds of every run
+OPERATION_TIMES = defaultdict(list)
+
+# Only the outermost bulk operation touches undo and refresh state
+_active_operations = []
+
+# Event -> count for the running outermost operation, see count()
+_operation_counters = defaultdict(int)
+
+
+def count(event, n=1):
+    """
+    Add `n` to the `event` counter of the running bulk operation.
+
+    The outermost operation logs all its counters in one summary line when it
+    finishes, e.g. count("attachments created").
+    """
+    _operation_counters[event] += n
+
+
+def format_counters(counters):
+    return ", ".join(f"{n} {event}" for event, n in counters.items() if n)
+
+
+@contextlib.contextmanager
+def bulk_operation(name, batch=None, suspend_refresh=True, quiet=False):
+    """
+    Run a bulk Ziva operation as one undoable step without viewport redraws.
+
+    Opens a single undo chunk (or disables undo in batch mode), suspends
+    viewport refresh and restores both when the block exits, including on
+    exceptions. The wall-clock time of the block is stored in OPERATION_TIMES
+    and the outermost operation logs one summary line with its count()
+    counters. Can be used as a context manager or as a function decorator.
+
+    Args:
+        name (str): Operation name, used for the undo chunk and the timings.
+        batch (bool): Disable undo entirely, defaults to BATCH_MODE.
+        suspend_refresh (bool): Suspend viewport refresh during the operation.
+        quiet (bool): Log the summary at DEBUG, for operations that run on
+            their own, e.g. from scene callbacks.
+    """
+    batch = BATCH_MODE if batch is None else batch
+    outermost = not _active_operations
+    undo_state = cmds.undoInfo(query=True, state=True)
+    refresh_suspended = False
+    start = time.perf_counter()
+
+    if outermost:
+        _operation_counters.clear()
+        if batch:
+            cmds.undoInfo(stateWithoutFlush=False)
+        elif undo_state:
+            cmds.undoInfo(openChunk=True, chunkName=name)
+        if suspend_refresh and not cmds.about(batch=True):
+            cmds.refresh(suspend=True)
+            refresh_suspended = True
+
+    _active_operations.append(name)
+    try:
+        yield
+    finally:
+        _active_operations.pop()
+        if outermost:
+            if refresh_suspended:
+                cmds.refresh(suspend=False)
+                cmds.refresh()
+            if batch:
+                cmds.undoInfo(stateWithoutFlush=undo_state)
+            elif undo_state:
+                cmds.undoInfo(closeChunk=True)
+        elapsed = time.perf_counter() - start
+        OPERATION_TIMES[name].append(elapsed)
+        if outermost:
+            summary = format_counters(_operation_counters)
+            _operation_counters.clear()
+            extra = {"rate_limit": False}
+            level = logging.DEBUG if quiet else logging.INFO
+            if summary:
+                log.log(
+                    level,
+                    "%s finished in %.3fs: %s.",
+                    name,
+                    elapsed,
+                    summary,
+                    extra=extra,
+                )
+            else:
+                log.log(level, "%s finished in %.3fs.", name, elapsed, extra=extra)
+
+
+def get_operation_times():
+    """
+    Summarise OPERATION_TIMES per operation.
+
+    Returns:
+        dict: Operation name -> {"calls", "total", "mean", "max"} in seconds.
+    """
+    return {
+        name: {
+            "calls": len(times),
+            "total": sum(times),
+            "mean": sum(times) / len(times),
+            "max": max(times),
+        }
+        for name, times in OPERATION_TIMES.items()
+        if times
+    }
+
+
+def reset_operation_times():
+    OPERATION_TIMES.clear()
+
+
+############################################################
+#################   JOBS   #################################
+############################################################
+
+# Seconds of work per slice of a job before Maya gets control back
+JOB_SLICE = 0.05
+
+# Context manager factories called with the job around every slice, e.g. to
+# attribute the slice to a profiled entry point
+JOB_SLICE_HOOKS = []
+
+
+class Job(object):
+    """
+    A bulk operation split into steps that can run a slice at a time.
+
+    `steps` is an iterator doing one item per next() call and yielding a
+    label for it, e.g. the mesh it just attached. run() does every step at
+    once as a bulk_operation(). start() / run_slice() interleave the steps
+    with Maya's event loop so a progress bar can redraw and cancel() can stop
+    the job. Every slice is its own undo chunk, so what runs between two
+    slices is never merged into the job. The slices share one set of count()
+    counters, and cancelling closes the steps at the yield, which is the
+    boundary between two items.
+
+    Args:
+        name (str): Operation name, used for the undo chunk and the timings.
+        steps (iterator): Does one item per step.
+        total (int): Number of steps, for the progress and the ETA.
+    """
+
+    def __init__(self, name, steps, total):
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.label = ""
+        self.state = "pending"
+        self.counters = defaultdict(int)
+        self._steps = iter(steps)
+        self._start = None
+        self._elapsed = 0.0
+        # Name of the profiled entry point that made the job, if any
+        self.entry_point = None
+
+    ############# STATE
+
+    @property
+    def finished(self):
+        return self.state in ("finished", "cancelled", "failed")
+
+    @property
+    def elapsed(self):
+        if self._start is None or self.finished:
+            return self._elapsed
+        return time.perf_counter() - self._start
+
+    def eta(self):
+        """
+        Seconds left at the average speed so far, None before the first step.
+        """
+        if not self.done:
+            return None
+        return self.elapsed / self.done * max(0, self.total - self.done)
+
+    ############# RUN
+
+    def run(self):
+        """
+        Do every step now as one bulk_operation().
+        """
+        with bulk_operation(self.name):
+            for self.label in self._steps:
+                self.done += 1
+        self.state = "finished"
+        return self
+
+    def start(self):
+        if self.state != "pending":
+            return
+        self._start = time.perf_counter()
+        self.state = "running"
+
+    @contextlib.contextmanager
+    def _slice(self):
+        # Nested bulk operations see this job as the outermost one
+        saved_counters = dict(_operation_counters)
+        _operation_counters.clear()
+        _operation_counters.update(self.counters)
+        _active_operations.append(self.name)
+        undo_state = cmds.undoInfo(query=True, state=True)
+        if BATCH_MODE:
+            cmds.undoInfo(stateWithoutFlush=False)
+        elif undo_state:
+            cmds.undoInfo(openChunk=True, chunkName=self.name)
+        refresh_suspended = False
+        try:
+            if not cmds.about(batch=True):
+                cmds.refresh(suspend=True)
+                refresh_suspended = True
+            with contextlib.ExitStack() as hooks:
+                for hook in JOB_SLICE_HOOKS:
+                    hooks.enter_context(hook(self))
+                yield
+        finally:
+            if refresh_suspended:
+                cmds.refresh(suspend=False)
+            if BATCH_MODE:
+                cmds.undoInfo(stateWithoutFlush=undo_state)
+            elif undo_state:
+                cmds.undoInfo(closeChunk=True)
+            _active_operations.pop()
+            self.counters = defaultdict(int, _operation_counters)
+            _operation_counters.clear()
+            _operation_counters.update(saved_counters)
+
+    def run_slice(self, budget=JOB_SLICE):
+        """
+        Do steps for about `budget` seconds.
+
+        Returns:
+            bool: True while there are steps left.
+        """
+        self.start()
+        if self.finished:
+            return False
+        deadline = time.perf_counter() + budget
+        state = None
+        with self._slice():
+            while True:
+                try:
+                    self.label = next(self._steps)
+                except StopIteration:
+                    state = "finished"
+                    break
+                except Exception as e:
+                    log.warning("%s failed. Error: %s", self.name, e)
+                    state = "failed"
+                    break
+                self.done += 1
+                if time.perf_counter() >= deadline:
+                    break
+        if state:
+            self._finish(state)
+        return not self.finished
+
+    def cancel(self):
+        """
+        Stop before the next step, the items done so far are kept.
+        """
+        if self.finished:
+            return
+        close = getattr(self._steps, "close", None)
+        if close:
+            close()
+        if self.state == "pending":
+            self.state = "cancelled"
+            return
+        self._finish("cancelled")
+
+    def _finish(self, state):
+        self.state = state
+        self._elapsed = time.perf_counter() - self._start
+        OPERATION_TIMES[self.name].append(self._elapsed)
+        summary = format_counters(self.counters)
+        extra = {"rate_limit": False}
+        if state != "finished":
+            log.info(
+                "%s %s after %d of %d items in %.3fs%s",
+                self.name,
+                state,
+                self.done,
+                self.total,
+                self._elapsed,
+                f": {summary}." if summary else ".",
+                extra=extra,
+            )
+        elif summary:
+            log.info(
+                "%s finished in %.3fs: %s.",
+                self.name,
+                self._elapsed,
+                summary,
+                extra=extra,
+            )
+        else:
+            log.info("%s finished in %.3fs.", self.name, self._elapsed, extra=extra)
@@ -0,0 +1,820 @@
+import bisect
+import heapq
+import re
+from collections import defaultdict, deque
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import z_toolbox.common.func_ziva_runtime as zrt
+
+############################################################
+#################   ATTACHMENT INDEX   #####################
+############################################################
+
+# ZA_<source>_to_<target>[_<number>]_att, Maya may append digits on a name clash
+ATTACHMENT_NAME_PATTERN = re.compile(r"^ZA_(?P<source>.+?)_to_(?P<target>.+?)_att\d*$")
+NUMBERED_TARGET_PATTERN = re.compile(r"^(?P<target>.+)_\d+$")
+
+
+def parse_attachment_name(attachment_name):
+    """
+    Extract the source and target mesh names from a zAttachment name.
+
+    Args:
+        attachment_name (str): Attachment node name, e.g. "ZA_arm_to_chest_att".
+
+    Returns:
+        tuple: (source, target), or (None, None) if the name does not follow
+        the ZA_<source>_to_<target>_att convention.
+    """
+    short_name = attachment_name.split("|")[-1].split(":")[-1]
+    match = ATTACHMENT_NAME_PATTERN.match(short_name)
+    if not match:
+        return None, None
+    return match.group("source"), match.group("target")
+
+
+class AttachmentIndex(object):
+    """
+    Existing zAttachments keyed by (source, target) mesh names.
+
+    Built once per run from the scene and kept up to date with add() and
+    remove() as attachments are created or deleted, so checking whether a
+    pair is already attached does not need to list and parse every
+    attachment in the scene again.
+    """
+
+    def __init__(self, attachments=None):
+        self._by_pair = defaultdict(list)
+        self._pairs_by_attachment = {}
+        if attachments is None:
+            attachments = cmds.ls(type="zAttachment") or []
+        for attachment in attachments:
+            self.add(attachment)
+
+    @staticmethod
+    def _pairs(attachment):
+        source, target = parse_attachment_name(attachment)
+        if source is None:
+            return []
+        pairs = [(source, target)]
+        # "ZA_a_to_b_2_att" is the second a -> b attachment, index it under
+        # both readings since the target mesh name may end with digits too
+        numbered = NUMBERED_TARGET_PATTERN.match(target)
+        if numbered:
+            pairs.append((source, numbered.group("target")))
+        return pairs
+
+    def add(self, attachment):
+        pairs = self._pairs(attachment)
+        if not pairs:
+            return
+        for pair in pairs:
+            self._by_pair[pair].append(attachment)
+        self._pairs_by_attachment[attachment] = pairs
+
+    def remove(self, attachment):
+        for pair in self._pairs_by_attachment.pop(attachment, []):
+            nodes = self._by_pair[pair]
+            nodes.remove(attachment)
+            if not nodes:
+                del self._by_pair[pair]
+
+    def find(self, source, target):
+        """
+        Return the attachments created from `source` to `target`.
+        """
+        return list(self._by_pair.get((source, target), []))
+
+    def __contains__(self, pair):
+        return pair in self._by_pair
+
+    def __len__(self):
+        return len(self._pairs_by_attachment)
+
+
+############################################################
+#################   RIVET GRAPH   ##########################
+############################################################
+
+
+class RivetGraph(object):
+    """
+    zRivetToBone nodes and the nodes they connect, read in two queries.
+
+    A rivet reads its bone, drives a curve CV and its locator, and can read
+    another rivet. The connections of every rivet are listed at once and
+    kept as an adjacency map, so the rivets of a whole selection are found
+    with one breadth-first walk instead of querying node by node.
+    """
+
+    def __init__(self, rivets=None):
+        if rivets is None:
+            rivets = cmds.ls(type="zRivetToBone") or []
+        self._rivets = set(rivets)
+        # Rivet -> the rivets it reads, other node -> the rivets it connects
+        self._inputs = defaultdict(dict)
+        self._by_node = defaultdict(dict)
+        if not rivets:
+            return
+        for source in (True, False):
+            pairs = cmds.listConnections(
+                list(rivets),
+                source=source,
+                destination=not source,
+                connections=True,
+                shapes=True,
+            )
+            pairs = pairs or []
+            for plug, other in zip(pairs[::2], pairs[1::2]):
+                rivet = plug.split(".")[0]
+                if other not in self._rivets:
+                    self._by_node[other][rivet] = None
+                elif source:
+                    self._inputs[rivet][other] = None
+                else:
+                    self._inputs[other][rivet] = None
+
+    def walk(self, rivets):
+        """
+        `rivets` and every rivet they read, directly or through other rivets.
+
+        Returns:
+            list: Rivet names in breadth-first order, each once.
+        """
+        visited = set()
+        related = []
+        queue = deque(rivet for rivet in rivets if rivet in self._rivets)
+        while queue:
+            rivet = queue.popleft()
+            if rivet in visited:
+                continue
+            visited.add(rivet)
+            related.append(rivet)
+            queue.extend(self._inputs.get(rivet, ()))
+        return related
+
+    def rivets_for(self, nodes):
+        """
+        The rivets of curves, bones, locators or rivets, see walk().
+
+        Args:
+            nodes (list): Nodes to search, the shapes of transforms are
+                searched too.
+
+        Returns:
+            list: Rivet names, each once.
+        """
+        if not nodes or not self._rivets:
+            return []
+        # Short names, as the connections are listed
+        nodes = cmds.ls(nodes) or []
+        shapes = cmds.listRelatives(nodes, shapes=True) or []
+        start = []
+        for node in nodes + shapes:
+            if node in self._rivets:
+                start.append(node)
+            start.extend(self._by_node.get(node, ()))
+        return self.walk(start)
+
+    def __contains__(self, rivet):
+        return rivet in self._rivets
+
+    def __len__(self):
+        return len(self._rivets)
+
+
+############################################################
+#################   NODE CREATION CAPTURE   ################
+############################################################
+
+
+class NodeCreationCapture(object):
+    """
+    Record the nodes created while the context is active.
+
+    A node-added callback is registered for the duration of the block only,
+    so the nodes made by a Ziva command can be renamed without listing the
+    whole scene afterwards and guessing which ones are new.
+
+    Example:
+        with NodeCreationCapture() as created:
+            mel.eval("ziva -t pSphereShape1;")
+        tissue = created.node("zTissue")
+    """
+
+    def __init__(self):
+        self._handles = []
+        self._callback_id = None
+
+    def __enter__(self):
+        self._handles = []
+        self._callback_id = om.MDGMessage.addNodeAddedCallback(
+            self._on_node_added, "dependNode"
+        )
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        om.MMessage.removeCallback(self._callback_id)
+        self._callback_id = None
+        return False
+
+    def _on_node_added(self, node, client_data):
+        self._handles.append(om.MObjectHandle(node))
+
+    def nodes(self, node_type=None, long=False):
+        """
+        Names of the captured nodes in creation order.
+
+        Names are resolved when queried, so they are current even if the
+        nodes were renamed inside the block.
+
+        Args:
+            node_type (str): Only return nodes of this exact type.
+            long (bool): Return full DAG paths for DAG nodes.
+
+        Returns:
+            list: Node names, deleted nodes are skipped.
+        """
+        names = []
+        for handle in self._handles:
+            if not handle.isValid():
+                continue
+            node = handle.object()
+            fn_node = om.MFnDependencyNode(node)
+            if node_type and fn_node.typeName != node_type:
+                continue
+            if node.hasFn(om.MFn.kDagNode):
+                fn_dag = om.MFnDagNode(node)
+                names.append(fn_dag.fullPathName() if long else fn_dag.partialPathName())
+            else:
+                names.append(fn_node.name())
+        return names
+
+    def node(self, node_type=None, long=False):
+        """
+        Name of the last captured node of `node_type`, None if there is none.
+        """
+        nodes = self.nodes(node_type, long=long)
+        return nodes[-1] if nodes else None
+
+
+############################################################
+#################   SCENE INDEX   ##########################
+############################################################
+
+
+class SceneIndex(object):
+    """
+    Cache of the scene queries the toolbox repeats the most.
+
+    Caches cmds.ls(type=...), cmds.zQuery(...) and listRelatives(allDescendents)
+    results. Entries are dropped by OpenMaya node added / removed / renamed
+    and DAG change callbacks, so a cached answer is always the one Maya
+    would give. Without installed callbacks every query goes to Maya.
+    """
+
+    def __init__(self):
+        self._by_type = {}
+        self._zquery = {}
+        self._descendants = {}
+        self._inherited_types = {}
+        self._callback_ids = []
+        self.counters = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    ############# CALLBACKS
+
+    @property
+    def installed(self):
+        return bool(self._callback_ids)
+
+    def install(self):
+        if self.installed:
+            return
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._on_node_changed, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_changed, "dependNode"),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._on_node_renamed
+            ),
+            om.MDagMessage.addAllDagChangesCallback(self._on_dag_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._on_scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._on_scene_changed),
+        ]
+        self.invalidate()
+
+    def uninstall(self):
+        for callback_id in self._callback_ids:
+            om.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+        self.invalidate()
+
+    def _types_of(self, node_type):
+        # The type and every type it derives from, e.g. mesh -> surfaceShape...
+        if node_type not in self._inherited_types:
+            inherited = cmds.nodeType(node_type, isTypeName=True, inherited=True) or []
+            self._inherited_types[node_type] = set(inherited) | {node_type}
+        return self._inherited_types[node_type]
+
+    def _invalidate_node(self, node):
+        node_type = om.MFnDependencyNode(node).typeName
+        types = self._types_of(node_type)
+        for key in [key for key in self._by_type if key[0] in types]:
+            del self._by_type[key]
+        # Ziva membership follows the Ziva nodes and the meshes they sit on
+        if node_type.startswith("z") or node.hasFn(om.MFn.kDagNode):
+            self._zquery.clear()
+        if node.hasFn(om.MFn.kDagNode):
+            self._descendants.clear()
+
+    def _on_node_changed(self, node, client_data):
+        self._invalidate_node(node)
+
+    def _on_node_renamed(self, node, previous_name, client_data):
+        self._invalidate_node(node)
+
+    def _on_dag_changed(self, message, child, parent, client_data):
+        self._descendants.clear()
+
+    def _on_scene_changed(self, client_data):
+        self.invalidate()
+
+    def invalidate(self):
+        self._by_type.clear()
+        self._zquery.clear()
+        self._descendants.clear()
+
+    ############# QUERIES
+
+    def _lookup(self, cache, counter, key, query):
+        if not self.installed:
+            self.counters[counter]["misses"] += 1
+            return query()
+        if key in cache:
+            self.counters[counter]["hits"] += 1
+        else:
+            self.counters[counter]["misses"] += 1
+            cache[key] = query()
+        result = cache[key]
+        return list(result) if result is not None else None
+
+    def ls(self, node_type, no_intermediate=False, long=False):
+        """
+        Cached cmds.ls(type=node_type).
+        """
+        key = (node_type, no_intermediate, long)
+        return self._lookup(
+            self._by_type,
+            "ls",
+            key,
+            lambda: cmds.ls(type=node_type, noIntermediate=no_intermediate, long=long)
+            or [],
+        )
+
+    def zquery(self, nodes=None, **flags):
+        """
+        Cached cmds.zQuery(nodes, **flags).
+
+        Without `nodes` zQuery works on the selection, the selection is then
+        part of the cache key.
+        """
+        if nodes is None:
+            target = tuple(cmds.ls(selection=True, long=True) or [])
+        elif isinstance(nodes, str):
+            target = (nodes,)
+        else:
+            target = tuple(nodes)
+        key = (nodes is None, target, tuple(sorted(flags.items())))
+
+        def query():
+            if nodes is None:
+                return cmds.zQuery(**flags)
+            return cmds.zQuery(nodes, **flags)
+
+        return self._lookup(self._zquery, "zQuery", key, query)
+
+    def descendants(self, node, node_type=None, full_path=True):
+        """
+        Cached cmds.listRelatives(node, allDescendents=True, type=node_type).
+        """
+        key = (node, node_type, full_path)
+
+        def query():
+            flags = {"allDescendents": True, "fullPath": full_path}
+            if node_type:
+                flags["type"] = node_type
+            return cmds.listRelatives(node, **flags) or []
+
+        return self._lookup(self._descendants, "listRelatives", key, query)
+
+    ############# COUNTERS
+
+    def reset_counters(self):
+        self.counters.clear()
+
+    def report(self):
+        """
+        Log and return the hit / miss counters of every cached query.
+        """
+        for name, counter in sorted(self.counters.items()):
+            total = counter["hits"] + counter["misses"]
+            rate = 100.0 * counter["hits"] / total if total else 0.0
+            zrt.log.info(
+                "SceneIndex %s: %d hits, %d misses (%.1f%% hit rate)",
+                name,
+                counter["hits"],
+                counter["misses"],
+                rate,
+            )
+        return {name: dict(counter) for name, counter in self.counters.items()}
+
+
+_scene_index = None
+
+
+def get_scene_index():
+    """
+    Return the shared SceneIndex, installing its callbacks on first use.
+    """
+    global _scene_index
+    if _scene_index is None:
+        _scene_index = SceneIndex()
+        _scene_index.install()
+    return _scene_index
+
+
+############################################################
+#################   COMPONENT CATALOG   ####################
+############################################################
+
+# Ziva node types listed by the component browser, in display order
+COMPONENT_TYPES = [
+    "zTissue",
+    "zBone",
+    "zCloth",
+    "zTet",
+    "zMaterial",
+    "zFiber",
+    "zLineOfAction",
+    "zAttachment",
+]
+
+
+class ComponentCatalog(object):
+    """
+    Sorted names of the Ziva nodes in the scene, grouped by type.
+
+    The scene is listed once, then OpenMaya node added / removed / renamed
+    callbacks insert and remove single names. Listeners are told about every
+    change before and after it happens, with the row it affects, which is
+    what a Qt item model needs to update its views without a reset:
+
+        listener("about_to_insert", node_type, row)
+        listener("inserted", node_type, row)
+        listener("about_to_remove", node_type, row)
+        listener("removed", node_type, row)
+        listener("about_to_reset", None, None)
+        listener("reset", None, None)
+    """
+
+    def __init__(self, node_types=None):
+        self.node_types = list(node_types or COMPONENT_TYPES)
+        self._names = {node_type: [] for node_type in self.node_types}
+        self._listeners = []
+        self._callback_ids = []
+
+    ############# CALLBACKS
+
+    @property
+    def installed(self):
+        return bool(self._callback_ids)
+
+    def install(self):
+        if self.installed:
+            return
+        self._callback_ids = [
+            om.MDGMessage.addNodeAddedCallback(self._on_node_added, "dependNode"),
+            om.MDGMessage.addNodeRemovedCallback(self._on_node_removed, "dependNode"),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._on_node_renamed
+            ),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterNew, self._on_scene_changed),
+            om.MSceneMessage.addCallback(om.MSceneMessage.kAfterOpen, self._on_scene_changed),
+        ]
+        self.rebuild()
+
+    def uninstall(self):
+        for callback_id in self._callback_ids:
+            om.MMessage.removeCallback(callback_id)
+        self._callback_ids = []
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    @property
+    def has_listeners(self):
+        return bool(self._listeners)
+
+    def _notify(self, event, node_type=None, row=None):
+        for listener in list(self._listeners):
+            listener(event, node_type, row)
+
+    def _node_type(self, node):
+        node_type = om.MFnDependencyNode(node).typeName
+        return node_type if node_type in self._names else None
+
+    def _on_node_added(self, node, client_data):
+        node_type = self._node_type(node)
+        if node_type:
+            self.add(node_type, om.MFnDependencyNode(node).name())
+
+    def _on_node_removed(self, node, client_data):
+        node_type = self._node_type(node)
+        if node_type:
+            self.remove(node_type, om.MFnDependencyNode(node).name())
+
+    def _on_node_renamed(self, node, previous_name, client_data):
+        node_type = self._node_type(node)
+        if node_type:
+            self.remove(node_type, previous_name)
+            self.add(node_type, om.MFnDependencyNode(node).name())
+
+    def _on_scene_changed(self, client_data):
+        self.rebuild()
+
+    ############# CHANGES
+
+    def rebuild(self):
+        """
+        List every type again, for a new scene or when no callbacks are installed.
+        """
+        self._notify("about_to_reset")
+        for node_type in self.node_types:
+            self._names[node_type] = sorted(cmds.ls(type=node_type) or [])
+        self._notify("reset")
+
+    def add(self, node_type, name):
+        names = self._names[node_type]
+        row = bisect.bisect_left(names, name)
+        if row < len(names) and names[row] == name:
+            return
+        self._notify("about_to_insert", node_type, row)
+        names.insert(row, name)
+        self._notify("inserted", node_type, row)
+
+    def remove(self, node_type, name):
+        row = self.row(node_type, name)
+        if row is None:
+            return
+        self._notify("about_to_remove", node_type, row)
+        del self._names[node_type][row]
+        self._notify("removed", node_type, row)
+
+    ############# QUERIES
+
+    def names(self, node_type):
+        return self._names[node_type]
+
+    def row(self, node_type, name):
+        """
+        Index of `name` in names(node_type), None if it is not listed.
+        """
+        names = self._names.get(node_type, [])
+        row = bisect.bisect_left(names, name)
+        if row < len(names) and names[row] == name:
+            return row
+        return None
+
+    def __len__(self):
+        return sum(len(names) for names in self._names.values())
+
+
+_component_catalog = None
+
+
+def get_component_catalog():
+    """
+    Return the shared ComponentCatalog, installing its callbacks on first use.
+    """
+    global _component_catalog
+    if _component_catalog is None:
+        _component_catalog = ComponentCatalog()
+        _component_catalog.install()
+    return _component_catalog
+
+
+def release_component_catalog():
+    """
+    Remove the callbacks of the shared ComponentCatalog once nothing listens.
+
+    The next get_component_catalog() lists the scene again.
+    """
+    global _component_catalog
+    if _component_catalog is not None and not _component_catalog.has_listeners:
+        _component_catalog.uninstall()
+        _component_catalog = None
+
+
+############################################################
+#################   NAME SEARCH INDEX   ####################
+############################################################
+
+# Characters per n-gram of the substring index
+NGRAM_SIZE = 3
+
+NAME_TOKEN_PATTERN = re.compile(r"[^_:|]+")
+
+# Above this many names per trigram, a substring search scans the sorted names
+SCAN_THRESHOLD = 2000
+
+
+def name_ngrams(name, size=NGRAM_SIZE):
+    return {name[i : i + size] for i in range(len(name) - size + 1)}
+
+
+def name_tokens(name):
+    """
+    Parts of a lower case name between "_", e.g. "za_arm_to_chest_att" ->
+    ["za", "arm", "to", "chest", "att"].
+    """
+    return NAME_TOKEN_PATTERN.findall(name)
+
+
+class NameSearchIndex(object):
+    """
+    Case insensitive search over the names of a ComponentCatalog.
+
+    Keeps sorted lists of the names and of their "_" separated tokens for
+    prefix queries, and a trigram -> names index for substrings anywhere in
+    a name. It listens to the catalog, so it follows the scene one node at a
+    time instead of being rebuilt.
+
+    Matches are ranked: exact name, name prefix, token prefix, then any
+    other substring, alphabetically within each rank.
+    """
+
+    def __init__(self, catalog=None):
+        self.catalog = catalog or get_component_catalog()
+        self._types = {}
+        self._lowers = {}
+        self._lower_names = []
+        self._tokens = []
+        self._ngrams = defaultdict(set)
+        self.catalog.add_listener(self._on_catalog_changed)
+        self.rebuild()
+
+    def close(self):
+        self.catalog.remove_listener(self._on_catalog_changed)
+
+    def _on_catalog_changed(self, event, node_type, row):
+        if event == "inserted":
+            self.add(self.catalog.names(node_type)[row], node_type)
+        elif event == "about_to_remove":
+            self.remove(self.catalog.names(node_type)[row])
+        elif event == "reset":
+            self.rebuild()
+
+    ############# CHANGES
+
+    def rebuild(self):
+        self._types = {}
+        self._lowers = {}
+        self._lower_names = []
+        self._tokens = []
+        self._ngrams = defaultdict(set)
+        for node_type in self.catalog.node_types:
+            for name in self.catalog.names(node_type):
+                self._types[name] = node_type
+                lower = self._lowers[name] = name.lower()
+                self._lower_names.append((lower, name))
+                self._tokens.extend((token, name) for token in name_tokens(lower))
+                for ngram in name_ngrams(lower):
+                    self._ngrams[ngram].add(name)
+        self._lower_names.sort()
+        self._tokens.sort()
+
+    def add(self, name, node_type):
+        if name in self._types:
+            return
+        self._types[name] = node_type
+        lower = self._lowers[name] = name.lower()
+        bisect.insort(self._lower_names, (lower, name))
+        for token in name_tokens(lower):
+            bisect.insort(self._tokens, (token, name))
+        for ngram in name_ngrams(lower):
+            self._ngrams[ngram].add(name)
+
+    def remove(self, name):
+        if self._types.pop(name, None) is None:
+            return
+        lower = self._lowers.pop(name)
+        self._remove_sorted(self._lower_names, (lower, name))
+        for token in name_tokens(lower):
+            self._remove_sorted(self._tokens, (token, name))
+        for ngram in name_ngrams(lower):
+            names = self._ngrams[ngram]
+            names.discard(name)
+            if not names:
+                del self._ngrams[ngram]
+
+    @staticmethod
+    def _remove_sorted(items, item):
+        index = bisect.bisect_left(items, item)
+        if index < len(items) and items[index] == item:
+            del items[index]
+
+    ############# QUERIES
+
+    @staticmethod
+    def _prefixed(items, prefix):
+        # Items of a sorted (key, name) list whose key starts with `prefix`
+        index = bisect.bisect_left(items, (prefix,))
+        while index < len(items) and items[index][0].startswith(prefix):
+            yield items[index][1]
+            index += 1
+
+    def _scan(self, text):
+        # Names in alphabetical order, the caller stops once it has enough
+        for lower, name in self._lower_names:
+            if text in lower:
+                yield name
+
+    def _substring_matches(self, text, limit):
+        if len(text) < NGRAM_SIZE:
+            return self._scan(text)
+        candidates = sorted(
+            (self._ngrams.get(ngram, set()) for ngram in name_ngrams(text)), key=len
+        )
+        if len(candidates[0]) > SCAN_THRESHOLD:
+            # Common trigrams match densely, scanning finds `limit` names sooner
+            return self._scan(text)
+        # Every trigram of the text is in the name, then check the order
+        names = set.intersection(*candidates)
+        return heapq.nsmallest(
+            limit, (name for name in names if text in self._lowers[name])
+        )
+
+    def search(self, text, limit=20):
+        """
+        Names matching `text`, best first.
+
+        Args:
+            text (str): Part of a node name, case insensitive.
+            limit (int): Maximum number of names returned.
+
+        Returns:
+            list: Node names.
+        """
+        text = text.strip().lower()
+        if not text:
+            return []
+        found = []
+        seen = set()
+
+        def collect(names):
+            for name in names:
+                if len(found) >= limit:
+                    return
+                if name not in seen:
+                    seen.add(name)
+                    found.append(name)
+
+        collect(self._prefixed(self._lower_names, text))
+        # The exact name sorts first among the names it prefixes
+        collect(self._prefixed(self._tokens, text))
+        if len(found) < limit:
+            collect(self._substring_matches(text, limit))
+        return found
+
+    def node_type(self, name):
+        return self._types.get(name)
+
+    def __len__(self):
+        return len(self._types)
+
+
+_name_search_index = None
+
+
+def get_name_search_index():
+    """
+    Return the shared NameSearchIndex over get_component_catalog().
+    """
+    global _name_search_index
+    if _name_search_index is None:
+        _name_search_index = NameSearchIndex()
+    return _name_search_index
+
+
+def release_name_search_index():
+    """
+    Stop the shared NameSearchIndex from listening to the catalog.
+    """
+    global _name_search_index
+    if _name_search_index is not None:
+        _name_search_index.close()
+        _name_search_index = None
@@ -0,0 +1,335 @@
+import csv
+import itertools
+import time
+
+import maya.cmds as cmds
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_solver as zsv
+import z_toolbox.common.func_ziva_spatial as zsp
+
+try:
+    import numpy as np
+except ImportError:  # numpy is not shipped with every Maya version
+    np = None
+
+############################################################
+#################   FRAME TIMING   #########################
+############################################################
+
+
+def get_simulated_meshes(solver=None):
+    """
+    Tissue meshes of a solver, the meshes the displacement error is measured on.
+
+    Args:
+        solver (str): Solver to query, the first solver of the scene by default.
+
+    Returns:
+        list: Mesh names, empty if there is no solver or tissue.
+    """
+    solvers = [solver] if solver else zsv.get_solvers()
+    if not solvers:
+        return []
+    try:
+        return cmds.zQuery(solvers[0], type="zTissue", mesh=True) or []
+    except RuntimeError as e:
+        zrt.log.warning("Cannot query the tissues of %s: %s", solvers[0], e)
+        return []
+
+
+def get_frame_range(solver=None):
+    """
+    Frames from the solver start frame to the end of the playback range.
+    """
+    solvers = [solver] if solver else zsv.get_solvers()
+    start = cmds.playbackOptions(query=True, minTime=True)
+    if solvers:
+        start = cmds.getAttr(f"{solvers[0]}.startFrame")
+    end = cmds.playbackOptions(query=True, maxTime=True)
+    return int(start), int(end)
+
+
+class SimulationRun(object):
+    """
+    Per frame evaluation times, and mesh positions, of one simulation.
+
+    Args:
+        settings (dict): Solver attribute values the run was made with.
+    """
+
+    def __init__(self, settings=None):
+        self.settings = dict(settings or {})
+        self.frames = []
+        self.seconds = []
+        # Frame -> (N, 3) array of the sampled mesh points, in mesh order
+        self.positions = {}
+
+    @property
+    def total(self):
+        return sum(self.seconds)
+
+    @property
+    def seconds_per_frame(self):
+        # The start frame only resets the solver, it is not a solved frame
+        solved = self.seconds[1:] or self.seconds
+        return sum(solved) / len(solved) if solved else 0.0
+
+    @property
+    def slowest_frame(self):
+        if not self.seconds:
+            return None
+        return self.frames[self.seconds.index(max(self.seconds))]
+
+
+def _pull_mesh(mesh):
+    if np is None:
+        # Querying a vertex is enough to evaluate the mesh
+        return cmds.pointPosition(f"{mesh}.vtx[0]", world=True)
+    return zsp.read_mesh_points(mesh)
+
+
+def simulation_job(run, start, end, meshes=None, sample=True):
+    """
+    Step the solver frame by frame and time the evaluation of every frame.
+
+    Frames are solved in order from `start`, which should be the solver
+    start frame so the simulation is reset. Reading the points of `meshes`
+    is what pulls the simulation in batch mode, where no viewport evaluates
+    the scene, and is included in the frame time.
+
+    Args:
+        run (SimulationRun): Filled with the timings as the frames are solved.
+        start (int): First frame, usually the solver start frame.
+        end (int): Last frame, included.
+        meshes (list): Simulated meshes, get_simulated_meshes() by default.
+        sample (bool): Keep the mesh points of every frame in the run,
+            needed by displacement_error().
+
+    Returns:
+        zrt.Job: The job, one frame per step.
+    """
+    meshes = get_simulated_meshes() if meshes is None else meshes
+    sample = sample and np is not None
+
+    def steps():
+        for frame in range(int(start), int(end) + 1):
+            frame_start = time.perf_counter()
+            cmds.currentTime(frame, update=True)
+            points = [_pull_mesh(mesh) for mesh in meshes]
+            run.seconds.append(time.perf_counter() - frame_start)
+            run.frames.append(frame)
+            if sample and points:
+                run.positions[frame] = np.concatenate(points)
+            zrt.count("frames simulated")
+            yield f"frame {frame}"
+        zrt.log.info(
+            "Simulated frames %s-%s: %.3fs per frame, slowest frame %s.",
+            start,
+            end,
+            run.seconds_per_frame,
+            run.slowest_frame,
+        )
+
+    return zrt.Job("Simulate", steps(), max(0, int(end) - int(start) + 1))
+
+
+def simulate(start, end, meshes=None, sample=True):
+    """
+    Solve the frames `start` to `end` now, see simulation_job().
+
+    Returns:
+        SimulationRun: The timings, with the positions when `sample` is set.
+    """
+    run = SimulationRun()
+    simulation_job(run, start, end, meshes, sample).run()
+    return run
+
+
+def displacement_error(run, reference):
+    """
+    Distance between the mesh points of `run` and those of `reference`.
+
+    Returns:
+        dict: "max" and "rms" distance over every vertex of the frames both
+        runs sampled, None when they have no frame in common.
+    """
+    frames = [frame for frame in run.frames if frame in reference.positions]
+    frames = [frame for frame in frames if frame in run.positions]
+    if not frames:
+        return None
+    max_error = 0.0
+    squared_sum = 0.0
+    num_points = 0
+    for frame in frames:
+        points = run.positions[frame]
+        reference_points = reference.positions[frame]
+        if points.shape != reference_points.shape:
+            raise ValueError(f"Frame {frame} has a different number of points.")
+        distances = np.linalg.norm(points - reference_points, axis=1)
+        if len(distances):
+            max_error = max(max_error, float(distances.max()))
+            squared_sum += float(np.dot(distances, distances))
+            num_points += len(distances)
+    rms = (squared_sum / num_points) ** 0.5 if num_points else 0.0
+    return {"max": max_error, "rms": rms}
+
+
+############################################################
+#################   SETTINGS SWEEP   #######################
+############################################################
+
+SWEEP_COLUMNS = [
+    "seconds_per_frame",
+    "total_seconds",
+    "slowest_frame",
+    "max_error",
+    "rms_error",
+    "within_tolerance",
+]
+
+
+def settings_grid(**values):
+    """
+    Every combination of solver attribute values.
+
+    Example:
+        settings_grid(substeps=[1, 2, 4], maxNewtonIterations=[2, 5])
+
+    Returns:
+        list: One {attribute: value} dict per combination.
+    """
+    attributes = sorted(values)
+    return [
+        dict(zip(attributes, combination))
+        for combination in itertools.product(*(values[a] for a in attributes))
+    ]
+
+
+def sweep_solver_settings(
+    grid, start, end, reference=None, tolerance=None, meshes=None, solvers=None
+):
+    """
+    Simulate the frame range once per settings of `grid` and compare them.
+
+    The solver values are captured first and restored at the end, also when
+    a run fails.
+
+    Args:
+        grid (list): Solver attribute dicts, see settings_grid().
+        start (int): First frame, usually the solver start frame.
+        end (int): Last frame, included.
+        reference (dict): Settings of the reference run the displacement
+            error is measured against, usually the "final" profile
+            attributes. None skips the error.
+        tolerance (float): Max displacement error of a run within tolerance.
+        meshes (list): Meshes the error is measured on.
+        solvers (list): Solvers the settings are written to, all by default.
+
+    Returns:
+        list: One row per settings, with the settings and SWEEP_COLUMNS.
+    """
+    if reference is not None and np is None:
+        cmds.warning("numpy is not available, the displacement error is skipped.")
+        reference = None
+    meshes = get_simulated_meshes() if meshes is None else meshes
+    writer = zsv.SolverSettingsWriter(solvers)
+    attributes = set(reference or {})
+    for settings in grid:
+        attributes.update(settings)
+    # Every solver is restored to its own values
+    originals = {
+        solver: zsv.SolverSettingsWriter(solver).read(sorted(attributes))
+        for solver in writer.solvers()
+    }
+
+    def run_with(settings):
+        # The grid values are set over the reference, the other attributes
+        # stay the same in every run
+        writer.set_many(dict(reference or {}, **settings))
+        writer.flush()
+        run = simulate(start, end, meshes, sample=reference is not None)
+        run.settings = dict(settings)
+        return run
+
+    rows = []
+    try:
+        reference_run = run_with(reference) if reference is not None else None
+        for index, settings in enumerate(grid):
+            zrt.log.info("Sweep run %d of %d: %s", index + 1, len(grid), settings)
+            run = run_with(settings)
+            row = dict(settings)
+            row["seconds_per_frame"] = run.seconds_per_frame
+            row["total_seconds"] = run.total
+            row["slowest_frame"] = run.slowest_frame
+            error = displacement_error(run, reference_run) if reference_run else None
+            row["max_error"] = error["max"] if error else None
+            row["rms_error"] = error["rms"] if error else None
+            row["within_tolerance"] = (
+                error["max"] <= tolerance
+                if error is not None and tolerance is not None
+                else None
+            )
+            rows.append(row)
+            # Frames of a run are only needed for its error
+            run.positions.clear()
+    finally:
+        for solver, values in originals.items():
+            restore = zsv.SolverSettingsWriter(solver)
+            restore.set_many(values)
+            restore.flush()
+    return rows
+
+
+def cheapest_within_tolerance(rows):
+    """
+    The fastest sweep row within tolerance, None if no row is.
+    """
+    rows = [row for row in rows if row.get("within_tolerance")]
+    return min(rows, key=lambda row: row["seconds_per_frame"], default=None)
+
+
+def _setting_columns(rows):
+    columns = []
+    for row in rows:
+        for column in row:
+            if column not in SWEEP_COLUMNS and column not in columns:
+                columns.append(column)
+    return columns
+
+
+def write_sweep_csv(rows, path):
+    """
+    Write the sweep rows to `path`, the settings first then SWEEP_COLUMNS.
+
+    Returns:
+        str: The path written.
+    """
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.DictWriter(
+            csv_file, fieldnames=_setting_columns(rows) + SWEEP_COLUMNS
+        )
+        writer.writeheader()
+        writer.writerows(rows)
+    zrt.log.info("Sweep written to %s.", path)
+    return path
+
+
+def format_sweep_table(rows):
+    """
+    The sweep rows as a text table, fastest settings first.
+    """
+    columns = _setting_columns(rows)
+    widths = [max(len(column), 8) for column in columns]
+    header = [f"{column:>{width}}" for column, width in zip(columns, widths)]
+    header += [f"{'s/frame':>9}", f"{'max error':>10}", f"{'rms error':>10}", " ok"]
+    lines = [" ".join(header)]
+    for row in sorted(rows, key=lambda row: row["seconds_per_frame"]):
+        cells = [f"{row[column]!s:>{width}}" for column, width in zip(columns, widths)]
+        cells.append(f"{row['seconds_per_frame']:>9.3f}")
+        for column in ("max_error", "rms_error"):
+            value = row[column]
+            cells.append(f"{'-':>10}" if value is None else f"{value:>10.4f}")
+        ok = row["within_tolerance"]
+        cells.append("  -" if ok is None else ("yes" if ok else " no"))
+        lines.append(" ".join(cells))
+    return "\n".join(lines)
@@ -0,0 +1,384 @@
+import json
+import os
+
+import maya.cmds as cmds
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_scene as zsc
+
+############################################################
+#################   SOLVERS   ##############################
+############################################################
+
+# Solver attributes edited from the Solver tab
+SOLVER_ATTRIBUTES = [
+    "collisionDetection",
+    "startFrame",
+    "collisionPointSpacing",
+    "maxNewtonIterations",
+    "substeps",
+    "gravityY",
+]
+
+
+# Float attributes may come back with single precision
+VALUE_TOLERANCE = 1e-6
+
+
+def same_value(a, b):
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return abs(a - b) <= VALUE_TOLERANCE * max(1.0, abs(a), abs(b))
+    return a == b
+
+
+def get_solvers():
+    """
+    Names of the Ziva solvers in the scene.
+
+    Returns:
+        list: The zSolverTransform nodes, or the zSolver shapes when there is
+        no solver transform.
+    """
+    scene = zsc.get_scene_index()
+    return scene.ls("zSolverTransform") or scene.ls("zSolver")
+
+
+def get_selected_solvers():
+    """
+    Names of the selected Ziva solvers, a selected zSolver shape gives its
+    zSolverTransform.
+
+    Returns:
+        list: Solver names in selection order, without duplicates.
+    """
+    solvers = []
+    for node in cmds.ls(selection=True) or []:
+        node_type = cmds.nodeType(node)
+        if node_type == "zSolver":
+            parents = cmds.listRelatives(node, parent=True) or []
+            if parents and cmds.nodeType(parents[0]) == "zSolverTransform":
+                node = parents[0]
+        elif node_type != "zSolverTransform":
+            continue
+        if node not in solvers:
+            solvers.append(node)
+    return solvers
+
+
+############################################################
+#################   SOLVER SETTINGS WRITER   ###############
+############################################################
+
+
+class SolverSettingsWriter(object):
+    """
+    Collect solver attribute edits and write the ones that changed at once.
+
+    set() only records the value, flush() compares the pending values with
+    the solvers and sets the differing attributes in one undo chunk. The UI
+    calls flush() once the edits stop, so dragging a spin box writes the
+    final value once instead of every intermediate one.
+
+    Args:
+        solver (str or list): Solver or solvers to write to, None writes to
+            every solver found by get_solvers() at flush time.
+    """
+
+    def __init__(self, solver=None):
+        self.solver = solver
+        self._pending = {}
+
+    def solvers(self):
+        if self.solver is None:
+            return get_solvers()
+        names = [self.solver] if isinstance(self.solver, str) else self.solver
+        return [name for name in names if cmds.objExists(name)]
+
+    def set(self, attribute, value):
+        self._pending[attribute] = value
+
+    def set_many(self, values):
+        self._pending.update(values)
+
+    @property
+    def pending(self):
+        return dict(self._pending)
+
+    def discard(self):
+        self._pending.clear()
+
+    def read(self, attributes=None):
+        """
+        Current values of the first solver.
+
+        Returns:
+            dict: Attribute -> value, empty if there is no solver.
+        """
+        solvers = self.solvers()
+        if not solvers:
+            return {}
+        values = {}
+        for attribute in attributes or SOLVER_ATTRIBUTES:
+            try:
+                values[attribute] = cmds.getAttr(f"{solvers[0]}.{attribute}")
+            except (RuntimeError, ValueError) as e:
+                zrt.log.debug("Cannot read %s.%s: %s", solvers[0], attribute, e)
+        return values
+
+    def flush(self):
+        """
+        Write the pending values that differ from the solvers.
+
+        Returns:
+            dict: Written plug -> value.
+        """
+        pending = self._pending
+        self._pending = {}
+        if not pending:
+            return {}
+        solvers = self.solvers()
+        if not solvers:
+            cmds.warning("No Ziva solver found in the scene.")
+            return {}
+
+        changes = {}
+        for solver in solvers:
+            for attribute, value in pending.items():
+                plug = f"{solver}.{attribute}"
+                try:
+                    current = cmds.getAttr(plug)
+                except (RuntimeError, ValueError) as e:
+                    zrt.log.warning("Cannot read %s: %s", plug, e)
+                    continue
+                if not same_value(current, value):
+                    changes[plug] = value
+        if not changes:
+            return {}
+
+        with zrt.bulk_operation("Solver Settings", suspend_refresh=False):
+            for plug, value in changes.items():
+                try:
+                    cmds.setAttr(plug, value)
+                    zrt.count("solver attributes set")
+                except RuntimeError as e:
+                    zrt.log.warning("Cannot set %s: %s", plug, e)
+                    zrt.count("solver attributes failed")
+        return changes
+
+
+############################################################
+#################   SOLVER PROFILES   ######################
+############################################################
+
+# Profiles shipped with the toolbox, one .json file per profile
+PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles"
+)
+PROFILE_EXTENSION = ".json"
+
+
+def profile_path(name, directory=None):
+    if os.path.splitext(name)[1] == PROFILE_EXTENSION:
+        return name
+    return os.path.join(directory or PROFILE_DIR, name + PROFILE_EXTENSION)
+
+
+def list_profiles(directory=None):
+    """
+    Names of the solver profiles in `directory`, PROFILE_DIR by default.
+    """
+    directory = directory or PROFILE_DIR
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.splitext(file_name)[0]
+        for file_name in os.listdir(directory)
+        if file_name.endswith(PROFILE_EXTENSION)
+    )
+
+
+def load_profile(name, directory=None):
+    """
+    Read a solver profile.
+
+    A profile file holds the solver attribute values under "attributes", an
+    optional "description", and an optional "reference" profile its quality
+    and speed are compared with.
+
+    Args:
+        name (str): Profile name in `directory`, or the path of a .json file.
+
+    Returns:
+        dict: The profile, with its "name".
+
+    Raises:
+        ValueError: If the file has no "attributes" mapping.
+    """
+    path = profile_path(name, directory)
+    with open(path, "r") as json_file:
+        profile = json.load(json_file)
+    if not isinstance(profile.get("attributes"), dict):
+        raise ValueError(f"Solver profile {path} has no attributes.")
+    profile.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    profile.setdefault("description", "")
+    return profile
+
+
+def save_profile(profile, name=None, directory=None):
+    """
+    Write a solver profile as returned by capture_profile().
+
+    Returns:
+        str: Path of the written file.
+    """
+    name = name or profile["name"]
+    path = profile_path(name, directory)
+    data = dict(profile, name=os.path.splitext(os.path.basename(path))[0])
+    with open(path, "w") as json_file:
+        json.dump(data, json_file, indent=4, sort_keys=True)
+    zrt.log.info("Saved solver profile %s.", path)
+    return path
+
+
+def capture_profile(solver=None, name="captured", attributes=None, description=""):
+    """
+    Profile holding the current values of a solver.
+
+    Args:
+        solver (str): Solver to read, the first solver of the scene by default.
+        attributes (list): Attributes to capture, SOLVER_ATTRIBUTES by default.
+
+    Returns:
+        dict: The profile, empty attributes if there is no solver.
+    """
+    values = SolverSettingsWriter(solver).read(attributes)
+    return {"name": name, "description": description, "attributes": values}
+
+
+def diff_profile(profile, solvers=None):
+    """
+    Attributes of `solvers` that differ from `profile`.
+
+    Args:
+        profile (dict): Profile from load_profile() or capture_profile().
+        solvers (list): Solvers to compare, every solver by default.
+
+    Returns:
+        dict: Solver -> {attribute: (current value, profile value)}, only
+        the solvers with a difference.
+    """
+    differences = {}
+    for solver in SolverSettingsWriter(solvers).solvers():
+        for attribute, value in profile["attributes"].items():
+            try:
+                current = cmds.getAttr(f"{solver}.{attribute}")
+            except (RuntimeError, ValueError) as e:
+                zrt.log.warning("Cannot read %s.%s: %s", solver, attribute, e)
+                continue
+            if not same_value(current, value):
+                differences.setdefault(solver, {})[attribute] = (current, value)
+    return differences
+
+
+def apply_profile(profile, solvers=None):
+    """
+    Write every attribute of `profile` to `solvers` in one undo chunk.
+
+    Only the values that differ are set, see SolverSettingsWriter.flush().
+
+    Args:
+        profile (dict): Profile from load_profile() or capture_profile().
+        solvers (list): Solvers to write to, every solver by default.
+
+    Returns:
+        dict: Written plug -> value.
+    """
+    writer = SolverSettingsWriter(solvers)
+    writer.set_many(profile["attributes"])
+    changes = writer.flush()
+    zrt.log.info(
+        "Applied solver profile %s: %d attributes set on %d solvers.",
+        profile.get("name", ""),
+        len(changes),
+        len({plug.rsplit(".", 1)[0] for plug in changes}),
+    )
+    return changes
+
+
+############# Quality and speed tradeoff
+
+
+def profile_tradeoff(profile, reference):
+    """
+    Estimate what `profile` gains in speed and gives up in accuracy over
+    `reference`.
+
+    The solver work per frame grows with substeps times Newton iterations,
+    and the number of collision points with the inverse square of
+    collisionPointSpacing. These are estimates from the settings only, time
+    the simulation of the shot for real numbers.
+
+    Returns:
+        dict: "speedup" of the solve, "collision_speedup" of the collision
+        points (None when either profile has no collision detection),
+        "time_step" ratio and "spacing" ratio, both above 1 when `profile`
+        is coarser.
+    """
+    values = profile["attributes"]
+    reference_values = reference["attributes"]
+
+    def ratio(attribute, default=1.0):
+        value = float(values.get(attribute, default))
+        reference_value = float(reference_values.get(attribute, default))
+        return reference_value / value if value else 1.0
+
+    substeps = ratio("substeps")
+    newton = ratio("maxNewtonIterations")
+    # Coarser spacing is a larger value, so the ratio is inverted
+    spacing = 1.0 / ratio("collisionPointSpacing")
+    collisions = values.get("collisionDetection") and reference_values.get(
+        "collisionDetection"
+    )
+    return {
+        "profile": profile.get("name", ""),
+        "reference": reference.get("name", ""),
+        "speedup": substeps * newton,
+        "collision_speedup": spacing**2 if collisions else None,
+        "time_step": substeps,
+        "newton_iterations": newton,
+        "spacing": spacing,
+    }
+
+
+def format_tradeoff(tradeoff):
+    lines = [
+        f"{tradeoff['profile']} against {tradeoff['reference']}:",
+        f"  solve ~{tradeoff['speedup']:.1f}x faster"
+        f" ({tradeoff['time_step']:.1f}x longer substeps,"
+        f" {tradeoff['newton_iterations']:.1f}x fewer Newton iterations)",
+    ]
+    if tradeoff["collision_speedup"] is not None:
+        lines.append(
+            f"  ~{tradeoff['collision_speedup']:.0f}x fewer collision points"
+            f" ({tradeoff['spacing']:.1f}x coarser spacing)"
+        )
+    if tradeoff["speedup"] > 1.0 or tradeoff["spacing"] > 1.0:
+        lines.append(
+            "  less accurate: collisions between points may be missed and"
+            " stiff materials may not converge within a frame"
+        )
+    return "\n".join(lines)
+
+
+def report_tradeoff(profile, directory=None):
+    """
+    Log the quality and speed tradeoff of `profile` against its reference.
+
+    Returns:
+        dict: The profile_tradeoff() result, None without a reference.
+    """
+    if not profile.get("reference"):
+        return None
+    reference = load_profile(profile["reference"], directory)
+    tradeoff = profile_tradeoff(profile, reference)
+    zrt.log.info("%s", format_tradeoff(tradeoff))
+    return tradeoff
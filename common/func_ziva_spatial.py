@@ -0,0 +1,666 @@
+import math
+import time
+from collections import defaultdict
+
+import maya.api.OpenMaya as om
+import maya.cmds as cmds
+import z_toolbox.common.func_ziva_runtime as zrt
+
+try:
+    import numpy as np
+except ImportError:  # numpy is not shipped with every Maya version
+    np = None
+
+# Backend used by the attach functions to find vertices by proximity:
+# "ziva" runs cmds.zFindVerticesByProximity, "numpy" uses ProximityEngine.
+PROXIMITY_BACKEND = "ziva"
+
+############################################################
+#################   BROAD-PHASE   ##########################
+############################################################
+
+# Boxes spanning more grid cells than this are kept aside and tested against
+# every query instead of being rasterised into the grid (e.g. a skin tissue
+# wrapping the whole body).
+MAX_CELLS_PER_BOX = 4096
+
+
+def get_world_bounding_box(mesh):
+    """
+    Get the world-space bounding box of a mesh.
+
+    Args:
+        mesh (str): Mesh shape or transform name.
+
+    Returns:
+        tuple: (xmin, ymin, zmin, xmax, ymax, zmax)
+    """
+    return tuple(cmds.exactWorldBoundingBox(mesh))
+
+
+def get_world_bounding_boxes(meshes):
+    """
+    Get the world-space bounding boxes of several meshes in one pass.
+
+    Args:
+        meshes (list): Mesh shape or transform names.
+
+    Returns:
+        dict: Mesh name -> (xmin, ymin, zmin, xmax, ymax, zmax)
+    """
+    return {mesh: get_world_bounding_box(mesh) for mesh in meshes}
+
+
+def inflate_box(box, padding):
+    return (
+        box[0] - padding,
+        box[1] - padding,
+        box[2] - padding,
+        box[3] + padding,
+        box[4] + padding,
+        box[5] + padding,
+    )
+
+
+def boxes_overlap(box_a, box_b):
+    return (
+        box_a[0] <= box_b[3]
+        and box_a[3] >= box_b[0]
+        and box_a[1] <= box_b[4]
+        and box_a[4] >= box_b[1]
+        and box_a[2] <= box_b[5]
+        and box_a[5] >= box_b[2]
+    )
+
+
+class BoxGrid(object):
+    """
+    Uniform grid over axis aligned bounding boxes.
+
+    Each box is registered in every cell it touches, so a query only has to
+    look at the boxes sharing a cell with it instead of at every box.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.cells = defaultdict(list)
+        self.boxes = {}
+        self.oversized = []
+
+    def _cell_range(self, box):
+        size = self.cell_size
+        low = [int(box[i] // size) for i in range(3)]
+        high = [int(box[i + 3] // size) for i in range(3)]
+        return low, high
+
+    def insert(self, key, box):
+        self.boxes[key] = box
+        low, high = self._cell_range(box)
+        num_cells = (
+            (high[0] - low[0] + 1) * (high[1] - low[1] + 1) * (high[2] - low[2] + 1)
+        )
+        if num_cells > MAX_CELLS_PER_BOX:
+            self.oversized.append(key)
+            return
+        for x in range(low[0], high[0] + 1):
+            for y in range(low[1], high[1] + 1):
+                for z in range(low[2], high[2] + 1):
+                    self.cells[(x, y, z)].append(key)
+
+    def query(self, box):
+        """
+        Return the keys of all registered boxes overlapping `box`.
+        """
+        found = set()
+        low, high = self._cell_range(box)
+        num_cells = (
+            (high[0] - low[0] + 1) * (high[1] - low[1] + 1) * (high[2] - low[2] + 1)
+        )
+        if num_cells > MAX_CELLS_PER_BOX:
+            # Cheaper to test everything than to walk a huge cell range
+            candidates = self.boxes.keys()
+        else:
+            candidates = set(self.oversized)
+            for x in range(low[0], high[0] + 1):
+                for y in range(low[1], high[1] + 1):
+                    for z in range(low[2], high[2] + 1):
+                        candidates.update(self.cells.get((x, y, z), ()))
+        for key in candidates:
+            if boxes_overlap(box, self.boxes[key]):
+                found.add(key)
+        return found
+
+
+def _grid_cell_size(boxes, padding):
+    # Average box extent keeps the number of cells per box small
+    extents = [
+        max(box[3] - box[0], box[4] - box[1], box[5] - box[2])
+        for box in boxes.values()
+    ]
+    cell_size = sum(extents) / len(extents) + 2 * padding if extents else 0.0
+    return cell_size if cell_size > 0 else 1.0
+
+
+def find_candidate_pairs(source_boxes, target_boxes, padding):
+    """
+    Find the (source, target) pairs whose bounding boxes are within `padding`
+    of each other.
+
+    Pairs not returned here cannot have any vertex within `padding` of each
+    other, so the proximity query can be skipped for them.
+
+    Args:
+        source_boxes (dict): Mesh name -> world bounding box.
+        target_boxes (dict): Mesh name -> world bounding box.
+        padding (float): Search radius used to inflate the source boxes.
+
+    Returns:
+        set: Candidate (source, target) pairs. A mesh is never paired with itself.
+    """
+    candidate_pairs = set()
+    if not source_boxes or not target_boxes:
+        return candidate_pairs
+
+    grid = BoxGrid(_grid_cell_size(target_boxes, padding))
+    for target, box in target_boxes.items():
+        grid.insert(target, box)
+
+    for source, box in source_boxes.items():
+        for target in grid.query(inflate_box(box, padding)):
+            if target != source:
+                candidate_pairs.add((source, target))
+
+    return candidate_pairs
+
+
+############################################################
+#################   PROXIMITY ENGINE   #####################
+############################################################
+
+# Number of source points tested against their candidate triangles at once,
+# keeps the (point, triangle) pair arrays small enough for dense meshes.
+PROXIMITY_CHUNK_SIZE = 4096
+
+# Average number of grid cells a target triangle may cover before the cells
+# are made larger, bounds the grid memory when a few triangles are long.
+PROXIMITY_MAX_CELLS_PER_TRIANGLE = 8
+
+
+def _get_mesh_fn(mesh):
+    selection_list = om.MSelectionList()
+    selection_list.add(mesh)
+    return om.MFnMesh(selection_list.getDagPath(0))
+
+
+def read_mesh_points(mesh):
+    """
+    Read the world-space vertex positions of a mesh into an (N, 3) array.
+    """
+    points = _get_mesh_fn(mesh).getPoints(om.MSpace.kWorld)
+    return np.ascontiguousarray(np.array(points, dtype=np.float64)[:, :3])
+
+
+def read_mesh_triangles(mesh):
+    """
+    Read the triangulated faces of a mesh into an (T, 3) array of vertex ids.
+    """
+    _, triangle_vertices = _get_mesh_fn(mesh).getTriangles()
+    return np.array(triangle_vertices, dtype=np.int64).reshape(-1, 3)
+
+
+def mesh_volume(points, triangles):
+    """
+    Volume enclosed by a closed triangle mesh.
+
+    Sums the signed volumes of the tetrahedra joining the origin to every
+    triangle, the sign of the result only depends on the winding so the
+    absolute value is returned.
+
+    Args:
+        points (numpy.ndarray): (N, 3) vertex positions.
+        triangles (numpy.ndarray): (T, 3) vertex ids.
+    """
+    a, b, c = (points[triangles[:, i]] for i in range(3))
+    return abs(float(np.einsum("ij,ij->", a, np.cross(b, c)))) / 6.0
+
+
+def read_mesh_volume(mesh):
+    """
+    World-space volume of a closed mesh, see mesh_volume().
+    """
+    return mesh_volume(read_mesh_points(mesh), read_mesh_triangles(mesh))
+
+
+def closest_point_distances(points, a, b, c):
+    """
+    Distance from each point to the matching triangle (a, b, c).
+
+    Vectorised version of the closest point on triangle test from
+    Ericson's "Real-Time Collision Detection", all arrays are (K, 3).
+    """
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+    d1 = np.einsum("ij,ij->i", ab, ap)
+    d2 = np.einsum("ij,ij->i", ac, ap)
+    d3 = np.einsum("ij,ij->i", ab, bp)
+    d4 = np.einsum("ij,ij->i", ac, bp)
+    d5 = np.einsum("ij,ij->i", ab, cp)
+    d6 = np.einsum("ij,ij->i", ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    def ratio(numerator, denominator):
+        # Degenerate triangles give 0 / 0, clamp them onto the first corner
+        safe = np.where(denominator != 0, denominator, 1.0)
+        return np.where(denominator != 0, numerator / safe, 0.0)
+
+    # Face region, degenerate triangles are always caught by an edge or
+    # vertex region below
+    denom = va + vb + vc
+    closest = a + ab * ratio(vb, denom)[:, None] + ac * ratio(vc, denom)[:, None]
+
+    # Regions are applied from the lowest to the highest priority
+    bc_w = ratio(d4 - d3, (d4 - d3) + (d5 - d6))
+    region = (va <= 0) & ((d4 - d3) >= 0) & ((d5 - d6) >= 0)
+    closest = np.where(region[:, None], b + (c - b) * bc_w[:, None], closest)
+
+    ac_w = ratio(d2, d2 - d6)
+    region = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+    closest = np.where(region[:, None], a + ac * ac_w[:, None], closest)
+
+    region = (d6 >= 0) & (d5 <= d6)
+    closest = np.where(region[:, None], c, closest)
+
+    ab_v = ratio(d1, d1 - d3)
+    region = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+    closest = np.where(region[:, None], a + ab * ab_v[:, None], closest)
+
+    region = (d3 >= 0) & (d4 <= d3)
+    closest = np.where(region[:, None], b, closest)
+
+    region = (d1 <= 0) & (d2 <= 0)
+    closest = np.where(region[:, None], a, closest)
+
+    return np.linalg.norm(points - closest, axis=1)
+
+
+def _hash_cells(cells):
+    # Large primes spread the 3d cell coordinates over the int64 range
+    return cells[:, 0] * 73856093 ^ cells[:, 1] * 19349663 ^ cells[:, 2] * 83492791
+
+
+class _TriangleGrid(object):
+    """
+    Sorted spatial hash of triangle boxes, answers "which triangles may be
+    within radius of this position" for many positions at once.
+
+    Every triangle is listed in all the cells its box, inflated by the
+    radius, overlaps. A point then only needs the triangles of its own cell,
+    and a long triangle only adds itself to more cells instead of making the
+    cells of the whole mesh larger. Cells sharing a hash share their
+    triangles, the box test of the caller removes the extra ones.
+    """
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+        extents = (high - low).max(axis=1)
+        self.cell_size = max(float(np.median(extents)), 1e-9)
+        while True:
+            low_cells = np.floor(low / self.cell_size).astype(np.int64)
+            spans = np.floor(high / self.cell_size).astype(np.int64) - low_cells + 1
+            # Float product, a long triangle in small cells overflows int64
+            if spans.prod(axis=1, dtype=float).sum() <= (
+                PROXIMITY_MAX_CELLS_PER_TRIANGLE * len(low)
+            ):
+                break
+            self.cell_size *= 2.0
+        counts = spans.prod(axis=1)
+
+        # One row per (triangle, cell) the triangle covers
+        triangle_ids = np.repeat(np.arange(len(low)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        spans = spans[triangle_ids]
+        steps = np.stack(
+            (
+                offsets % spans[:, 0],
+                offsets // spans[:, 0] % spans[:, 1],
+                offsets // (spans[:, 0] * spans[:, 1]),
+            ),
+            axis=1,
+        )
+        keys = _hash_cells(low_cells[triangle_ids] + steps)
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.triangle_ids = triangle_ids[order]
+
+    def candidates(self, positions):
+        """
+        (point, triangle) pairs whose inflated triangle box holds the point.
+
+        Returns:
+            tuple: Point ids into `positions` and triangle ids, two arrays.
+        """
+        keys = _hash_cells(np.floor(positions / self.cell_size).astype(np.int64))
+        first = np.searchsorted(self.keys, keys, side="left")
+        counts = np.searchsorted(self.keys, keys, side="right") - first
+        point_ids = np.repeat(np.arange(len(positions)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        triangle_ids = self.triangle_ids[np.repeat(first, counts) + offsets]
+        inside = np.all(
+            (positions[point_ids] >= self.low[triangle_ids])
+            & (positions[point_ids] <= self.high[triangle_ids]),
+            axis=1,
+        )
+        return point_ids[inside], triangle_ids[inside]
+
+
+class ProximityEngine(object):
+    """
+    Vectorised replacement for cmds.zFindVerticesByProximity.
+
+    Mesh points and triangles are read once through OpenMaya and cached, so
+    querying many pairs only pays for the Maya round trip once per mesh.
+    A query returns the indices of the source vertices lying within the
+    radius of the target surface, the same vertices Ziva selects.
+    """
+
+    def __init__(self):
+        self._points = {}
+        self._triangles = {}
+        self._results = {}
+
+    def points(self, mesh):
+        if mesh not in self._points:
+            self._points[mesh] = read_mesh_points(mesh)
+        return self._points[mesh]
+
+    def triangles(self, mesh):
+        """
+        World-space triangle corners of a mesh as three (T, 3) arrays.
+        """
+        if mesh not in self._triangles:
+            points = self.points(mesh)
+            ids = read_mesh_triangles(mesh)
+            self._triangles[mesh] = (points[ids[:, 0]], points[ids[:, 1]], points[ids[:, 2]])
+        return self._triangles[mesh]
+
+    def _within_radius(self, points, target, radius):
+        # Boolean mask of the points lying within radius of the target surface
+        a, b, c = self.triangles(target)
+        inside = np.zeros(len(points), dtype=bool)
+        if not len(points) or not len(a):
+            return inside
+
+        # Target bounding box, inflated by the radius
+        target_points = self.points(target)
+        low = target_points.min(axis=0) - radius
+        high = target_points.max(axis=0) + radius
+        candidates = np.flatnonzero(np.all((points >= low) & (points <= high), axis=1))
+
+        grid = _TriangleGrid(
+            np.minimum(np.minimum(a, b), c) - radius,
+            np.maximum(np.maximum(a, b), c) + radius,
+        )
+        for start in range(0, len(candidates), PROXIMITY_CHUNK_SIZE):
+            chunk = candidates[start : start + PROXIMITY_CHUNK_SIZE]
+            chunk_points = points[chunk]
+            point_ids, tri_ids = grid.candidates(chunk_points)
+            if not len(point_ids):
+                continue
+            distances = closest_point_distances(
+                chunk_points[point_ids], a[tri_ids], b[tri_ids], c[tri_ids]
+            )
+            inside[chunk[np.unique(point_ids[distances <= radius])]] = True
+        return inside
+
+    def find_vertices(self, source, target, radius):
+        """
+        Indices of the `source` vertices within `radius` of the `target` surface.
+
+        Returns:
+            numpy.ndarray: Sorted vertex indices.
+        """
+        key = (source, target, radius)
+        if key not in self._results:
+            self.prefetch([(source, target)], radius)
+        return self._results[key]
+
+    def prefetch(self, pairs, radius):
+        """
+        Answer many (source, target) queries in one vectorised pass per target.
+
+        The points of every source queried against the same target are
+        stacked and tested together, results are cached for find_vertices.
+
+        Returns:
+            dict: (source, target) -> vertex indices of the source.
+        """
+        sources_by_target = defaultdict(list)
+        for source, target in pairs:
+            if (source, target, radius) not in self._results:
+                sources_by_target[target].append(source)
+
+        for target, sources in sources_by_target.items():
+            stacked = np.concatenate([self.points(source) for source in sources])
+            inside = self._within_radius(stacked, target, radius)
+            offset = 0
+            for source in sources:
+                count = len(self.points(source))
+                indices = np.flatnonzero(inside[offset : offset + count])
+                self._results[(source, target, radius)] = indices
+                offset += count
+
+        return {pair: self._results[pair + (radius,)] for pair in pairs}
+
+
+def create_proximity_engine():
+    """
+    Return a ProximityEngine when the numpy backend is enabled, None otherwise.
+    """
+    if PROXIMITY_BACKEND != "numpy":
+        return None
+    if np is None:
+        cmds.warning("numpy is not available, using zFindVerticesByProximity.")
+        return None
+    return ProximityEngine()
+
+
+def vertex_components(mesh, indices):
+    """
+    Convert vertex indices to compact "mesh.vtx[a:b]" components for cmds.select.
+    """
+    components = []
+    indices = [int(index) for index in indices]
+    start = 0
+    while start < len(indices):
+        end = start
+        while end + 1 < len(indices) and indices[end + 1] == indices[end] + 1:
+            end += 1
+        if end == start:
+            components.append(f"{mesh}.vtx[{indices[start]}]")
+        else:
+            components.append(f"{mesh}.vtx[{indices[start]}:{indices[end]}]")
+        start = end + 1
+    return components
+
+
+def vertex_indices(components):
+    """
+    Convert vertex components (e.g. the zFindVerticesByProximity result) to indices.
+    """
+    flat = cmds.ls(components or [], flatten=True) or []
+    return sorted(int(vertex.rsplit("[", 1)[-1][:-1]) for vertex in flat)
+
+
+def find_vertices_by_proximity(source_mesh, target_mesh, radius, engine=None):
+    """
+    Vertices of `source_mesh` within `radius` of `target_mesh`.
+
+    Uses the numpy engine when one is given, zFindVerticesByProximity otherwise.
+    Both return components that can be selected to create an attachment.
+    """
+    if engine is None:
+        return cmds.zFindVerticesByProximity(source_mesh, target_mesh, r=radius)
+    return vertex_components(
+        source_mesh, engine.find_vertices(source_mesh, target_mesh, radius)
+    )
+
+
+def benchmark_proximity(pairs, radius):
+    """
+    Compare ProximityEngine against zFindVerticesByProximity on mesh pairs.
+
+    Args:
+        pairs (list): (source, target) mesh pairs.
+        radius (float): Search radius.
+
+    Returns:
+        dict: Timings in seconds and the pairs whose vertices differ.
+    """
+    start = time.perf_counter()
+    ziva_results = {
+        (source, target): vertex_indices(
+            cmds.zFindVerticesByProximity(source, target, r=radius)
+        )
+        for source, target in pairs
+    }
+    ziva_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine = ProximityEngine()
+    engine_results = engine.prefetch(pairs, radius)
+    numpy_time = time.perf_counter() - start
+
+    mismatches = [
+        pair for pair in pairs if ziva_results[pair] != engine_results[pair].tolist()
+    ]
+    zrt.log.info(
+        "zFindVerticesByProximity: %.3fs, ProximityEngine: %.3fs "
+        "(%d pairs, %d mismatching).",
+        ziva_time,
+        numpy_time,
+        len(pairs),
+        len(mismatches),
+    )
+    return {"ziva": ziva_time, "numpy": numpy_time, "mismatches": mismatches}
+
+
+def benchmark_proximity_on_synthetic_meshes(num_pairs=10, subdivisions=40, radius=0.1):
+    """
+    Build pairs of overlapping spheres and run benchmark_proximity on them.
+
+    The spheres are deleted afterwards, each pair needs Ziva to be loaded.
+    """
+    group = cmds.group(empty=True, name="proximity_benchmark_grp")
+    pairs = []
+    try:
+        for i in range(num_pairs):
+            source = cmds.polySphere(
+                r=1.0, sx=subdivisions, sy=subdivisions, ch=False
+            )[0]
+            target = cmds.polyCube(
+                w=1.5, h=1.5, d=1.5, sx=subdivisions, sy=subdivisions, sz=subdivisions, ch=False
+            )[0]
+            cmds.move(i * 4.0, 0, 0, source)
+            cmds.move(i * 4.0 + 1.2, 0.1 * i, 0, target)
+            cmds.parent(source, target, group)
+            source_shape = cmds.listRelatives(f"{group}|{source}", shapes=True, fullPath=True)[0]
+            target_shape = cmds.listRelatives(f"{group}|{target}", shapes=True, fullPath=True)[0]
+            pairs.append((source_shape, target_shape))
+        return benchmark_proximity(pairs, radius)
+    finally:
+        cmds.delete(group)
+
+
+############################################################
+#################   RIVET PLANNER   ########################
+############################################################
+
+
+def box_distance(box, position):
+    """
+    Distance from a position to a bounding box, 0 inside the box.
+
+    It is a lower bound of the distance to anything inside the box.
+    """
+    dx = max(box[0] - position[0], 0.0, position[0] - box[3])
+    dy = max(box[1] - position[1], 0.0, position[1] - box[4])
+    dz = max(box[2] - position[2], 0.0, position[2] - box[5])
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+class BoneSurfaces(object):
+    """
+    One cached MFnMesh and world bounding box per bone mesh.
+
+    Closest bone queries visit the bones by increasing bounding box distance
+    and stop as soon as a box is further than the best surface hit, so most
+    bones never reach getClosestPoint.
+    """
+
+    def __init__(self, bone_meshes):
+        self.bones = [
+            (bone, _get_mesh_fn(bone), get_world_bounding_box(bone))
+            for bone in bone_meshes
+        ]
+
+    def closest(self, position):
+        """
+        Return the bone whose surface is closest to `position`, None without bones.
+        """
+        point = om.MPoint(position[0], position[1], position[2])
+        ordered = sorted(
+            (box_distance(box, position), bone, mesh_fn)
+            for bone, mesh_fn, box in self.bones
+        )
+        closest_bone = None
+        min_distance = float("inf")
+        for lower_bound, bone, mesh_fn in ordered:
+            if lower_bound >= min_distance:
+                break
+            surface_point = mesh_fn.getClosestPoint(point, om.MSpace.kWorld)[0]
+            distance = surface_point.distanceTo(point)
+            if distance < min_distance:
+                min_distance = distance
+                closest_bone = bone
+        return closest_bone
+
+
+def read_curve_cvs(curve):
+    """
+    CV component names and world positions of a curve, read in one pass.
+
+    Returns:
+        list: (cv, (x, y, z)) tuples in CV order.
+    """
+    cvs = cmds.ls(curve + ".cv[*]", flatten=True) or []
+    if not cvs:
+        return []
+    flat = cmds.xform(curve + ".cv[*]", query=True, worldSpace=True, translation=True)
+    positions = [tuple(flat[i : i + 3]) for i in range(0, len(flat), 3)]
+    return list(zip(cvs, positions))
+
+
+def plan_rivets(curves, bone_meshes):
+    """
+    Assign every CV of the curves to its closest bone before any rivet is made.
+
+    Args:
+        curves (list): Line of action curves.
+        bone_meshes (list): Bone meshes the CVs can be riveted to.
+
+    Returns:
+        list: (cv, bone) tuples in curve and CV order, bone is None when
+        there are no bones.
+    """
+    bones = BoneSurfaces(bone_meshes)
+    plan = []
+    for curve in curves:
+        for cv, position in read_curve_cvs(curve):
+            plan.append((cv, bones.closest(position)))
+    return plan
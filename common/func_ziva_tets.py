@@ -0,0 +1,377 @@
+import math
+
+import maya.cmds as cmds
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_scene as zsc
+import z_toolbox.common.func_ziva_spatial as zsp
+
+############################################################
+#################   TET COUNT ESTIMATE   ###################
+############################################################
+
+# Volume of a regular tetrahedron with unit edges, tetSize is the edge length
+TET_VOLUME = 1.0 / (6.0 * math.sqrt(2.0))
+
+# Output attributes holding the tet count of a zTet, the first one the node
+# has is read
+TET_COUNT_ATTRIBUTES = ["numTets", "tetCount"]
+
+
+def estimate_tet_count(volume, tet_size, calibration=1.0):
+    """
+    Tets needed to fill `volume` with tets of edge `tet_size`.
+
+    Args:
+        calibration (float): Actual over estimated count of a previous
+            rebuild, see calibrate_tet_estimate().
+    """
+    if tet_size <= 0:
+        return float("inf")
+    return calibration * volume / (TET_VOLUME * tet_size**3)
+
+
+def read_tet_count(ztet):
+    """
+    Tet count of a built zTet, None if the node has no count attribute.
+    """
+    for attribute in TET_COUNT_ATTRIBUTES:
+        if cmds.attributeQuery(attribute, node=ztet, exists=True):
+            return cmds.getAttr(f"{ztet}.{attribute}")
+    return None
+
+
+############################################################
+#################   ZTET INDEX   ###########################
+############################################################
+
+
+def _ztet_targets(nodes):
+    # Meshes under the nodes, each once, and the zTets given directly
+    scene = zsc.get_scene_index()
+    meshes = {}
+    ztets = []
+    for node in nodes:
+        node_type = cmds.objectType(node)
+        if node_type == "transform":
+            for mesh in scene.descendants(node, "mesh") or []:
+                meshes[mesh] = None
+        elif node_type == "mesh":
+            meshes[cmds.ls(node, long=True)[0]] = None
+        elif node_type == "zTet":
+            ztets.append(node)
+        else:
+            zrt.log.debug(
+                "Skipping selection: %s. It is neither a group nor a mesh.", node
+            )
+            zrt.count("objects skipped")
+    return list(meshes), ztets
+
+
+def _unique_ztets(ztets, seen):
+    unique = []
+    for ztet in ztets:
+        if "Orig" in ztet or ztet in seen:
+            continue  # Skip Orig mesh
+        seen.add(ztet)
+        unique.append(ztet)
+    return unique
+
+
+def find_ztets(nodes):
+    """
+    The zTets of groups, meshes and zTets, each zTet once.
+
+    Every mesh under the groups is listed once, also when a group and its
+    children are both given, and one zQuery reads the zTets of all of them
+    instead of walking the history of every mesh.
+
+    Args:
+        nodes (list): Groups, meshes or zTets.
+
+    Returns:
+        list: zTet names.
+    """
+    meshes, ztets = _ztet_targets(nodes)
+    if meshes:
+        try:
+            ztets = ztets + (cmds.zQuery(meshes, type="zTet") or [])
+        except RuntimeError as e:
+            zrt.log.debug("No zTet on the meshes: %s", e)
+    return _unique_ztets(ztets, set())
+
+
+def map_ztets(nodes):
+    """
+    Like find_ztets(), by mesh.
+
+    Returns:
+        dict: Mesh -> zTets, in the order found, each zTet under its first
+        mesh. zTets given directly are under None.
+    """
+    scene = zsc.get_scene_index()
+    meshes, ztets = _ztet_targets(nodes)
+    seen = set()
+    ztet_map = {}
+    if ztets:
+        ztet_map[None] = _unique_ztets(ztets, seen)
+    for mesh in meshes:
+        try:
+            mesh_ztets = _unique_ztets(scene.zquery(mesh, type="zTet") or [], seen)
+        except RuntimeError as e:
+            zrt.log.debug("No zTet on %s: %s", mesh, e)
+            continue
+        if mesh_ztets:
+            ztet_map[mesh] = mesh_ztets
+    return ztet_map
+
+
+def read_tet_sizes(ztets):
+    """
+    tetSize of every zTet, the unreadable ones are left out with a warning.
+    """
+    sizes = {}
+    for ztet in ztets:
+        try:
+            sizes[ztet] = cmds.getAttr(f"{ztet}.tetSize")
+        except (RuntimeError, ValueError) as e:
+            zrt.log.warning("Error reading zTet size for '%s': %s", ztet, e)
+            zrt.count("zTets failed")
+    return sizes
+
+
+def write_tet_sizes(sizes):
+    """
+    Set the tetSize of every zTet, call inside a bulk_operation().
+    """
+    for ztet, size in sizes.items():
+        try:
+            cmds.setAttr(f"{ztet}.tetSize", size)
+            zrt.log.debug("Set zTet size of '%s' to %s.", ztet, round(size, 5))
+            zrt.count("zTets adjusted")
+        except (RuntimeError, ValueError) as e:
+            zrt.log.warning("Error modifying zTet size for '%s': %s", ztet, e)
+            zrt.count("zTets failed")
+
+
+def collect_tissue_tets(nodes=None):
+    """
+    The zTets of the selected groups and meshes, with their mesh.
+
+    Args:
+        nodes (list): Groups or meshes, the selection by default.
+
+    Returns:
+        list: (mesh, zTet) pairs, each zTet once.
+    """
+    nodes = cmds.ls(selection=True) if nodes is None else nodes
+    if not nodes:
+        zrt.log.warning("Nothing selected. Please select an object or a group.")
+        return []
+    ztet_map = map_ztets(nodes)
+    # The volume needs the mesh of the zTet
+    ztet_map.pop(None, None)
+    return [(mesh, ztet) for mesh, ztets in ztet_map.items() for ztet in ztets]
+
+
+############################################################
+#################   TET BUDGET PLANNER   ###################
+############################################################
+
+
+def budget_for_frame_time(target_seconds, measured_seconds, measured_tets):
+    """
+    Tet budget for `target_seconds` per frame.
+
+    The solve time is taken as proportional to the tet count, measured with
+    a timed run of the current tets, see func_ziva_simulation.simulate().
+    """
+    if measured_seconds <= 0:
+        raise ValueError("The measured seconds per frame must be positive.")
+    return measured_tets * target_seconds / measured_seconds
+
+
+def share_budget(budget, rows, solver_rows):
+    """
+    Part of a solver-wide `budget` left to `rows`.
+
+    The tissues of `solver_rows` that are not in `rows` keep their tets, see
+    budget_for_frame_time() for a budget measured on the whole solver.
+
+    Args:
+        rows (list): read_tet_plan() rows of the tissues to plan.
+        solver_rows (list): read_tet_plan() rows of every tissue solved.
+    """
+    planned = {row["ztet"] for row in rows}
+    kept = sum(row["tets"] for row in solver_rows if row["ztet"] not in planned)
+    return budget - kept
+
+
+def read_tet_plan(pairs, calibration=1.0):
+    """
+    Volume, tetSize and estimated tet count of every zTet.
+
+    Returns:
+        list: One row per zTet with "ztet", "mesh", "volume", "tet_size" and
+        "tets", the zTets of open or unreadable meshes are left out.
+    """
+    if zsp.np is None:
+        cmds.warning("numpy is not available, the tet budget needs it.")
+        return []
+    rows = []
+    volumes = {}
+    for mesh, ztet in pairs:
+        try:
+            if mesh not in volumes:
+                volumes[mesh] = zsp.read_mesh_volume(mesh)
+            tet_size = cmds.getAttr(f"{ztet}.tetSize")
+        except (RuntimeError, ValueError) as e:
+            zrt.log.warning("Cannot read %s of %s: %s", ztet, mesh, e)
+            zrt.count("zTets failed")
+            continue
+        volume = volumes[mesh]
+        if volume <= 0:
+            zrt.log.warning("%s has no volume, is it closed?", mesh)
+            zrt.count("zTets failed")
+            continue
+        rows.append(
+            {
+                "ztet": ztet,
+                "mesh": mesh,
+                "volume": volume,
+                "tet_size": tet_size,
+                "tets": estimate_tet_count(volume, tet_size, calibration),
+            }
+        )
+    return rows
+
+
+def plan_tet_budget(
+    rows, budget, uniform=False, min_size=None, max_size=None, calibration=1.0
+):
+    """
+    Solve for the tetSize of every zTet so their tets add up to `budget`.
+
+    By default every tetSize is scaled by the same factor, which keeps the
+    resolution ratios already set between tissues. `uniform` gives every
+    tissue the same tetSize instead. The sizes clamped to `min_size` or
+    `max_size` are fixed and the rest of the budget is shared by the others.
+
+    Args:
+        rows (list): read_tet_plan() rows, updated in place.
+        budget (float): Total tet count to reach.
+
+    Returns:
+        list: The rows, with "planned_size" and "planned_tets".
+    """
+    if budget <= 0:
+        raise ValueError("The tet budget must be positive.")
+    # Tets of each row at its base size, the planned size is base * scale
+    bases = {}
+    for row in rows:
+        base_size = 1.0 if uniform else row["tet_size"]
+        bases[row["ztet"]] = (
+            base_size,
+            estimate_tet_count(row["volume"], base_size, calibration),
+        )
+
+    free = list(rows)
+    fixed_tets = 0.0
+    while free:
+        free_budget = budget - fixed_tets
+        free_tets = sum(bases[row["ztet"]][1] for row in free)
+        scale = (free_tets / free_budget) ** (1.0 / 3.0) if free_budget > 0 else None
+        clamped = []
+        for row in free:
+            base_size = bases[row["ztet"]][0]
+            size = base_size * scale if scale else max_size
+            if size is None:
+                # Nothing left for these tissues and no largest size to use
+                size = row["tet_size"]
+            elif min_size is not None and size < min_size:
+                size = min_size
+            elif max_size is not None and size > max_size:
+                size = max_size
+            else:
+                row["planned_size"] = size
+                continue
+            row["planned_size"] = size
+            clamped.append(row)
+        if not clamped or scale is None:
+            break
+        for row in clamped:
+            free.remove(row)
+            fixed_tets += estimate_tet_count(
+                row["volume"], row["planned_size"], calibration
+            )
+
+    for row in rows:
+        row["planned_tets"] = estimate_tet_count(
+            row["volume"], row["planned_size"], calibration
+        )
+    total = sum(row["planned_tets"] for row in rows)
+    if rows and abs(total - budget) > 0.01 * budget:
+        zrt.log.warning(
+            "The tet size limits give %d tets for a budget of %d.", total, budget
+        )
+    return rows
+
+
+@zrt.bulk_operation("Apply zTet Budget")
+def apply_tet_plan(rows):
+    """
+    Set the planned tetSize of every zTet in one undo chunk.
+    """
+    write_tet_sizes({row["ztet"]: row["planned_size"] for row in rows})
+    return rows
+
+
+def compare_tet_counts(rows):
+    """
+    Read the tet count of every zTet rebuilt by apply_tet_plan().
+
+    Reading the count is what rebuilds the tets, this can take a while.
+
+    Returns:
+        list: The rows, with "actual" None when the count is not readable.
+    """
+    for row in rows:
+        try:
+            row["actual"] = read_tet_count(row["ztet"])
+        except (RuntimeError, ValueError) as e:
+            zrt.log.warning("Cannot read the tet count of %s: %s", row["ztet"], e)
+            row["actual"] = None
+    return rows
+
+
+def calibrate_tet_estimate(rows):
+    """
+    Actual over planned tet count, the calibration of the next plans.
+
+    Returns:
+        float: The ratio, None when no actual count was read.
+    """
+    rows = [row for row in rows if row.get("actual")]
+    planned = sum(row["planned_tets"] for row in rows)
+    if not planned:
+        return None
+    return sum(row["actual"] for row in rows) / planned
+
+
+def format_tet_plan(rows):
+    lines = [
+        f"{'zTet':<32} {'tetSize':>9} {'planned':>9} {'tets':>9}"
+        f" {'planned':>9} {'actual':>9}"
+    ]
+    for row in rows:
+        actual = row.get("actual")
+        lines.append(
+            f"{row['ztet']:<32} {row['tet_size']:>9.4f}"
+            f" {row.get('planned_size', row['tet_size']):>9.4f}"
+            f" {row['tets']:>9.0f} {row.get('planned_tets', row['tets']):>9.0f}"
+            f" {'-' if actual is None else actual:>9}"
+        )
+    lines.append(
+        f"{'total':<32} {'':>9} {'':>9} {sum(row['tets'] for row in rows):>9.0f}"
+        f" {sum(row.get('planned_tets', row['tets']) for row in rows):>9.0f}"
+    )
+    return "\n".join(lines)
@@ -1,8 +1,12 @@
 import maya.cmds as cmds
 import maya.OpenMayaUI as omui
-import zBuilder.zMaya as zMaya
 from PySide2 import QtCore, QtGui, QtWidgets
 
+import z_toolbox.common.func_ziva_runtime as zrt
+
+# Only needed to rename the Ziva nodes, imported when that runs
+zMaya = zrt.lazy_import("zBuilder.zMaya")
+
 
 def maya_main_window():
     main_window_ptr = omui.MQtUtil.mainWindow()
@@ -1,8 +1,17 @@
-path = cmds.internalVar(usd=True)
-script_path = f"{path}/z_toolbox/ziva_UI_auto_v2.py"  # Replace this with the actual path to your Python script
-# Read the content of the script file
-with open(script_path, 'r') as file:
-    script_content = file.read()
-
-# Execute the script using the exec function
-exec(script_content)
+import sys
+import time
+
+import maya.cmds as cmds
+
+start_time = time.perf_counter()
+path = cmds.internalVar(usd=True)  # The z_toolbox folder is in this scripts directory
+if path not in sys.path:
+    sys.path.append(path)
+
+# Import the UI as a module so its bytecode is compiled once and cached,
+# pymel and zBuilder are only imported when a tool needs them
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.ziva_UI_auto_v2 as ziva_ui
+
+ziva_ui.show()
+zrt.log.info("Ziva Toolbox opened in %.2fs.", time.perf_counter() - start_time)
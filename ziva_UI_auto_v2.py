@@ -1,8 +1,19 @@
+import os
+import time
+from collections import deque
 from functools import partial
 from importlib import reload
 
+import maya.cmds as cmds
 import maya.OpenMayaUI as omui
 import z_toolbox.common.func_ziva_auto as zi
+import z_toolbox.common.func_ziva_browser as zbr
+import z_toolbox.common.func_ziva_profiler as zprof
+import z_toolbox.common.func_ziva_runtime as zrt
+import z_toolbox.common.func_ziva_scene as zsc
+import z_toolbox.common.func_ziva_simulation as zsim
+import z_toolbox.common.func_ziva_solver as zsv
+import z_toolbox.common.func_ziva_tets as ztet
 import z_toolbox.common.func_ziva_validator as valid
 from maya.app.general.mayaMixin import MayaQWidgetDockableMixin
 from PySide2 import QtCore, QtGui, QtWidgets
@@ -10,6 +21,9 @@ from shiboken2 import wrapInstance
 
 # reload(zi)
 
+# Milliseconds without a Solver tab edit before the changes are written
+SOLVER_WRITE_DELAY = 250
+
 
 class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -25,10 +39,175 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         self.setWindowTitle("[          Ziva Toolbox V2          ]")
         self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
         self.left_buttons_widgets = []  # Define the attribute here
+        # Shared by the Panel browser and the zAttachment dropdown, see get_component_model()
+        self.component_model = None
+        # Tab page -> method building its layout, see add_lazy_tab()
+        self._tab_builders = {}
+        # Slow populators run one per event loop pass once Maya is idle
+        self._idle_jobs = deque()
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.setInterval(0)
+        self._idle_timer.timeout.connect(self.run_idle_job)
+        # Long operations run a slice per event loop pass, see start_job()
+        self.job = None
+        self._job_timer = QtCore.QTimer(self)
+        self._job_timer.setInterval(0)
+        self._job_timer.timeout.connect(self.run_job_slice)
+        # Solver edits are written once they stop for SOLVER_WRITE_DELAY ms
+        self.solver_writer = zsv.SolverSettingsWriter()
+        self.solver_writer_follows_selection = False
+        self.simulation_run = None
+        self.simulation_meshes = []
+        # Tet budget plan of the selected tissues, and the actual / estimated
+        # tet count of the last rebuild
+        self.tet_plan = []
+        self.tet_calibration = 1.0
+        self._solver_timer = QtCore.QTimer(self)
+        self._solver_timer.setSingleShot(True)
+        self._solver_timer.setInterval(SOLVER_WRITE_DELAY)
+        self._solver_timer.timeout.connect(self.flush_solver_settings)
         self.create_widgets()  # Call create_widgets() before create_layout()
         self.create_layout()
         self.create_connections()
 
+    ############# LAZY TABS
+
+    def add_lazy_tab(self, tab_widget, builder, label):
+        """
+        Add an empty tab whose widgets are only built when it is first shown.
+
+        Args:
+            tab_widget (QtWidgets.QTabWidget): The tab widget to add the tab to.
+            builder (callable): Creates the widgets and connections of the tab
+                and returns its layout.
+            label (str): The tab label.
+        """
+        page = QtWidgets.QWidget()
+        self._tab_builders[page] = builder
+        tab_widget.addTab(page, label)
+        return page
+
+    def build_tab(self, tab_widget, index):
+        page = tab_widget.widget(index)
+        builder = self._tab_builders.pop(page, None)
+        if builder is None:
+            return
+        start = time.perf_counter()
+        page.setLayout(builder())
+        zrt.log.debug(
+            "Built the %s tab in %.3fs.",
+            tab_widget.tabText(index),
+            time.perf_counter() - start,
+        )
+
+    def connect_lazy_tabs(self, tab_widget):
+        tab_widget.currentChanged.connect(partial(self.build_tab, tab_widget))
+        # The visible tab is needed straight away
+        self.build_tab(tab_widget, tab_widget.currentIndex())
+
+    ############# COMPONENT MODEL
+
+    def get_component_model(self):
+        """
+        The Ziva nodes of the scene, listed once when first needed.
+        """
+        if self.component_model is None:
+            start = time.perf_counter()
+            self.component_model = zbr.ComponentModel(parent=self)
+            zrt.log.debug("Listed %d Ziva nodes in %.3fs.", len(self.component_model.catalog), time.perf_counter() - start)
+        return self.component_model
+
+    def close_component_model(self):
+        # Stop the scene callbacks from updating a closed window
+        if self.component_model is not None:
+            self.component_model.close()
+            zsc.release_name_search_index()
+            zsc.release_component_catalog()
+
+    def closeEvent(self, event):
+        self.cancel_job()
+        self.flush_solver_settings()
+        self.close_component_model()
+        super(Window, self).closeEvent(event)
+
+    def dockCloseEventTriggered(self):
+        self.cancel_job()
+        self.flush_solver_settings()
+        self.close_component_model()
+
+    ############# IDLE JOBS
+
+    def defer(self, job):
+        """
+        Run `job` once Maya is idle, e.g. a populator that reads files.
+        """
+        self._idle_jobs.append(job)
+        if not self._idle_timer.isActive():
+            self._idle_timer.start()
+
+    def run_idle_job(self):
+        # One job per pass so the UI keeps responding between them
+        if self._idle_jobs:
+            job = self._idle_jobs.popleft()
+            try:
+                job()
+            except Exception as e:
+                zrt.log.warning("Deferred UI job %s failed. Error: %s", job.__name__, e)
+        if not self._idle_jobs:
+            self._idle_timer.stop()
+
+    ############# JOBS
+
+    def start_job(self, job):
+        """
+        Run a zrt.Job in slices with a progress bar and a Cancel button.
+
+        Args:
+            job (zrt.Job): The job, None when the operation had nothing to do.
+        """
+        if job is None:
+            return
+        if self.job is not None and not self.job.finished:
+            cmds.warning(f"{self.job.name} is still running.")
+            return
+        self.job = job
+        self.job_progress_bar.setRange(0, max(1, job.total))
+        self.job_progress_bar.setValue(0)
+        self.job_progress_bar.setVisible(True)
+        self.job_cancel_button.setVisible(True)
+        self.job_cancel_button.setEnabled(True)
+        self.update_job_progress()
+        self._job_timer.start()
+
+    def run_job_slice(self):
+        try:
+            running = self.job.run_slice()
+        except Exception as e:
+            zrt.log.warning("%s stopped. Error: %s", self.job.name, e)
+            self.job.cancel()
+            running = False
+        self.update_job_progress()
+        if not running:
+            self._job_timer.stop()
+            self.job_progress_bar.setVisible(False)
+            self.job_cancel_button.setVisible(False)
+
+    def update_job_progress(self):
+        job = self.job
+        self.job_progress_bar.setValue(job.done)
+        eta = job.eta()
+        eta_text = f", {eta:.0f}s left" if eta is not None else ""
+        self.job_progress_bar.setFormat(f"{job.name} %v/%m{eta_text}")
+        self.job_progress_bar.setToolTip(job.label)
+
+    def cancel_job(self):
+        # The job stops between two items, the ones done are kept
+        if self.job is not None and not self.job.finished:
+            self.job.cancel()
+            self.run_job_slice()
+
+    ############# CREATE WIDGETS
+
     def create_widgets(self):
         self.left_buttons = [
             "Create Bones",
@@ -45,17 +224,6 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             "FibreLOA Remap",
             "Create Materials",
         ]
-        self.label_attachments = QtWidgets.QLabel(":::::::::::::::::::::::::::::::::::::::::::::: Create zAttachments")
-        self.constraint_button = QtWidgets.QPushButton("Create Attachment")
-        self.constraint_button.setToolTip(
-            "Create Attachment from selected Object \nMake sure that 2 objects (tissue or bone) are selected \nUse the sliding or fixed radio button \nto change th properties of the attachments"
-        )
-        # Add radio buttons
-        self.sliding_radio = QtWidgets.QRadioButton("Sliding")
-        self.fixed_radio = QtWidgets.QRadioButton("Fixed")
-
-        # Set the default value
-        self.sliding_radio.setChecked(True)
 
         self.delete_component_button = QtWidgets.QPushButton(
             "Delete Component")
@@ -63,6 +231,9 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             "Delete attributes selected from the \ndropdown menu of a selected objects (mesh)"
         )
 
+        self.delete_dry_run_checkbox = QtWidgets.QCheckBox("Dry Run")
+        self.delete_dry_run_checkbox.setToolTip("Only list what would be deleted in the Script Editor")
+
         self.component_dropdown = QtWidgets.QComboBox()
         self.component_dropdown.addItems(
             [
@@ -78,62 +249,6 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             ]
         )
 
-        # Components Tab Layout #################################
-
-        self.label_tet_info = QtWidgets.QLabel(" ::::::::::::::::::::::::::::::::::::::: Reduce / Increase zTet size")
-
-        # self.apply_tissue_percentage_button = QtWidgets.QPushButton("Apply Tissue %")
-        self.increase_button = QtWidgets.QPushButton(" + ")
-        self.reduce_button = QtWidgets.QPushButton(" - ")
-        self.slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
-        self.slider.setMinimum(1)
-        self.slider.setMaximum(100)
-        self.slider.setSingleStep(1)
-        self.slider.setTickInterval(10)
-        self.slider.setTickPosition(QtWidgets.QSlider.TicksBelow)
-
-        self.slider_label = QtWidgets.QLabel("Slider Value: 1%")  # Initial text
-        self.tissue_label = QtWidgets.QLabel("Tissue")
-        self.bones_label = QtWidgets.QLabel("Bones")
-        # Connect the slider valueChanged signal to the update_slider_label method
-        self.slider.valueChanged.connect(self.update_slider_label)
-
-
-        self.label_zattach_drive = QtWidgets.QLabel(" :::::::::::::::::::::::::::: Create zAttach by Driver => Driven")
-        self.zattach_parent_child_button = QtWidgets.QPushButton(
-            "zAttach Parent->Child"
-        )
-        self.zattach_parent_child_button.setToolTip(
-            "Create attachments for any number of even selected objects \nIn each number the odd number is the parent and even \nis the child \nFor example (if 4 tissues are selected , \nfirst would be parent of the second tissue \nand third would be parent of forth tissue) \n --  Bones will be connected automatically on selected tissues"
-        )
-
-        self.sliding_radio_par = QtWidgets.QRadioButton("Sliding")
-        self.fixed_radio_par = QtWidgets.QRadioButton("Fixed")
-        self.sliding_radio_par.setChecked(True)
-
-        self.zattach_all_objects_button = QtWidgets.QPushButton(
-            "zAttach All Objects")
-
-        self.create_sets_button = QtWidgets.QPushButton("Create Sets")
-        self.create_sets_dropdown = QtWidgets.QComboBox()
-        self.create_sets_dropdown.addItems(
-            [
-                "Set zBone",
-                "Set zTissue",
-                "Set zFiber",
-                "Set zAttachment",
-                "Set zRivet",
-                "Set zCloth",
-                "Set zLoa",
-                "Set Bone Mesh",
-                "Set Tissue Mesh",
-                "Set LOA Curves",
-            ]
-        )
-        self.blendshape = QtWidgets.QPushButton("Create Blendshape")
-        self.duplicate = QtWidgets.QPushButton("Create Duplicate")
-        self.mirror = QtWidgets.QPushButton("Create Mirror")
-        self.mirror_lr = QtWidgets.QPushButton("Mirror L -> R")
         self.left_buttons_widgets = []
         self.right_buttons_widgets = []
 
@@ -145,92 +260,16 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             button = QtWidgets.QPushButton(name)
             self.right_buttons_widgets.append(button)
 
-
-        # New widgets for Refresh and Apply
-        self.refresh_button = QtWidgets.QPushButton("Refresh")
-        self.dropdown = QtWidgets.QComboBox()
-        self.textbox1 = QtWidgets.QDoubleSpinBox()
-        self.textbox1.setDecimals(5)
-        self.textbox1.setMinimum(0)
-        self.textbox1.setMaximum(10)
-        self.textbox1.setSingleStep(0.01)
-        self.textbox1.setValue(0.05)
-        self.textbox2 = QtWidgets.QDoubleSpinBox()
-        self.textbox2.setDecimals(5)
-        self.textbox2.setMinimum(0)
-        self.textbox2.setMaximum(10)
-        self.textbox2.setSingleStep(0.01)
-        self.textbox2.setValue(1.0)
-
-        self.apply_button = QtWidgets.QPushButton("zProximity Paint Apply")
         self.validate_button = QtWidgets.QPushButton("Validate Scene File")
-        self.paint_button = QtWidgets.QPushButton("Paint Weight Tool")
-        self.smooth_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
-        # Set slider properties
-        self.smooth_slider.setRange(1, 200)
-        self.smooth_slider.setValue(1)
-        self.smooth_spin_box = QtWidgets.QSpinBox()
-        self.smooth_spin_box.setMaximum(200)
-        self.smooth_apply_button = QtWidgets.QPushButton("Apply Paint Smooth")
-        self.randomize_clr_button = QtWidgets.QPushButton("Randomize Color")
-
-        # Create widgets for solvers
-        self.start_frame_label = QtWidgets.QLabel("Start Frame:")
-        self.start_frame_spinbox = QtWidgets.QSpinBox()
-        self.start_frame_spinbox.setRange(-1000, 1000)
-        self.start_frame_spinbox.setValue(1)
-
-        self.collision_space_label = QtWidgets.QLabel("Collision Space:")
-        self.collision_space_lineedit = QtWidgets.QLineEdit()
-        self.collision_space_lineedit.setValidator(
-            QtGui.QDoubleValidator(0.1, 0.002, 3)
-        )
-        self.collision_space_lineedit.setText("0.1")
-
-        self.newton_iteration_label = QtWidgets.QLabel("Newton Iterations:")
-        self.newton_iteration_spinbox = QtWidgets.QSpinBox()
-        self.newton_iteration_spinbox.setRange(1, 100)
-        self.newton_iteration_spinbox.setValue(1)
-
-        self.substeps_label = QtWidgets.QLabel("Substeps:")
-        self.substeps_spinbox = QtWidgets.QSpinBox()
-        self.substeps_spinbox.setRange(1, 10)
-        self.substeps_spinbox.setValue(1)
-
-        self.gravity_label = QtWidgets.QLabel("Gravity:")
-        self.gravity_spinbox = QtWidgets.QDoubleSpinBox()
-        self.gravity_spinbox.setRange(-10.0, 10.0)
-        self.gravity_spinbox.setValue(9.78)
 
-        self.collision_checkbox = QtWidgets.QCheckBox("Collision Detection")
-        self.collision_checkbox.setChecked(False)
+        # Progress of the running job, hidden while there is none
+        self.job_progress_bar = QtWidgets.QProgressBar()
+        self.job_progress_bar.setVisible(False)
+        self.job_cancel_button = QtWidgets.QPushButton("Cancel")
+        self.job_cancel_button.setVisible(False)
 
-        # solver settings preset
-        self.function_combo_box = QtWidgets.QComboBox()
-        self.function_combo_box.addItem("Def-Solver Fascia Settings")
-        self.function_combo_box.addItem("Def-Solver Settings")
-        self.function_combo_box.addItem("Def-Materials Fascia Settings")
-
-        self.update_button = QtWidgets.QPushButton("Update")
-        self.complist_dropdown = QtWidgets.QComboBox()
-        self.transfer_button = QtWidgets.QPushButton("Transfer Mesh")
-
-
-        # Create list boxes for listing components
-        self.listbox_zattachments = QtWidgets.QListWidget()
-        self.listbox_zmaterials = QtWidgets.QListWidget()
-        self.listbox_ztet = QtWidgets.QListWidget()
-        self.listbox_ztissue = QtWidgets.QListWidget()
-        self.listbox_zbone = QtWidgets.QListWidget()  # New list box for zFiber components
-        self.listbox_zfiber = QtWidgets.QListWidget()
-        self.listbox_zcloth = QtWidgets.QListWidget()
-        self.listbox_zloa = QtWidgets.QListWidget()  # New list box for zFiber components
-
-        self.refresh_listboxes_button = QtWidgets.QPushButton("Refresh")
-        # Enable the "Refresh" button by default
-        self.refresh_listboxes_button.setEnabled(True)
-        # Populate list boxes initially
-        #self.refresh_comp_listboxes()
+        # The widgets of the other tabs are created by their build_*_tab()
+        # method the first time the tab is shown
 
 
     ############# CREATE LAYOUTS
@@ -238,6 +277,9 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
 
     def create_layout(self):
         main_grid_lay = QtWidgets.QGridLayout()
+        # Search box for the Ziva nodes above everything
+        self.search_box = zbr.ComponentSearchBox(parent=self)
+        main_grid_lay.addWidget(self.search_box, 0, 0, 1, 2)
         # Add the Validate button on top
         main_grid_lay.addWidget(self.validate_button, 1, 0, 1, 2)
 
@@ -260,10 +302,72 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         tab1_comp_widget = QtWidgets.QWidget()
         tab1_comp_widget.setLayout(tab1_comp_grid_layout)
         self.main_tab_widget.addTab(tab1_comp_widget, "CREATE")
+        self.add_lazy_tab(self.main_tab_widget, self.build_show_tab, "SHOW")
 
         # Setup TabWidget with mainLay Layout
         main_grid_lay.addWidget(self.main_tab_widget, len(self.left_buttons) + 2, 0, 1, 2)
 
+        # Job progress under the CREATE buttons
+        main_grid_lay.addWidget(self.job_progress_bar, len(self.left_buttons) + 3, 0)
+        main_grid_lay.addWidget(self.job_cancel_button, len(self.left_buttons) + 3, 1)
+
+        # Delete Component in mainLay Layout
+        main_grid_lay.addWidget(self.delete_component_button,len(self.left_buttons) + 4, 0)
+        delete_component_layout = QtWidgets.QHBoxLayout()
+        delete_component_layout.addWidget(self.component_dropdown)
+        delete_component_layout.addWidget(self.delete_dry_run_checkbox)
+        main_grid_lay.addLayout(delete_component_layout, len(self.left_buttons) + 4, 1)
+
+        #============= COMPONENT TAB LAYOUT
+
+        # Creating tabs
+        self.tab_widget = QtWidgets.QTabWidget()
+        self.add_lazy_tab(self.tab_widget, self.build_edits_tab, "Edits")
+        self.add_lazy_tab(self.tab_widget, self.build_panel_tab, "Panel")
+        self.add_lazy_tab(self.tab_widget, self.build_general_tab, "General")
+        self.add_lazy_tab(self.tab_widget, self.build_utils_tab, "Utils")
+        self.add_lazy_tab(self.tab_widget, self.build_solver_tab, "Solver")
+        self.add_lazy_tab(self.tab_widget, self.build_profile_tab, "Profile")
+
+        # Setup TabWidget with mainLay Layout
+        main_grid_lay.addWidget(self.tab_widget , len(self.left_buttons) + 5, 0, 1, 2)
+
+        ##########################################################################
+        # style buttons for ui style
+        self.style_dropdown = QtWidgets.QComboBox(self)
+        self.style_load_button = QtWidgets.QPushButton("Load Style", self)
+        main_grid_lay.addWidget(self.style_dropdown, len(self.left_buttons) + 6, 0)
+        main_grid_lay.addWidget(self.style_load_button, len(self.left_buttons) + 6, 1)
+        self.style_load_button.clicked.connect(self.load_style)
+        ##########################################################################
+
+        #spacer to align everything on top
+        spacer_item = QtWidgets.QSpacerItem(20, 50, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        main_grid_lay.addItem(spacer_item, len(self.left_buttons) + 7, 0, 1, 2)
+        # main_grid_lay.addLayout(comp_tab1_layout , 2 , 0 , 1 , 2)
+        self.setLayout(main_grid_lay)
+
+    ############# CREATE CONNECTIONS
+
+    def create_connections(self):
+        for button in self.left_buttons_widgets + self.right_buttons_widgets:
+            button.clicked.connect(self.on_button_click)
+        self.delete_component_button.clicked.connect(
+            lambda: zi.delete_component_action(
+                self.component_dropdown.currentText(),
+                dry_run=self.delete_dry_run_checkbox.isChecked())
+        )
+        self.validate_button.clicked.connect(lambda: valid.run_check_points_ui())
+        self.job_cancel_button.clicked.connect(self.cancel_job)
+
+        self.connect_lazy_tabs(self.main_tab_widget)
+        self.connect_lazy_tabs(self.tab_widget)
+        # Reading the style folder can wait until the dock is up
+        self.defer(self.populate_style_dropdown)
+
+    ############# TAB BUILDERS
+
+    def build_show_tab(self):
         # Creating tabs for checkboxes
         tab1_checkboxes_grid_layout = QtWidgets.QGridLayout()
 
@@ -298,86 +402,72 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding
         )
         tab1_checkboxes_grid_layout.addItem(tab1_checkboxes_spacer_item, len(self.left_buttons) + 1, 0, 1, 2)
-        tab2_comp_widget = QtWidgets.QWidget()
-        tab2_comp_widget.setLayout(tab1_checkboxes_grid_layout)
-        self.main_tab_widget.addTab(tab2_comp_widget, "SHOW")
-
-
-        #=============================================================
+        return tab1_checkboxes_grid_layout
 
-        # # Creating tabs for checkboxes
-        # self.checkboxes_tab_widget = QtWidgets.QTabWidget()
-        # self.checkboxes_tab_widget.setStyleSheet("font-weight: bold; color: darkblue; border: 2px ridge #darkgrey; border-radius: 4px 4px 4px 4px; text-shadow: 1px 1px 2px #000000;")
-
-        # # Creating tabs for checkboxes
-        # tab1_checkboxes_grid_layout = QtWidgets.QGridLayout()
-
-
-        # #Create checkboxes functions
-        # checkbox_to_function = {
-        #     "zTet": "zSolver1Shape.showTetMeshes",
-        #     "zTissues": self.toggle_zivatissue,
-        #     "zFibers": "zSolver1Shape.showMuscleFibers",
-        #     "zConstraints": "zSolver1Shape.showAttachments",
-        #     "zSstaticStrain": "zSolver1Shape.showAttachments",
-        #     "zSolver": "zSolver1.enable",
-        #     "zCollide": "zSolver1Shape.showCollisions",
-        # }
-
-        # checkboxes_layout = QtWidgets.QGridLayout()
-        # checkboxes_layout.setRowMinimumHeight(0, 20)
-
-        # for i, (checkbox_name, action) in enumerate(checkbox_to_function.items()):
-        #     checkbox = QtWidgets.QCheckBox(checkbox_name)
-        #     checkbox.setChecked(True)
-        #     # Connect to the class method
-        #     checkbox.stateChanged.connect(
-        #         partial(self.on_checkbox_state_changed, action)
-        #     )
-        #     checkboxes_layout.addWidget(
-        #         checkbox, i // 2, i % 2, QtCore.Qt.AlignTop)
-
-        # tab1_checkboxes_grid_layout.addLayout(checkboxes_layout, len(
-        #     self.left_buttons) + 0, 0, 1, 2)
-
-        # tab1_checkboxes_grid_layout.addWidget(self.label_attachments , len(self.left_buttons) + 2 , 0 , 1 , 2)
-        # # Add the checkboxes to the comp_tab1_layout
-        # tab1_checkboxes_grid_layout.addWidget(self.sliding_radio, len(self.left_buttons) + 3, 0)
-        # tab1_checkboxes_grid_layout.addWidget(self.fixed_radio, len(self.left_buttons) + 3, 1)
-
-        # tab1_checkboxes_grid_layout.addWidget(self.constraint_button, len(self.left_buttons) + 4, 0)
+    def build_edits_tab(self):
+        self.label_attachments = QtWidgets.QLabel(":::::::::::::::::::::::::::::::::::::::::::::: Create zAttachments")
+        self.constraint_button = QtWidgets.QPushButton("Create Attachment")
+        self.constraint_button.setToolTip(
+            "Create Attachment from selected Object \nMake sure that 2 objects (tissue or bone) are selected \nUse the sliding or fixed radio button \nto change th properties of the attachments"
+        )
+        # Add radio buttons
+        self.sliding_radio = QtWidgets.QRadioButton("Sliding")
+        self.fixed_radio = QtWidgets.QRadioButton("Fixed")
 
-        # self.spin_box = QtWidgets.QDoubleSpinBox()
-        # self.spin_box.setDecimals(3)  # Set decimals to 3 places
-        # self.spin_box.setMinimum(0)
-        # self.spin_box.setMaximum(10)
-        # self.spin_box.setSingleStep(0.01)
-        # self.spin_box.setValue(0.25)  # Set the default value to 0.25
+        # Set the default value
+        self.sliding_radio.setChecked(True)
 
-        # tab1_checkboxes_grid_layout.addWidget(self.spin_box, len(self.left_buttons) + 4, 1)
+        self.label_tet_info = QtWidgets.QLabel(" ::::::::::::::::::::::::::::::::::::::: Reduce / Increase zTet size")
 
+        # self.apply_tissue_percentage_button = QtWidgets.QPushButton("Apply Tissue %")
+        self.increase_button = QtWidgets.QPushButton(" + ")
+        self.reduce_button = QtWidgets.QPushButton(" - ")
+        self.slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        self.slider.setMinimum(1)
+        self.slider.setMaximum(100)
+        self.slider.setSingleStep(1)
+        self.slider.setTickInterval(10)
+        self.slider.setTickPosition(QtWidgets.QSlider.TicksBelow)
 
-        # # Add tab1_layout to the first tab
-        # tab1_checkboxes_widget = QtWidgets.QWidget()
-        # tab1_checkboxes_widget.setLayout(tab1_checkboxes_grid_layout)
-        # self.checkboxes_tab_widget.addTab(tab1_checkboxes_widget, "VISUAL AND ATTACHMENTS")
-        
+        self.slider_label = QtWidgets.QLabel("Slider Value: 1%")  # Initial text
+        self.tissue_label = QtWidgets.QLabel("Tissue")
+        self.bones_label = QtWidgets.QLabel("Bones")
 
-        # # Setup TabWidget with mainLay Layout
-        # main_grid_lay.addWidget(self.checkboxes_tab_widget, len(self.left_buttons) + 3, 0, 1, 2)
+        self.label_zattach_drive = QtWidgets.QLabel(" :::::::::::::::::::::::::::: Create zAttach by Driver => Driven")
+        self.zattach_parent_child_button = QtWidgets.QPushButton(
+            "zAttach Parent->Child"
+        )
+        self.zattach_parent_child_button.setToolTip(
+            "Create attachments for any number of even selected objects \nIn each number the odd number is the parent and even \nis the child \nFor example (if 4 tissues are selected , \nfirst would be parent of the second tissue \nand third would be parent of forth tissue) \n --  Bones will be connected automatically on selected tissues"
+        )
 
-        #=============================================================
+        self.sliding_radio_par = QtWidgets.QRadioButton("Sliding")
+        self.fixed_radio_par = QtWidgets.QRadioButton("Fixed")
+        self.sliding_radio_par.setChecked(True)
 
-        # Delete Component in mainLay Layout
-        main_grid_lay.addWidget(self.delete_component_button,len(self.left_buttons) + 4, 0)
-        main_grid_lay.addWidget(self.component_dropdown, len(self.left_buttons) + 4, 1)
+        self.zattach_all_objects_button = QtWidgets.QPushButton(
+            "zAttach All Objects")
 
-        #============= COMPONENT TAB LAYOUT
+        # New widgets for Refresh and Apply
+        self.refresh_button = QtWidgets.QPushButton("Refresh")
+        self.dropdown = QtWidgets.QComboBox()
+        # zAttachments of the selected mesh, the model is built on the first Refresh
+        self.dropdown_proxy = None
+        self.textbox1 = QtWidgets.QDoubleSpinBox()
+        self.textbox1.setDecimals(5)
+        self.textbox1.setMinimum(0)
+        self.textbox1.setMaximum(10)
+        self.textbox1.setSingleStep(0.01)
+        self.textbox1.setValue(0.05)
+        self.textbox2 = QtWidgets.QDoubleSpinBox()
+        self.textbox2.setDecimals(5)
+        self.textbox2.setMinimum(0)
+        self.textbox2.setMaximum(10)
+        self.textbox2.setSingleStep(0.01)
+        self.textbox2.setValue(1.0)
 
-        # Creating tabs
-        self.tab_widget = QtWidgets.QTabWidget()
+        self.apply_button = QtWidgets.QPushButton("zProximity Paint Apply")
 
-        #============= Tab 1
         tab1_layout = QtWidgets.QGridLayout()
         # ... (add other widgets to tab1_layout as needed)
         tab1_layout.addWidget(self.label_attachments , len(self.left_buttons) + 1 , 0 , 1 , 2)
@@ -420,163 +510,48 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         qh_spinbox_layout = QtWidgets.QHBoxLayout()
         self.spin_box_tissue = QtWidgets.QDoubleSpinBox()
         self.spin_box_tissue.setDecimals(3)
-        self.spin_box_tissue.setMinimum(0)
-        self.spin_box_tissue.setMaximum(10)
-        self.spin_box_tissue.setSingleStep(0.01)
-        self.spin_box_tissue.setValue(0.1)
-        qh_spinbox_layout.addWidget(self.spin_box_tissue)
-
-        self.spin_box_bone = QtWidgets.QDoubleSpinBox()
-        self.spin_box_bone.setDecimals(3)
-        self.spin_box_bone.setMinimum(0)
-        self.spin_box_bone.setMaximum(10)
-        self.spin_box_bone.setSingleStep(0.01)
-        self.spin_box_bone.setValue(0.25)
-        qh_spinbox_layout.addWidget(self.spin_box_bone)
-
-        tab1_layout.addLayout(qh_spinbox_layout, len(self.left_buttons) + 9, 0, alignment=QtCore.Qt.AlignTop)
-        # Add QHLayout with two radio button
-        qh_radio_layout = QtWidgets.QHBoxLayout()
-        qh_radio_layout.addWidget(self.sliding_radio_par)
-        qh_radio_layout.addWidget(self.fixed_radio_par)
-        tab1_layout.addLayout(qh_radio_layout, len(self.left_buttons) + 9, 1, alignment=QtCore.Qt.AlignTop)
-        tab1_layout.addWidget(self.zattach_parent_child_button, len(self.left_buttons) + 10, 0)
-
-        qv_button_layout = QtWidgets.QVBoxLayout()
-        qv_button_layout.addWidget(self.zattach_all_objects_button)
-        tab1_layout.addLayout(qv_button_layout, len(self.left_buttons) + 10, 1, alignment=QtCore.Qt.AlignTop)
-
-        # Add Refresh button and dropdown
-        tab1_layout.addWidget(self.refresh_button, len(self.left_buttons) + 11, 0)
-        tab1_layout.addWidget(self.dropdown, len(self.left_buttons) + 11, 1)
-
-        # Add numeric textboxes and Apply button
-        tab1_layout.addWidget(self.textbox1, len(self.left_buttons) + 12, 0)
-        tab1_layout.addWidget(self.textbox2, len(self.left_buttons) + 12, 1)
-        tab1_layout.addWidget(self.apply_button, len(self.left_buttons) + 13, 0, 1, 2)
-        tab1_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        tab1_layout.addItem(tab1_layout_spacer_item, len(self.left_buttons) + 14, 0, 1, 2)
-
-        # Add tab1_layout to the first tab
-        tab1_widget = QtWidgets.QWidget()
-        tab1_widget.setLayout(tab1_layout)
-        self.tab_widget.addTab(tab1_widget, "Edits")
-
-        #============= Tab panel
-        tab_panel_grid_layout = QtWidgets.QGridLayout()
-        tab_panel_grid_layout.addWidget(self.refresh_listboxes_button , 1 , 0)
-        panel_qvlayout = QtWidgets.QVBoxLayout()
-        panel_qvlayout.addWidget(self.listbox_zattachments)
-        panel_qvlayout.addWidget(self.listbox_zmaterials)
-        panel_qvlayout.addWidget(self.listbox_zfiber)
-        panel_qvlayout.addWidget(self.listbox_zbone)
-        panel_qvlayout.addWidget(self.listbox_zloa)
-        panel_qvlayout.addWidget(self.listbox_zcloth)
-        panel_qvlayout.addWidget(self.listbox_ztet)
-        panel_qvlayout.addWidget(self.listbox_ztissue)
-        tab_panel_grid_layout.addLayout(panel_qvlayout , 2 , 0)
-
-        # Add tab2_layout to the second tab
-        tab_panel_widget = QtWidgets.QWidget()
-        tab_panel_widget.setLayout(tab_panel_grid_layout)
-        self.tab_widget.addTab(tab_panel_widget, "Panel")
-
-        #============= Tab 2
-
-        tab2_layout = QtWidgets.QGridLayout()
-        # Add create_sets_layout to the second tab
-        self.create_sets_layout = QtWidgets.QHBoxLayout()
-        self.create_sets_layout.addWidget(self.create_sets_button, alignment=QtCore.Qt.AlignTop)
-        self.create_sets_layout.addWidget(self.create_sets_dropdown)
-        tab2_layout.addLayout(self.create_sets_layout, 1, 0, 1, 2, alignment=QtCore.Qt.AlignTop)
-        tab2_layout.addWidget(self.blendshape, 2, 0)
-        tab2_layout.addWidget(self.duplicate, 2, 1)
-        tab2_layout.addWidget(self.smooth_slider, 3, 0)
-        tab2_layout.addWidget(self.smooth_spin_box, 3, 1)
-        tab2_layout.addWidget(self.paint_button, 4, 0)
-        tab2_layout.addWidget(self.smooth_apply_button, 4, 1)
-        tab2_layout.addWidget(self.randomize_clr_button, 5, 0)
-        tab2_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        tab2_layout.addItem(tab2_layout_spacer_item, 6, 0, 1, 2)
-
-        # Add tab2_layout to the second tab
-        tab2_widget = QtWidgets.QWidget()
-        tab2_widget.setLayout(tab2_layout)
-        self.tab_widget.addTab(tab2_widget, "General")
-
-        # Tab 3
-        tab3_layout = QtWidgets.QGridLayout()
-
-        self.create_utils_layout = QtWidgets.QHBoxLayout()
-        self.create_utils_layout.addWidget(self.mirror_lr)
-        self.create_utils_layout.addWidget(self.mirror)
-        tab3_layout.addLayout(self.create_utils_layout, 1, 0, 1, 2)
-        tab3_layout.addWidget(self.complist_dropdown, 2, 0, 1, 2)
-        tab3_layout.addWidget(self.update_button, 3, 0)
-        tab3_layout.addWidget(self.transfer_button, 3, 1)
-        tab3_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum,QtWidgets.QSizePolicy.Expanding)
-        tab3_layout.addItem(tab3_layout_spacer_item, 4, 0, 1, 2)
-
-        # Add tab3_layout to the third tab
-        tab3_widget = QtWidgets.QWidget()
-        tab3_widget.setLayout(tab3_layout)
-        self.tab_widget.addTab(tab3_widget, "Utils")
-
-        # Tab 3
-        tab4_layout = QtWidgets.QGridLayout()
-        tab4_layout.addWidget(self.collision_checkbox, 0, 0)
-        tab4_layout.addWidget(self.start_frame_label, 1, 0)
-        tab4_layout.addWidget(self.start_frame_spinbox, 1, 1)
-        tab4_layout.addWidget(self.collision_space_label, 2, 0)
-        tab4_layout.addWidget(self.collision_space_lineedit, 2, 1)
-        tab4_layout.addWidget(self.newton_iteration_label, 3, 0)
-        tab4_layout.addWidget(self.newton_iteration_spinbox, 3, 1)
-        tab4_layout.addWidget(self.substeps_label, 4, 0)
-        tab4_layout.addWidget(self.substeps_spinbox, 4, 1)
-        tab4_layout.addWidget(self.gravity_label, 5, 0)
-        tab4_layout.addWidget(self.gravity_spinbox, 5, 1)
-        tab4_layout.addWidget(self.function_combo_box, 7, 0, 1, 2)
-
-        tab4_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        tab4_layout.addItem(tab4_layout_spacer_item, 8, 0, 1, 2)
+        self.spin_box_tissue.setMinimum(0)
+        self.spin_box_tissue.setMaximum(10)
+        self.spin_box_tissue.setSingleStep(0.01)
+        self.spin_box_tissue.setValue(0.1)
+        qh_spinbox_layout.addWidget(self.spin_box_tissue)
 
-        # Add tab3_layout to the third tab
-        tab4_widget = QtWidgets.QWidget()
-        tab4_widget.setLayout(tab4_layout)
-        self.tab_widget.addTab(tab4_widget, "Solver")
+        self.spin_box_bone = QtWidgets.QDoubleSpinBox()
+        self.spin_box_bone.setDecimals(3)
+        self.spin_box_bone.setMinimum(0)
+        self.spin_box_bone.setMaximum(10)
+        self.spin_box_bone.setSingleStep(0.01)
+        self.spin_box_bone.setValue(0.25)
+        qh_spinbox_layout.addWidget(self.spin_box_bone)
 
-        # Setup TabWidget with mainLay Layout
-        main_grid_lay.addWidget(self.tab_widget , len(self.left_buttons) + 5, 0, 1, 2)
+        tab1_layout.addLayout(qh_spinbox_layout, len(self.left_buttons) + 9, 0, alignment=QtCore.Qt.AlignTop)
+        # Add QHLayout with two radio button
+        qh_radio_layout = QtWidgets.QHBoxLayout()
+        qh_radio_layout.addWidget(self.sliding_radio_par)
+        qh_radio_layout.addWidget(self.fixed_radio_par)
+        tab1_layout.addLayout(qh_radio_layout, len(self.left_buttons) + 9, 1, alignment=QtCore.Qt.AlignTop)
+        tab1_layout.addWidget(self.zattach_parent_child_button, len(self.left_buttons) + 10, 0)
 
-        ##########################################################################
-        # style buttons for ui style
-        self.style_dropdown = QtWidgets.QComboBox(self)
-        self.style_load_button = QtWidgets.QPushButton("Load Style", self)
-        main_grid_lay.addWidget(self.style_dropdown, len(self.left_buttons) + 6, 0)
-        main_grid_lay.addWidget(self.style_load_button, len(self.left_buttons) + 6, 1)
-        self.style_load_button.clicked.connect(self.load_style)
-        ##########################################################################
+        qv_button_layout = QtWidgets.QVBoxLayout()
+        qv_button_layout.addWidget(self.zattach_all_objects_button)
+        tab1_layout.addLayout(qv_button_layout, len(self.left_buttons) + 10, 1, alignment=QtCore.Qt.AlignTop)
 
-        #spacer to align everything on top
-        spacer_item = QtWidgets.QSpacerItem(20, 50, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
-        main_grid_lay.addItem(spacer_item, len(self.left_buttons) + 7, 0, 1, 2)
-        # main_grid_lay.addLayout(comp_tab1_layout , 2 , 0 , 1 , 2)
-        self.setLayout(main_grid_lay)
+        # Add Refresh button and dropdown
+        tab1_layout.addWidget(self.refresh_button, len(self.left_buttons) + 11, 0)
+        tab1_layout.addWidget(self.dropdown, len(self.left_buttons) + 11, 1)
 
-    ############# CREATE CONNECTIONS 
+        # Add numeric textboxes and Apply button
+        tab1_layout.addWidget(self.textbox1, len(self.left_buttons) + 12, 0)
+        tab1_layout.addWidget(self.textbox2, len(self.left_buttons) + 12, 1)
+        tab1_layout.addWidget(self.apply_button, len(self.left_buttons) + 13, 0, 1, 2)
+        tab1_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        tab1_layout.addItem(tab1_layout_spacer_item, len(self.left_buttons) + 14, 0, 1, 2)
 
-    def create_connections(self):
-        for button in self.left_buttons_widgets + self.right_buttons_widgets:
-            button.clicked.connect(self.on_button_click)
         self.constraint_button.clicked.connect(
             lambda: zi.create_ziva_attachment(
                 self.spin_box.value(), self.get_radio_value()
             )
         )
-        self.delete_component_button.clicked.connect(
-            lambda: zi.delete_component_action(
-                self.component_dropdown.currentText())
-        )
         self.zattach_parent_child_button.clicked.connect(
             lambda: zi.create_zattachments_for_selected(
                 self.spin_box_tissue.value(),
@@ -585,9 +560,9 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             )
         )
         self.zattach_all_objects_button.clicked.connect(
-            lambda: zi.zattach_all_objects_button_one_time(
+            lambda: self.start_job(zi.zattach_all_objects_one_time_job(
                 self.spin_box_tissue.value(), self.spin_box_bone.value()
-            )
+            ))
         )
         # self.apply_tissue_percentage_button.clicked.connect(lambda: zi.modify_ztet_size(self.slider.value()))
         self.increase_button.clicked.connect(
@@ -596,12 +571,8 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         self.reduce_button.clicked.connect(
             lambda: zi.change_ztet_size(-((self.slider.value())))
         )
-        self.create_sets_button.clicked.connect(self.create_sets_action)
-        # self.create_sets_dropdown.currentIndexChanged.connect(self.on_create_sets_index_changed)
-        self.blendshape.clicked.connect(lambda: zi.create_blendshape())
-        self.duplicate.clicked.connect(lambda: zi.create_duplicate_clean_mesh())
-        self.mirror.clicked.connect(lambda: zi.create_zMirror())
-        self.mirror_lr.clicked.connect(lambda: zi.create_zMirror_lr())
+        # Connect the slider valueChanged signal to the update_slider_label method
+        self.slider.valueChanged.connect(self.update_slider_label)
 
         # Connect the clicked signals of radio buttons to the print_radio_values function
         self.sliding_radio.clicked.connect(
@@ -620,44 +591,258 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             self.select_object_from_dropdown)
         # Connect Apply button to a function
         self.apply_button.clicked.connect(lambda: zi.apply_zpaint_attachments(self.textbox1.value(), self.textbox2.value()))
-        self.validate_button.clicked.connect(lambda: valid.run_check_points_ui())
+        return tab1_layout
+
+    def build_panel_tab(self):
+        # Browser of every Ziva node in the scene, kept up to date by callbacks
+        self.component_browser = zbr.ComponentBrowser(self.get_component_model())
+        tab_panel_grid_layout = QtWidgets.QGridLayout()
+        tab_panel_grid_layout.addWidget(self.component_browser, 0, 0)
+        return tab_panel_grid_layout
+
+    def build_general_tab(self):
+        self.create_sets_button = QtWidgets.QPushButton("Create Sets")
+        self.create_sets_dropdown = QtWidgets.QComboBox()
+        self.create_sets_dropdown.addItems(
+            [
+                "Set zBone",
+                "Set zTissue",
+                "Set zFiber",
+                "Set zAttachment",
+                "Set zRivet",
+                "Set zCloth",
+                "Set zLoa",
+                "Set Bone Mesh",
+                "Set Tissue Mesh",
+                "Set LOA Curves",
+            ]
+        )
+        self.sync_sets_checkbox = QtWidgets.QCheckBox("Sync")
+        self.sync_sets_checkbox.setToolTip("Also remove the set members that no longer match the scene")
+        self.live_sets_checkbox = QtWidgets.QCheckBox("Live")
+        self.live_sets_checkbox.setToolTip("Keep the zBone, zTissue, zAttachment, zLoa and mesh sets updated as Ziva nodes are created or deleted")
+        self.live_sets_checkbox.setChecked(zi.is_live_sets_enabled())
+        self.blendshape = QtWidgets.QPushButton("Create Blendshape")
+        self.duplicate = QtWidgets.QPushButton("Create Duplicate")
+        self.paint_button = QtWidgets.QPushButton("Paint Weight Tool")
+        self.smooth_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal)
+        # Set slider properties
+        self.smooth_slider.setRange(1, 200)
+        self.smooth_slider.setValue(1)
+        self.smooth_spin_box = QtWidgets.QSpinBox()
+        self.smooth_spin_box.setMaximum(200)
+        self.smooth_apply_button = QtWidgets.QPushButton("Apply Paint Smooth")
+        self.randomize_clr_button = QtWidgets.QPushButton("Randomize Color")
+
+        tab2_layout = QtWidgets.QGridLayout()
+        # Add create_sets_layout to the second tab
+        self.create_sets_layout = QtWidgets.QHBoxLayout()
+        self.create_sets_layout.addWidget(self.create_sets_button, alignment=QtCore.Qt.AlignTop)
+        self.create_sets_layout.addWidget(self.create_sets_dropdown)
+        self.create_sets_layout.addWidget(self.sync_sets_checkbox)
+        self.create_sets_layout.addWidget(self.live_sets_checkbox)
+        tab2_layout.addLayout(self.create_sets_layout, 1, 0, 1, 2, alignment=QtCore.Qt.AlignTop)
+        tab2_layout.addWidget(self.blendshape, 2, 0)
+        tab2_layout.addWidget(self.duplicate, 2, 1)
+        tab2_layout.addWidget(self.smooth_slider, 3, 0)
+        tab2_layout.addWidget(self.smooth_spin_box, 3, 1)
+        tab2_layout.addWidget(self.paint_button, 4, 0)
+        tab2_layout.addWidget(self.smooth_apply_button, 4, 1)
+        tab2_layout.addWidget(self.randomize_clr_button, 5, 0)
+        tab2_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        tab2_layout.addItem(tab2_layout_spacer_item, 6, 0, 1, 2)
+
+        self.create_sets_button.clicked.connect(self.create_sets_action)
+        self.live_sets_checkbox.toggled.connect(self.toggle_live_sets)
+        # self.create_sets_dropdown.currentIndexChanged.connect(self.on_create_sets_index_changed)
+        self.blendshape.clicked.connect(lambda: zi.create_blendshape())
+        self.duplicate.clicked.connect(lambda: zi.create_duplicate_clean_mesh())
         self.paint_button.clicked.connect(lambda: zi.paint_tool())
         self.smooth_slider.valueChanged.connect(self.update_smooth_spinbox)
         self.smooth_spin_box.valueChanged.connect(self.update_smooth_slider)
         self.smooth_apply_button.clicked.connect(lambda: zi.apply_paint_operation(self.smooth_slider.value())
         )
         self.randomize_clr_button.clicked.connect(lambda: zi.randomize_mesh_colors())
+        return tab2_layout
 
-        # connection for solver widgets
-        self.start_frame_spinbox.valueChanged.connect(self.update_solver_settings)
-        self.collision_space_lineedit.textChanged.connect(self.update_solver_settings)
-        self.newton_iteration_spinbox.valueChanged.connect(self.update_solver_settings)
-        self.substeps_spinbox.valueChanged.connect(self.update_solver_settings)
-        self.gravity_spinbox.valueChanged.connect(self.update_solver_settings)
-        self.collision_checkbox.stateChanged.connect(self.update_collision_detection)
+    def build_utils_tab(self):
+        self.mirror = QtWidgets.QPushButton("Create Mirror")
+        self.mirror_lr = QtWidgets.QPushButton("Mirror L -> R")
+        self.update_button = QtWidgets.QPushButton("Update")
+        self.complist_dropdown = QtWidgets.QComboBox()
+        self.transfer_button = QtWidgets.QPushButton("Transfer Mesh")
 
-        # apply solver settings
-        self.function_combo_box.currentIndexChanged.connect(self.apply_selected_function)
-        self.complist_dropdown.currentIndexChanged.connect(self.select_comp_from_dropdown)
+        tab3_layout = QtWidgets.QGridLayout()
+
+        self.create_utils_layout = QtWidgets.QHBoxLayout()
+        self.create_utils_layout.addWidget(self.mirror_lr)
+        self.create_utils_layout.addWidget(self.mirror)
+        tab3_layout.addLayout(self.create_utils_layout, 1, 0, 1, 2)
+        tab3_layout.addWidget(self.complist_dropdown, 2, 0, 1, 2)
+        tab3_layout.addWidget(self.update_button, 3, 0)
+        tab3_layout.addWidget(self.transfer_button, 3, 1)
+        tab3_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum,QtWidgets.QSizePolicy.Expanding)
+        tab3_layout.addItem(tab3_layout_spacer_item, 4, 0, 1, 2)
 
+        self.mirror.clicked.connect(lambda: zi.create_zMirror())
+        self.mirror_lr.clicked.connect(lambda: zi.create_zMirror_lr())
+        self.complist_dropdown.currentIndexChanged.connect(self.select_comp_from_dropdown)
         self.update_button.clicked.connect(self.populate_comp_dropdown)
         self.transfer_button.clicked.connect(lambda: zi.ziva_cloth_transfer())
+        return tab3_layout
+
+    def build_solver_tab(self):
+        # Create widgets for solvers
+        self.start_frame_label = QtWidgets.QLabel("Start Frame:")
+        self.start_frame_spinbox = QtWidgets.QSpinBox()
+        self.start_frame_spinbox.setRange(-1000, 1000)
+        self.start_frame_spinbox.setValue(1)
+
+        self.collision_space_label = QtWidgets.QLabel("Collision Space:")
+        self.collision_space_lineedit = QtWidgets.QLineEdit()
+        self.collision_space_lineedit.setValidator(
+            QtGui.QDoubleValidator(0.1, 0.002, 3)
+        )
+        self.collision_space_lineedit.setText("0.1")
+
+        self.newton_iteration_label = QtWidgets.QLabel("Newton Iterations:")
+        self.newton_iteration_spinbox = QtWidgets.QSpinBox()
+        self.newton_iteration_spinbox.setRange(1, 100)
+        self.newton_iteration_spinbox.setValue(1)
+
+        self.substeps_label = QtWidgets.QLabel("Substeps:")
+        self.substeps_spinbox = QtWidgets.QSpinBox()
+        self.substeps_spinbox.setRange(1, 10)
+        self.substeps_spinbox.setValue(1)
+
+        self.gravity_label = QtWidgets.QLabel("Gravity:")
+        self.gravity_spinbox = QtWidgets.QDoubleSpinBox()
+        self.gravity_spinbox.setRange(-10.0, 10.0)
+        self.gravity_spinbox.setValue(9.78)
+
+        self.collision_checkbox = QtWidgets.QCheckBox("Collision Detection")
+        self.collision_checkbox.setChecked(False)
+
+        # solver profiles from the profiles folder, and the material preset
+        self.function_combo_box = QtWidgets.QComboBox()
+        self.profile_apply_button = QtWidgets.QPushButton("Apply")
+        self.profile_diff_button = QtWidgets.QPushButton("Diff")
+        self.profile_diff_button.setToolTip("Log the solver values that differ from the profile")
+        self.profile_capture_button = QtWidgets.QPushButton("Capture")
+        self.profile_capture_button.setToolTip("Save the values of the solver as a new profile")
+        self.time_simulation_button = QtWidgets.QPushButton("Time Frames")
+        self.time_simulation_button.setToolTip("Solve from the start frame to the end of the playback range\nand log the seconds per frame of the current settings")
+        self.profile_report_label = QtWidgets.QLabel()
+        self.profile_report_label.setWordWrap(True)
+
+        # tet budget of the selected tissues
+        self.tet_budget_label = QtWidgets.QLabel("Tet Budget:")
+        self.tet_budget_spinbox = QtWidgets.QSpinBox()
+        self.tet_budget_spinbox.setRange(1000, 100000000)
+        self.tet_budget_spinbox.setSingleStep(10000)
+        self.tet_budget_spinbox.setValue(200000)
+        self.frame_time_label = QtWidgets.QLabel("Target s/frame:")
+        self.frame_time_spinbox = QtWidgets.QDoubleSpinBox()
+        self.frame_time_spinbox.setDecimals(2)
+        self.frame_time_spinbox.setRange(0.0, 1000.0)
+        self.frame_time_spinbox.setToolTip("Plan the budget from the last Time Frames run instead, 0 uses the tet budget")
+        self.uniform_tet_checkbox = QtWidgets.QCheckBox("Same tetSize for every tissue")
+        self.plan_tets_button = QtWidgets.QPushButton("Plan Tets")
+        self.plan_tets_button.setToolTip("Estimate the tets of the selected tissues from their volume\nand solve for the tetSize values that fit the budget")
+        self.apply_tets_button = QtWidgets.QPushButton("Apply Tets")
+        self.tet_report_label = QtWidgets.QLabel()
+        self.tet_report_label.setWordWrap(True)
+
+        # Solvers found in the scene, the settings go to every solver by default
+        self.solver_combo_box = QtWidgets.QComboBox()
+
+        tab4_layout = QtWidgets.QGridLayout()
+        tab4_layout.addWidget(self.collision_checkbox, 0, 0)
+        tab4_layout.addWidget(self.start_frame_label, 1, 0)
+        tab4_layout.addWidget(self.start_frame_spinbox, 1, 1)
+        tab4_layout.addWidget(self.collision_space_label, 2, 0)
+        tab4_layout.addWidget(self.collision_space_lineedit, 2, 1)
+        tab4_layout.addWidget(self.newton_iteration_label, 3, 0)
+        tab4_layout.addWidget(self.newton_iteration_spinbox, 3, 1)
+        tab4_layout.addWidget(self.substeps_label, 4, 0)
+        tab4_layout.addWidget(self.substeps_spinbox, 4, 1)
+        tab4_layout.addWidget(self.gravity_label, 5, 0)
+        tab4_layout.addWidget(self.gravity_spinbox, 5, 1)
+        tab4_layout.addWidget(self.solver_combo_box, 6, 0, 1, 2)
+        tab4_layout.addWidget(self.function_combo_box, 7, 0, 1, 2)
+        tab4_layout.addWidget(self.profile_apply_button, 8, 0)
+        tab4_layout.addWidget(self.profile_diff_button, 8, 1)
+        tab4_layout.addWidget(self.profile_capture_button, 9, 0)
+        tab4_layout.addWidget(self.time_simulation_button, 9, 1)
+        tab4_layout.addWidget(self.profile_report_label, 10, 0, 1, 2)
+        tab4_layout.addWidget(self.tet_budget_label, 11, 0)
+        tab4_layout.addWidget(self.tet_budget_spinbox, 11, 1)
+        tab4_layout.addWidget(self.frame_time_label, 12, 0)
+        tab4_layout.addWidget(self.frame_time_spinbox, 12, 1)
+        tab4_layout.addWidget(self.uniform_tet_checkbox, 13, 0, 1, 2)
+        tab4_layout.addWidget(self.plan_tets_button, 14, 0)
+        tab4_layout.addWidget(self.apply_tets_button, 14, 1)
+        tab4_layout.addWidget(self.tet_report_label, 15, 0, 1, 2)
 
-        self.refresh_listboxes_button.clicked.connect(self.refresh_comp_listboxes)
+        tab4_layout_spacer_item = QtWidgets.QSpacerItem(20, 40, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        tab4_layout.addItem(tab4_layout_spacer_item, 16, 0, 1, 2)
 
-        # Connect selection changed signal
-        self.listbox_zattachments.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_zattachments))
-        self.listbox_zmaterials.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_zmaterials))
-        self.listbox_ztet.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_ztet))
-        self.listbox_ztissue.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_ztissue))
-        self.listbox_zbone.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_zbone))
-        self.listbox_zfiber.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_zfiber))
-        self.listbox_zcloth.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_zcloth))
-        self.listbox_zloa.itemSelectionChanged.connect(lambda: self.select_component(self.listbox_zloa))
+        # connection for solver widgets
+        # Each widget only queues its own attribute
+        self.start_frame_spinbox.valueChanged.connect(lambda value: self.update_solver_setting("startFrame", value))
+        self.collision_space_lineedit.textChanged.connect(self.update_collision_spacing)
+        self.newton_iteration_spinbox.valueChanged.connect(lambda value: self.update_solver_setting("maxNewtonIterations", value))
+        self.substeps_spinbox.valueChanged.connect(lambda value: self.update_solver_setting("substeps", value))
+        self.gravity_spinbox.valueChanged.connect(lambda value: self.update_solver_setting("gravityY", value))
+        self.collision_checkbox.stateChanged.connect(self.update_collision_detection)
 
-        # Initially, hide the additional list boxes
-        self.set_additional_listboxes_visibility(False)
-        self.populate_style_dropdown()
+        # apply solver settings
+        self.function_combo_box.currentIndexChanged.connect(self.show_profile_report)
+        self.profile_apply_button.clicked.connect(self.apply_selected_function)
+        self.profile_diff_button.clicked.connect(self.diff_selected_profile)
+        self.profile_capture_button.clicked.connect(self.capture_solver_profile)
+        self.time_simulation_button.clicked.connect(self.time_simulation)
+        self.plan_tets_button.clicked.connect(self.plan_tet_budget)
+        self.apply_tets_button.clicked.connect(self.apply_tet_budget)
+        self.solver_combo_box.currentIndexChanged.connect(self.select_solver)
+        # Show the values of the scene solver rather than the defaults
+        self.defer(self.populate_solver_dropdown)
+        self.defer(self.populate_profile_dropdown)
+        return tab4_layout
+
+    def build_profile_tab(self):
+        # Profiling panel
+        self.profile_checkbox = QtWidgets.QCheckBox("Profile Entry Points")
+        self.profile_checkbox.setChecked(zprof.is_profiling())
+        self.verbose_checkbox = QtWidgets.QCheckBox("Verbose Log")
+        self.verbose_checkbox.setChecked(zrt.is_verbose())
+        self.profile_tree = QtWidgets.QTreeWidget()
+        self.profile_tree.setHeaderLabels(["Entry / Command", "Calls", "Time (s)", "%"])
+        self.profile_tree.setSortingEnabled(False)
+        self.profile_refresh_button = QtWidgets.QPushButton("Refresh")
+        self.profile_reset_button = QtWidgets.QPushButton("Reset")
+        self.profile_export_button = QtWidgets.QPushButton("Export")
+        self.profile_export_button.setToolTip("Export the profile as .json or .csv")
+
+        tab_profile_layout = QtWidgets.QGridLayout()
+        tab_profile_layout.addWidget(self.profile_checkbox, 0, 0)
+        tab_profile_layout.addWidget(self.verbose_checkbox, 0, 1)
+        tab_profile_layout.addWidget(self.profile_tree, 1, 0, 1, 3)
+        tab_profile_layout.addWidget(self.profile_refresh_button, 2, 0)
+        tab_profile_layout.addWidget(self.profile_reset_button, 2, 1)
+        tab_profile_layout.addWidget(self.profile_export_button, 2, 2)
+
+        # connection for the profiling panel
+        self.profile_checkbox.stateChanged.connect(self.toggle_profiling)
+        self.verbose_checkbox.stateChanged.connect(
+            lambda state: zrt.set_verbose(state == QtCore.Qt.Checked)
+        )
+        self.profile_refresh_button.clicked.connect(self.refresh_profile_tree)
+        self.profile_reset_button.clicked.connect(self.reset_profile)
+        self.profile_export_button.clicked.connect(self.export_profile)
+        # Show what was profiled before the tab was opened
+        self.defer(self.refresh_profile_tree)
+        return tab_profile_layout
 
     def populate_style_dropdown(self):
         path = cmds.internalVar(usd=True)
@@ -676,105 +861,12 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             with open(style_path, "r") as ss:
                 self.setStyleSheet(ss.read())
 
-    def set_additional_listboxes_visibility(self, visible):
-        for listbox in [self.listbox_zattachments, self.listbox_zmaterials, self.listbox_ztissue, self.listbox_zbone, self.listbox_zfiber, self.listbox_zcloth, self.listbox_zloa]:
-            listbox.setVisible(visible)
-
-    def select_component(self, list_box):
-        """
-        Select the Ziva component in Maya corresponding to the selected item in the list box.
-        Args:
-            list_box (QtWidgets.QListWidget): The list box containing the selected item.
-        """
-        # print(list_box)
-        selected_items = list_box.selectedItems()
-        if not selected_items:
-            return  # No item selected
-        selected_item = selected_items[0].text()
-        cmds.select(selected_item)
-        # Clear selection in other list boxes
-        other_list_boxes = [box for box in [self.listbox_zattachments, self.listbox_zmaterials, self.listbox_ztet, self.listbox_ztissue, self.listbox_zcloth, self.listbox_zbone, self.listbox_zfiber, self.listbox_zloa] if box != list_box]
-        for other_list_box in other_list_boxes:
-            other_list_box.clearSelection()
-
-    def populate_list_box(self, list_box, items):
-        """
-        Populate a QListWidget with the given items.
-        Args:
-            list_box (QtWidgets.QListWidget): The list box to populate.
-            items (list): List of items to add to the list box.
-        """
-        list_box.addItems(items)
-
-    def refresh_comp_listboxes(self):
-        # Clear existing items in list boxes
-        self.listbox_zattachments.clear()
-        self.listbox_zmaterials.clear()
-        self.listbox_ztet.clear()
-        self.listbox_ztissue.clear()
-        self.listbox_zbone.clear()
-        self.listbox_zfiber.clear()
-        self.listbox_zcloth.clear()
-        #self.listbox_zloa.clear()
-
-        selected_objects = cmds.ls(selection=True)
-
-        # Check if there is exactly one selected object
-        if not selected_objects or len(selected_objects) != 1:
-            cmds.warning("Please select exactly one object.")
-            self.set_additional_listboxes_visibility(False)
-            return
-
-        selected_object = selected_objects[0]
-        shape_nodes = cmds.listRelatives(selected_object, shapes=True, fullPath=True) or []
-
-        if not shape_nodes:
-            cmds.warning(f"No shape nodes found for {selected_object}.")
-            return
-
-        # Assuming that the first shape node is the main shape for simplicity
-        main_shape_node = shape_nodes[0]
-
-        # Get Ziva components associated with the main shape node
-        z_components = zi.get_z_components(main_shape_node)
-        print(z_components)
-
-        # Populate list boxes with zComponents
-        #self.populate_list_box(self.listbox_zattachments, z_components.get("zAttachment", []))
-        #self.populate_list_box(self.listbox_zmaterials, z_components.get("zMaterial", []))
-        self.populate_list_box(self.listbox_ztet, z_components.get("zTet", []))
-        # self.populate_list_box(self.listbox_ztissue, z_components.get("zTissue", []))
-        # self.populate_list_box(self.listbox_zbone, z_components.get("zBone", []))
-        # self.populate_list_box(self.listbox_zfiber, z_components.get("zFiber", []))
-        # self.populate_list_box(self.listbox_zcloth, z_components.get("zCloth", []))
-        # self.populate_list_box(self.listbox_zloa, z_components.get("zLineOfAction", []))
-
-        # Check for additional components and show corresponding list boxes
-        additional_components = {
-            "zAttachment": self.listbox_zattachments,
-            "zMaterial": self.listbox_zmaterials,
-            "zTissue": self.listbox_ztissue,
-            "zBone": self.listbox_zbone,
-            "zFiber": self.listbox_zfiber,
-            "zCloth": self.listbox_zcloth,
-            #"zLineOfAction": self.listbox_zloa,
-        }
-
-        for component_type, listbox in additional_components.items():
-            component_nodes = cmds.zQuery(type=component_type)
-            print (component_nodes)
-            if component_nodes:
-                listbox.setVisible(True)
-                self.populate_list_box(listbox, component_nodes)
-            else:
-                listbox.setVisible(False)
-
     def select_comp_from_dropdown(self):
         # Select the object based on the dropdown value
         selected_attachment = self.complist_dropdown.currentText()
         if selected_attachment:
             cmds.select(selected_attachment)
-            print(f"Selected object: {selected_attachment}")
+            zrt.log.debug("Selected object: %s", selected_attachment)
 
     def populate_comp_dropdown(self):
         # Populate the dropdown with zAttachments from the selected mesh
@@ -782,44 +874,92 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         self.complist_dropdown.clear()
         self.complist_dropdown.addItems(attachments_list)
 
+    def populate_profile_dropdown(self):
+        self.function_combo_box.blockSignals(True)
+        self.function_combo_box.clear()
+        self.function_combo_box.addItems(zsv.list_profiles())
+        self.function_combo_box.addItem("Def-Materials Fascia Settings")
+        self.function_combo_box.blockSignals(False)
+        self.show_profile_report()
+
+    def selected_profile(self):
+        """
+        The solver profile picked in the Solver tab, None for the material preset.
+        """
+        name = self.function_combo_box.currentText()
+        if name not in zsv.list_profiles():
+            return None
+        try:
+            return zsv.load_profile(name)
+        except (OSError, ValueError) as e:
+            cmds.warning("Cannot read solver profile {}: {}".format(name, e))
+            return None
+
+    def show_profile_report(self, *args):
+        profile = self.selected_profile()
+        if profile is None:
+            self.profile_report_label.clear()
+            return
+        text = profile["description"]
+        if profile.get("reference"):
+            try:
+                reference = zsv.load_profile(profile["reference"])
+            except (OSError, ValueError) as e:
+                zrt.log.warning("Cannot read reference profile %s: %s", profile["reference"], e)
+            else:
+                text = "\n".join([text, zsv.format_tradeoff(zsv.profile_tradeoff(profile, reference))])
+        self.profile_report_label.setText(text)
+
     def apply_selected_function(self):
         selected_function = self.function_combo_box.currentText()
-        if selected_function == "Def-Solver Fascia Settings":
-            self.default_fascia_settings()
-        elif selected_function == "Def-Solver Settings":
-            self.default_settings()
-        elif selected_function == "Def-Materials Fascia Settings":
+        if selected_function == "Def-Materials Fascia Settings":
             self.default_zcloth_fascia_material()
+            return
+        profile = self.selected_profile()
+        if profile is not None:
+            self.apply_solver_profile(profile)
 
-    def default_fascia_settings(self):
-        solver_name = "zSolver1"
-        cmds.setAttr("{}.collisionDetection".format(solver_name), 1)
-        cmds.setAttr("{}.startFrame".format(solver_name), -20)
-        cmds.setAttr("{}.collisionPointSpacing".format(solver_name), 0.003)
-        cmds.setAttr("{}.maxNewtonIterations".format(solver_name), 2)
-        cmds.setAttr("{}.substeps".format(solver_name), 4)
-        cmds.setAttr("{}.gravityY".format(solver_name), 0)
-        self.start_frame_spinbox.setValue(-20)
-        self.collision_space_lineedit.setText("0.003")
-        self.newton_iteration_spinbox.setValue(2)
-        self.substeps_spinbox.setValue(4)
-        self.gravity_spinbox.setValue(0)
-        self.collision_checkbox.setChecked(True)
-
-    def default_settings(self):
-        solver_name = "zSolver1"
-        cmds.setAttr("{}.collisionDetection".format(solver_name), 0)
-        cmds.setAttr("{}.startFrame".format(solver_name), 1)
-        cmds.setAttr("{}.collisionPointSpacing".format(solver_name), 0.1)
-        cmds.setAttr("{}.maxNewtonIterations".format(solver_name), 5)
-        cmds.setAttr("{}.substeps".format(solver_name), 1)
-        cmds.setAttr("{}.gravityY".format(solver_name), 0)
-        self.start_frame_spinbox.setValue(1)
-        self.collision_space_lineedit.setText("0.1")
-        self.newton_iteration_spinbox.setValue(5)
-        self.substeps_spinbox.setValue(1)
-        self.gravity_spinbox.setValue(9.78)
-        self.collision_checkbox.setChecked(False)
+    def apply_solver_profile(self, profile):
+        """
+        Write every attribute of `profile` to the solvers of the Solver tab in
+        one undo chunk.
+        """
+        # Edits still waiting for the timer would be written over the profile
+        self.flush_solver_settings()
+        changes = zsv.apply_profile(profile, self.target_solvers())
+        zsv.report_tradeoff(profile)
+        self.set_solver_widgets(self.solver_writer.read())
+        return changes
+
+    def diff_selected_profile(self):
+        profile = self.selected_profile()
+        if profile is None:
+            return
+        self.flush_solver_settings()
+        solvers = self.resolve_target_solvers()
+        if not solvers:
+            return
+        differences = zsv.diff_profile(profile, solvers)
+        if not differences:
+            zrt.log.info("The solvers match the %s profile.", profile["name"])
+        for solver, attributes in differences.items():
+            for attribute, (current, value) in sorted(attributes.items()):
+                zrt.log.info("%s.%s: %s, %s profile: %s", solver, attribute, current, profile["name"], value)
+        self.profile_report_label.setText("{} solvers differ from {}, see the Script Editor.".format(len(differences), profile["name"]) if differences else "The solvers match {}.".format(profile["name"]))
+
+    def capture_solver_profile(self):
+        self.flush_solver_settings()
+        solvers = self.resolve_target_solvers()
+        if not solvers:
+            return
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Capture Solver Profile", os.path.join(zsv.PROFILE_DIR, "captured.json"), "JSON (*.json)"
+        )
+        if not path:
+            return
+        name = os.path.splitext(os.path.basename(path))[0]
+        zsv.save_profile(zsv.capture_profile(solvers[0], name), path)
+        self.populate_profile_dropdown()
 
     def default_zcloth_fascia_material(self):
         selected = cmds.ls(sl=True)
@@ -828,35 +968,165 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         cmds.setAttr("{}.pressure".format(solver_name), 100)
         cmds.setAttr("{}.surfaceTension".format(solver_name), 1)
 
-    def update_solver_settings(self):
-        solver_name = "zSolver1"
-        start_frame_value = self.start_frame_spinbox.value()
-        collision_space_value = float(self.collision_space_lineedit.text())
-        newton_iteration_value = self.newton_iteration_spinbox.value()
-        substeps_value = self.substeps_spinbox.value()
-        gravity_value = self.gravity_spinbox.value()
-        cmds.setAttr("{}.startFrame".format(solver_name), start_frame_value)
-        cmds.setAttr(
-            "{}.collisionPointSpacing".format(
-                solver_name), collision_space_value
-        )
-        cmds.setAttr(
-            "{}.maxNewtonIterations".format(
-                solver_name), newton_iteration_value
-        )
-        cmds.setAttr("{}.substeps".format(solver_name), substeps_value)
-        cmds.setAttr("{}.gravityY".format(solver_name), gravity_value)
+    def update_solver_setting(self, attribute, value):
+        self.solver_writer.set(attribute, value)
+        # Restart the countdown, only the value the edits settle on is written
+        self._solver_timer.start()
+
+    def update_collision_spacing(self, text):
+        try:
+            self.update_solver_setting("collisionPointSpacing", float(text))
+        except ValueError:
+            pass  # Still being typed
 
     def update_collision_detection(self, state):
-        # This function remains empty for now
-        solver_name = "zSolver1"
         collision_detection_value = 1 if self.collision_checkbox.isChecked() else 0
-        print("Collision Detection Checkbox Value:", collision_detection_value)
-        cmds.setAttr(
-            "{}.collisionDetection".format(
-                solver_name), collision_detection_value
+        zrt.log.debug(
+            "Collision Detection Checkbox Value: %s", collision_detection_value
         )
-        pass
+        self.update_solver_setting("collisionDetection", collision_detection_value)
+
+    def flush_solver_settings(self):
+        self._solver_timer.stop()
+        if self.solver_writer_follows_selection:
+            # The selection may have changed since the edits were made
+            self.solver_writer.solver = zsv.get_selected_solvers()
+        changes = self.solver_writer.flush()
+        if changes:
+            zrt.log.debug("Solver settings written: %s", changes)
+
+    def apply_solver_settings(self, values):
+        """
+        Show `values` in the Solver tab and write them to the solvers now.
+        """
+        self.set_solver_widgets(values)
+        self.solver_writer.set_many(values)
+        self.flush_solver_settings()
+
+    def set_solver_widgets(self, values):
+        # Signals are blocked so showing the values does not write them back
+        setters = {
+            "collisionDetection": lambda value: self.collision_checkbox.setChecked(bool(value)),
+            "startFrame": lambda value: self.start_frame_spinbox.setValue(int(value)),
+            "collisionPointSpacing": lambda value: self.collision_space_lineedit.setText(f"{value:g}"),
+            "maxNewtonIterations": lambda value: self.newton_iteration_spinbox.setValue(int(value)),
+            "substeps": lambda value: self.substeps_spinbox.setValue(int(value)),
+            "gravityY": lambda value: self.gravity_spinbox.setValue(value),
+        }
+        widgets = [self.collision_checkbox, self.start_frame_spinbox, self.collision_space_lineedit, self.newton_iteration_spinbox, self.substeps_spinbox, self.gravity_spinbox]
+        for widget in widgets:
+            widget.blockSignals(True)
+        try:
+            for attribute, value in values.items():
+                if attribute in setters:
+                    setters[attribute](value)
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+
+    def time_simulation(self):
+        # Time the values shown in the tab, not the ones still pending
+        self.flush_solver_settings()
+        solvers = self.resolve_target_solvers()
+        if not solvers:
+            return
+        start, end = zsim.get_frame_range(solvers[0])
+        run = self.simulation_run = zsim.SimulationRun(self.solver_writer.read())
+        meshes = self.simulation_meshes = zsim.get_simulated_meshes(solvers[0])
+        self.start_job(zsim.simulation_job(run, start, end, meshes, sample=False))
+
+    def plan_tet_budget(self):
+        rows = ztet.read_tet_plan(ztet.collect_tissue_tets(), self.tet_calibration)
+        if not rows:
+            self.tet_plan = []
+            self.tet_report_label.setText("No zTet found on the selection.")
+            return
+        budget = self.tet_budget_spinbox.value()
+        target = self.frame_time_spinbox.value()
+        run = self.simulation_run
+        if target > 0:
+            if run is None or not run.seconds:
+                cmds.warning("Time the frames first to plan for a frame time.")
+                return
+            # The timed run solved every tissue of the solver, the ones left
+            # out of the selection keep their tets
+            solver_rows = ztet.read_tet_plan(ztet.collect_tissue_tets(self.simulation_meshes), self.tet_calibration) if self.simulation_meshes else rows
+            solver_budget = ztet.budget_for_frame_time(target, run.seconds_per_frame, sum(row["tets"] for row in solver_rows))
+            budget = ztet.share_budget(solver_budget, rows, solver_rows)
+            if budget <= 0:
+                cmds.warning("The tissues left out of the selection already take the whole frame time.")
+                return
+        self.tet_plan = ztet.plan_tet_budget(rows, budget, uniform=self.uniform_tet_checkbox.isChecked(), calibration=self.tet_calibration)
+        zrt.log.info("zTet budget plan:\n%s", ztet.format_tet_plan(self.tet_plan))
+        current = sum(row["tets"] for row in self.tet_plan)
+        planned = sum(row["planned_tets"] for row in self.tet_plan)
+        self.tet_report_label.setText("{} zTets: ~{:.0f} tets now, ~{:.0f} planned for a budget of {:.0f}.".format(len(self.tet_plan), current, planned, budget))
+
+    def apply_tet_budget(self):
+        if not self.tet_plan:
+            self.plan_tet_budget()
+        if not self.tet_plan:
+            return
+        ztet.apply_tet_plan(self.tet_plan)
+        self.tet_report_label.setText("zTets rebuilding...")
+        # Reading the counts rebuilds the tets, let the tab redraw first
+        self.defer(self.compare_tet_budget)
+
+    def compare_tet_budget(self):
+        rows = ztet.compare_tet_counts(self.tet_plan)
+        zrt.log.info("zTet counts after the rebuild:\n%s", ztet.format_tet_plan(rows))
+        planned = sum(row["planned_tets"] for row in rows)
+        calibration = ztet.calibrate_tet_estimate(rows)
+        if calibration is None:
+            self.tet_report_label.setText("~{:.0f} tets planned, the zTets do not report their count.".format(planned))
+        else:
+            actual = sum(row["actual"] for row in rows if row.get("actual"))
+            self.tet_report_label.setText("~{:.0f} tets planned, {:.0f} built.".format(planned, actual))
+            # The next plans are corrected by the error of this one
+            self.tet_calibration *= calibration
+        self.tet_plan = []
+
+    def populate_solver_dropdown(self):
+        self.solver_combo_box.blockSignals(True)
+        self.solver_combo_box.clear()
+        self.solver_combo_box.addItem("All Solvers")
+        self.solver_combo_box.addItem("Selected Solvers")
+        self.solver_combo_box.addItems(zsv.get_solvers())
+        self.solver_combo_box.blockSignals(False)
+        self.select_solver()
+
+    def select_solver(self, *args):
+        # Pending edits belong to the solver they were made for
+        self.flush_solver_settings()
+        self.solver_writer_follows_selection = self.solver_combo_box.currentIndex() == 1
+        self.solver_writer.solver = self.target_solvers()
+        self.set_solver_widgets(self.solver_writer.read())
+
+    def target_solvers(self):
+        """
+        Solvers picked in the Solver tab, None for every solver of the scene.
+        """
+        index = self.solver_combo_box.currentIndex()
+        if index <= 0:
+            return None
+        if index == 1:
+            solvers = zsv.get_selected_solvers()
+            if not solvers:
+                cmds.warning("Please select a Ziva solver.")
+            return solvers
+        return [self.solver_combo_box.currentText()]
+
+    def resolve_target_solvers(self):
+        """
+        Existing solvers picked in the Solver tab, warns when there is none.
+        """
+        targets = self.target_solvers()
+        if targets == []:
+            return []  # Nothing selected, target_solvers() warned
+        solvers = zsv.SolverSettingsWriter(targets).solvers()
+        if not solvers:
+            cmds.warning("No Ziva solver found in the scene.")
+        return solvers
 
     def update_smooth_spinbox(self, value):
         self.smooth_spin_box.setValue(value)
@@ -881,11 +1151,11 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             return 0
 
     def print_radio_values(self, value):
-        print(f"Selected radio button value: {value}")
+        zrt.log.debug("Selected radio button value: %s", value)
         return
 
     def print_radio_par_values(self, value):
-        print(f"Selected radio button value: {value}")
+        zrt.log.debug("Selected radio button value: %s", value)
         return
 
     def on_button_click(self):
@@ -897,13 +1167,13 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
         elif button_text == "Create Bones_w/BS":
             zi.create_ziva_BS__bone()
         elif button_text == "Create Tissues":
-            zi.create_ziva_tissue()
+            self.start_job(zi.create_ziva_tissue_job())
         elif button_text == "Create Fiber":
             zi.create_ziva_fiber()
         elif button_text == "Create LOA":
             zi.create_ziva_line_of_action()
         elif button_text == "Create Rivets":
-            zi.create_ziva_rivet_to_bone()
+            self.start_job(zi.create_ziva_rivet_to_bone_job())
         elif button_text == "Create FibreLOA":
             zi.create_ziva_muscle_loa()
         elif button_text == "FibreLOA Remap":
@@ -922,17 +1192,24 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
             "Set zAttachment": 3,
             "Set zRivet": 4,
             "Set zCloth": 5,
-            "Set zLineOfAction": 6,
+            "Set zLoa": 6,
             "Set Bone Mesh": 7,
             "Set Tissue Mesh": 8,
-            "Set LineOfAction Curves": 9,
+            "Set LOA Curves": 9,
         }
         index = index_mapping.get(selected_set)
         if index is not None:
-            print(f"index = {index} & selected_set = {selected_set}")
-            zi.sets_create_by_index(index)
+            zrt.log.debug("index = %s & selected_set = %s", index, selected_set)
+            zi.sets_create_by_index(index, sync=self.sync_sets_checkbox.isChecked())
+        else:
+            zrt.log.warning("No function mapped for '%s'.", selected_set)
+
+    def toggle_live_sets(self, checked):
+        # Live sets keep running after the window is closed, until unchecked
+        if checked:
+            zi.enable_live_sets()
         else:
-            print(f"No function mapped for '{selected_set}'.")
+            zi.disable_live_sets()
 
     def update_slider_label(self, value):
         # Update the text of the label with the current slider value
@@ -949,30 +1226,78 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
     def refresh_action(self):
         # Populate the dropdown when the Refresh button is clicked
         self.populate_dropdown()
-        print("Refreshing...")
+        zrt.log.debug("Refreshing...")
 
     def populate_dropdown(self):
         # Populate the dropdown with zAttachments from the selected mesh
-        attachments_list = zi.get_zattachments_from_selected_mesh()
-        self.dropdown.clear()
-        self.dropdown.addItems(attachments_list)
+        attachments_list = zi.get_zattachments_from_selected_mesh() or []
+        if self.dropdown_proxy is None:
+            # Read from the shared component model, listed on first use
+            self.dropdown_proxy = zbr.ComponentFilterProxy(show_empty_groups=True, parent=self)
+            self.dropdown_proxy.setSourceModel(self.get_component_model())
+            self.dropdown_proxy.set_names(attachments_list)
+            self.dropdown_proxy.modelReset.connect(self.set_dropdown_root)
+            self.dropdown.setModel(self.dropdown_proxy)
+            self.set_dropdown_root()
+        else:
+            self.dropdown_proxy.set_names(attachments_list)
+
+    def set_dropdown_root(self):
+        # A model reset, e.g. when a scene is opened, drops the root index
+        group = self.get_component_model().group_index("zAttachment")
+        self.dropdown.setRootModelIndex(self.dropdown_proxy.mapFromSource(group))
 
     def select_object_from_dropdown(self):
         # Select the object based on the dropdown value
         selected_attachment = self.dropdown.currentText()
         if selected_attachment:
             cmds.select(selected_attachment)
-            print(f"Selected object: {selected_attachment}")
+            zrt.log.debug("Selected object: %s", selected_attachment)
+
+    def toggle_profiling(self, state):
+        if state == QtCore.Qt.Checked:
+            zprof.enable_profiling()
+        else:
+            zprof.disable_profiling()
+        self.refresh_profile_tree()
+
+    def refresh_profile_tree(self):
+        # One top level item per entry point, its cmds / mel calls as children
+        self.profile_tree.clear()
+        entry_item = None
+        for row in zprof.get_profile_rows():
+            columns = [
+                row["command"] or row["entry_point"],
+                str(row["calls"]),
+                f"{row['seconds']:.3f}",
+                f"{100.0 * row['share']:.1f}",
+            ]
+            if not row["command"]:
+                entry_item = QtWidgets.QTreeWidgetItem(self.profile_tree, columns)
+            else:
+                QtWidgets.QTreeWidgetItem(entry_item, columns)
+        self.profile_tree.resizeColumnToContents(0)
+
+    def reset_profile(self):
+        zprof.reset_profile()
+        self.refresh_profile_tree()
+
+    def export_profile(self):
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Profile", "ziva_profile.json", "JSON (*.json);;CSV (*.csv)"
+        )
+        if path:
+            zprof.export_profile(path)
 
     def toggle_zivatissue(self, state):
         zTis = cmds.ls(sl=True)
         for zTis_obj in zTis:
-            meshes = cmds.listRelatives(
-                zTis_obj, c=True, ad=True, type="mesh") or []
+            meshes = zsc.get_scene_index().descendants(
+                zTis_obj, "mesh", full_path=False) or []
             for mesh in meshes:
                 parent_objs = cmds.listRelatives(mesh, p=True) or []
                 for parent_obj in parent_objs:
-                    zTiss = cmds.zQuery(parent_obj, type="zTissue")
+                    zTiss = zsc.get_scene_index().zquery(parent_obj, type="zTissue")
                     if zTiss:
                         cmds.setAttr(
                             zTiss[0] +
@@ -980,7 +1305,14 @@ class Window(MayaQWidgetDockableMixin, QtWidgets.QWidget):
                         )
 
 
-if __name__ == "__main__":
+win = None
+
+
+def show():
+    """
+    Open the toolbox window, replacing the one already open.
+    """
+    global win
     path = cmds.internalVar(usd=True)
     try:
         win.close()
@@ -996,3 +1328,8 @@ if __name__ == "__main__":
     with open(mystyle, "r") as ss:
         win.setStyleSheet(ss.read())
     win.show(dockable=True, floating=False, area="right")
+    return win
+
+
+if __name__ == "__main__":
+    show()